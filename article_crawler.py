@@ -4,18 +4,135 @@ import time
 import logging
 from urllib.parse import urljoin, urlparse
 import re
+import os
+import json
+import hashlib
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait
 from config import Config
+from host_limiter import get_host_limiter
+from http_client import get_http_client
+from tracing import get_tracer
+
+class CrawlJournal:
+    """크롤링 진행 저널 (append-only, 중단 후 재개용)"""
+    
+    def __init__(self, path, urls=None, key=None):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        # 같은 키(기본: 후보 URL 집합)의 저널만 이어받음
+        key = key if key is not None else '\n'.join(sorted(set(urls or [])))
+        self.fingerprint = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        self.records = {}
+        self._file = None
+        self._lock = threading.Lock()
+    
+    def open(self):
+        """저널 열기 - 같은 후보 집합이면 기존 기록을 불러오고, 아니면 새로 시작"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if os.path.exists(self.path):
+            self.records = self._load()
+        
+        if self.records is None:
+            # 다른 후보 집합의 저널 → 폐기 후 새로 시작
+            self.records = {}
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({'type': 'header', 'fingerprint': self.fingerprint, 'created_at': time.time()})
+        else:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if self.records:
+                self.logger.info(f"크롤링 저널에서 {len(self.records)}개 기사 재개")
+        
+        return self
+    
+    def _load(self):
+        """기존 저널 로드 (fingerprint 불일치 시 None)"""
+        records = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except OSError as e:
+            self.logger.warning(f"크롤링 저널 읽기 실패: {e}")
+            return None
+        
+        if not lines:
+            return None
+        
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None
+        if header.get('type') != 'header' or header.get('fingerprint') != self.fingerprint:
+            return None
+        
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # 프로세스 종료로 잘린 마지막 줄은 무시
+                continue
+            if record.get('type') == 'article' and record.get('url'):
+                records[record['url']] = record
+        
+        return records
+    
+    def _write(self, record):
+        """레코드 한 줄 기록 후 즉시 디스크에 반영"""
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    def get(self, url):
+        """저널에 기록된 기사 결과 반환"""
+        return self.records.get(url)
+    
+    def append(self, url, article):
+        """완료된 기사 결과 기록"""
+        record = {
+            'type': 'article',
+            'url': url,
+            'content': article.get('content', ''),
+            'images': article.get('images', []),
+            'content_length': article.get('content_length', 0),
+            'crawl_status': article.get('crawl_status'),
+            'crawled_at': article.get('crawled_at')
+        }
+        self._write(record)
+        self.records[url] = record
+    
+    def close(self, completed=False):
+        """저널 닫기 (전체 완료 시 삭제)"""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if completed and os.path.exists(self.path):
+            os.remove(self.path)
 
 class ArticleCrawler:
     """기사 본문 크롤링 클래스"""
     
-    def __init__(self):
+    def __init__(self, extract_images=None, journal_path=None):
         self.config = Config()
         self.logger = logging.getLogger(__name__)
         
-        # 세션 설정
-        self.session = requests.Session()
-        self.session.headers.update({
+        # 크롤링 재개 저널 (토픽별 파이프라인은 각자 다른 파일 사용)
+        self.journal_path = journal_path or self.config.CRAWL_JOURNAL_FILE
+        
+        # 이미지 추출은 선택 기능 (기본값: Config.EXTRACT_IMAGES)
+        self.extract_images = self.config.EXTRACT_IMAGES if extract_images is None else extract_images
+        self._image_prober = None
+        
+        # 호스트별 적응형 동시성 제어 (수집기와 공유)
+        self.host_limiter = get_host_limiter()
+        self._stats_lock = threading.Lock()
+        
+        # 세션 설정 (공유 연결 풀 사용)
+        self.session = get_http_client().create_session({
             'User-Agent': self.config.USER_AGENT,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8',
@@ -26,12 +143,11 @@ class ArticleCrawler:
         })
         
         # 통계 정보
-        self.stats = {
-            'total_attempts': 0,
-            'successful_crawls': 0,
-            'failed_crawls': 0,
-            'fallback_used': 0
-        }
+        self.reset_statistics()
+        
+        # URL -> (본문, 이미지, 크롤링 시각). prewarm에서 채워 예약 실행은 페이지를 다시 받지 않음
+        self._content_cache = {}
+        self._content_cache_lock = threading.Lock()
         
         # 사이트별 본문 선택자 (사이트 최적화)
         self.content_selectors = {
@@ -54,72 +170,228 @@ class ArticleCrawler:
         ]
     
     def crawl_articles(self, articles):
-        """기사 목록 크롤링"""
+        """기사 목록 크롤링 (호스트별 병렬 처리, 저널 기반 재개 지원)"""
         self.logger.info(f"기사 본문 크롤링 시작: {len(articles)}개")
         
-        crawled_articles = []
-        self.stats['total_attempts'] = len(articles)
+        # 같은 후보 집합일 때만 이전 저널을 이어받도록 URL 목록으로 저널 키 구성
+        journal_key = '\n'.join(sorted(set(self._article_url(article) for article in articles)))
+        for _ in self.crawl_stream(articles, journal_key):
+            pass
+        return articles
+    
+    def crawl_stream(self, articles, journal_key):
+        """기사가 들어오는 대로 크롤링해 끝난 순서대로 내보내는 제너레이터
+        
+        articles는 리스트나 수집기 스트림(제너레이터) 모두 가능하다. 별도 스레드가 입력을 읽어
+        작업을 넣고, 처리 중이거나 소비되지 않은 기사 수는 CRAWL_STREAM_BUFFER로 제한한다
+        (뒤 단계가 느리면 입력 읽기도 멈춤). journal_key가 같은 저널이 남아 있으면 이어받는다.
+        """
+        # 크롤러를 여러 실행에서 재사용하므로 통계는 실행마다 초기화
+        self.reset_statistics()
+        total = len(articles) if isinstance(articles, list) else '?'
+        journal = CrawlJournal(self.journal_path, key=journal_key).open()
+        
+        buffer_size = self.config.CRAWL_STREAM_BUFFER
+        slots = threading.BoundedSemaphore(buffer_size)
+        done = queue.Queue()  # 크기는 slots가 제한 (종료 표시는 항상 넣을 수 있도록 무제한 큐)
+        stopped = threading.Event()
+        end_marker = object()
+        futures = []
         
-        for i, article in enumerate(articles, 1):
+        def crawl(index, article):
+            self._crawl_article(index, total, article, journal)
+            done.put(article)
+        
+        def feed():
             try:
-                print(f"📄 기사 크롤링 중... ({i}/{len(articles)}) - {article['title'][:50]}...")
-                
-                content, images = self._extract_content(article['link'])
-                
-                # 크롤링 결과 저장
-                article['content'] = content
-                article['images'] = images
-                article['content_length'] = len(content)
-                article['crawl_status'] = 'success' if content else 'failed'
-                article['crawled_at'] = time.time()
-                
-                crawled_articles.append(article)
-                
+                with ThreadPoolExecutor(max_workers=self.config.CRAWL_MAX_WORKERS) as executor:
+                    for i, article in enumerate(articles, 1):
+                        # 버퍼가 가득 차면 소비될 때까지 입력 읽기 대기 (중단 시 바로 종료)
+                        while not slots.acquire(timeout=0.5):
+                            if stopped.is_set():
+                                return
+                        if stopped.is_set():
+                            return
+                        
+                        with self._stats_lock:
+                            self.stats['total_attempts'] += 1
+                        
+                        # 이전 실행에서 완료된 기사는 저널 결과 재사용
+                        record = journal.get(self._article_url(article))
+                        if record:
+                            self._apply_journal_record(article, record)
+                            with self._stats_lock:
+                                self.stats['resumed'] += 1
+                                self.stats['successful_crawls' if article['content'] else 'failed_crawls'] += 1
+                            print(f"♻️ 저널에서 재개 ({i}/{total}) - {article['title'][:50]}...")
+                            done.put(article)
+                        else:
+                            futures.append(executor.submit(traced_crawl, i, article))
+                    wait(futures)
+                    for future in futures:
+                        if not future.cancelled():
+                            future.result()
+            except BaseException as e:
+                done.put(e)
+            finally:
+                done.put(end_marker)
+        
+        # 워커 스레드의 span도 호출한 쪽 trace에 기록되도록 감쌈
+        traced_crawl = get_tracer().wrap(crawl)
+        feeder = threading.Thread(target=get_tracer().wrap(feed), name="crawl-feeder", daemon=True)
+        feeder.start()
+        
+        completed = False
+        try:
+            while True:
+                item = done.get()
+                if item is end_marker:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                slots.release()
+                yield item
+            completed = True
+        finally:
+            # 중단 시 시작하지 않은 크롤링은 취소하고, 진행 중인 크롤링이 저널에 기록을 마친 뒤 닫음
+            # (저널 유지 → 다음 실행에서 재개)
+            stopped.set()
+            for future in list(futures):
+                future.cancel()
+            feeder.join()
+            journal.close(completed=completed)
+            self.host_limiter.save()
+        
+        self._print_statistics()
+    
+    def _crawl_article(self, index, total, article, journal):
+        """기사 하나 크롤링 (워커 스레드에서 실행)"""
+        url = self._article_url(article)
+        
+        try:
+            print(f"📄 기사 크롤링 중... ({index}/{total}) - {article['title'][:50]}...")
+            
+            with get_tracer().span('crawl.article', article=article['title'][:80], domain=urlparse(url).netloc.lower()) as span:
+                content, images = self._extract_content(url)
+                span.tag(chars=len(content))
+            
+            # 크롤링 결과 저장
+            article['content'] = content
+            article['images'] = images
+            article['content_length'] = len(content)
+            article['crawl_status'] = 'success' if content else 'failed'
+            article['crawled_at'] = time.time()
+            
+            journal.append(url, article)
+            
+            with self._stats_lock:
                 if content:
                     self.stats['successful_crawls'] += 1
-                    self.logger.info(f"크롤링 성공: {article['title'][:50]}... ({len(content)}자)")
                 else:
                     self.stats['failed_crawls'] += 1
-                    self.logger.warning(f"크롤링 실패: {article['title'][:50]}...")
-                
-                # 요청 간격
-                time.sleep(self.config.REQUEST_DELAY)
-                
-            except Exception as e:
+            
+            if content:
+                self.logger.info(f"크롤링 성공: {article['title'][:50]}... ({len(content)}자)")
+            else:
+                self.logger.warning(f"크롤링 실패: {article['title'][:50]}...")
+            
+        except Exception as e:
+            with self._stats_lock:
                 self.stats['failed_crawls'] += 1
-                self.logger.error(f"크롤링 오류 - {article['title']}: {e}")
-                
-                # 실패시 요약으로 대체
-                article['content'] = article.get('summary', '')
-                article['images'] = []
-                article['content_length'] = len(article['content'])
-                article['crawl_status'] = 'error'
-                article['crawled_at'] = time.time()
-                
-                crawled_articles.append(article)
-        
-        self._print_statistics()
-        return crawled_articles
+            self.logger.error(f"크롤링 오류 - {article['title']}: {e}")
+            
+            # 실패시 요약으로 대체 (일시적 오류일 수 있으므로 저널에 기록하지 않음)
+            article['content'] = article.get('summary', '')
+            article['images'] = []
+            article['content_length'] = len(article['content'])
+            article['crawl_status'] = 'error'
+            article['crawled_at'] = time.time()
+    
+    def crawl_single(self, article):
+        """기사 하나 크롤링 (저널/통계 없이 - 폴링 모드용). 본문을 못 받으면 요약으로 대체"""
+        url = self._article_url(article)
+        with get_tracer().span('crawl.article', article=article.get('title', '')[:80], domain=urlparse(url).netloc.lower()):
+            content, images = self._extract_content(url)
+        article['content'] = content or article.get('summary', '')
+        article['images'] = images
+        article['content_length'] = len(article['content'])
+        article['crawl_status'] = 'success' if content else 'failed'
+        article['crawled_at'] = time.time()
+        return article
+    
+    def _article_url(self, article):
+        """기사 URL 반환 (수집기는 'url', 구버전은 'link' 키 사용)"""
+        return article.get('url') or article.get('link', '')
+    
+    def _apply_journal_record(self, article, record):
+        """저널 레코드를 기사에 반영"""
+        article['content'] = record.get('content', '')
+        article['images'] = record.get('images', [])
+        article['content_length'] = record.get('content_length', len(article['content']))
+        article['crawl_status'] = record.get('crawl_status')
+        article['crawled_at'] = record.get('crawled_at')
+    
+    def warm_cache(self, articles):
+        """기사 본문을 미리 받아 캐시에 저장 (저널/통계에는 기록하지 않음), 캐시된 기사 수 반환"""
+        urls = [url for url in dict.fromkeys(self._article_url(article) for article in articles)
+                if url and self._cached_content(url) is None]
+        if urls:
+            workers = min(self.config.CRAWL_MAX_WORKERS, len(urls))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(get_tracer().wrap(self._extract_content), urls))
+            self.host_limiter.save()
+        return sum(1 for article in articles if self._cached_content(self._article_url(article)) is not None)
+    
+    def _cached_content(self, url):
+        """PREWARM_CACHE_TTL 안에 받은 본문 (없으면 None)"""
+        with self._content_cache_lock:
+            cached = self._content_cache.get(url)
+        if cached and time.time() - cached[2] < self.config.PREWARM_CACHE_TTL:
+            return cached[0], list(cached[1])
+        return None
     
     def _extract_content(self, url):
+        """웹페이지에서 본문 추출 (캐시에 있으면 재사용)"""
+        cached = self._cached_content(url)
+        if cached is not None:
+            with self._stats_lock:
+                self.stats['cache_hits'] += 1
+            return cached
+        
+        content, images = self._download_content(url)
+        if content:
+            now = time.time()
+            with self._content_cache_lock:
+                # 만료된 항목 정리 후 저장
+                self._content_cache = {
+                    cached_url: entry for cached_url, entry in self._content_cache.items()
+                    if now - entry[2] < self.config.PREWARM_CACHE_TTL
+                }
+                self._content_cache[url] = (content, images, now)
+        return content, images
+    
+    def _download_content(self, url):
         """웹페이지에서 본문 추출"""
         try:
-            # HTTP 요청
-            response = self.session.get(url, timeout=self.config.TIMEOUT)
-            response.raise_for_status()
+            # HTTP 요청 (호스트별 동시성 한도 적용)
+            response = self._fetch(url)
             
             # 인코딩 설정
             if response.encoding.lower() in ['iso-8859-1', 'ascii']:
                 response.encoding = 'utf-8'
             
-            # BeautifulSoup으로 파싱
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 본문 추출
-            content = self._extract_main_content(soup, url)
+            with get_tracer().span('crawl.parse', bytes=len(response.content)):
+                # BeautifulSoup으로 파싱
+                soup = BeautifulSoup(response.content, 'html.parser')
+                
+                # 이미지 후보는 본문 정리(decompose) 전에 수집
+                candidates = self._extract_image_candidates(soup, url) if self.extract_images else []
+                
+                # 본문 추출
+                content = self._extract_main_content(soup, url)
             
-            # 이미지 추출
-            images = self._extract_images(soup, url)
+            # 이미지 검사 (활성화된 경우에만)
+            images = self.image_prober.filter_images(candidates) if candidates else []
             
             return content, images
             
@@ -130,6 +402,15 @@ class ArticleCrawler:
             self.logger.error(f"컨텐츠 추출 실패 ({url}): {e}")
             return "", []
     
+    def _fetch(self, url):
+        """호스트 슬롯을 확보한 뒤 페이지 요청 (crawl.fetch span - 안쪽 http span과의 차이가 슬롯 대기 시간)"""
+        with get_tracer().span('crawl.fetch', domain=urlparse(url).netloc.lower()):
+            with self.host_limiter.slot(url) as slot:
+                response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
+                slot.observe(response)
+        response.raise_for_status()
+        return response
+    
     def _extract_main_content(self, soup, url):
         """메인 컨텐츠 추출"""
         # 사이트별 최적화된 선택자 사용
@@ -160,7 +441,8 @@ class ArticleCrawler:
         # 폴백: p 태그들 수집
         paragraphs = soup.find_all('p')
         if paragraphs:
-            self.stats['fallback_used'] += 1
+            with self._stats_lock:
+                self.stats['fallback_used'] += 1
             content = ' '.join([p.get_text(strip=True) for p in paragraphs])
             return self._clean_text(content)
         
@@ -205,41 +487,46 @@ class ArticleCrawler:
         
         return text
     
-    def _extract_images(self, soup, base_url):
-        """이미지 URL 추출"""
-        images = []
+    @property
+    def image_prober(self):
+        """이미지 검사기 (처음 사용할 때 생성)"""
+        if self._image_prober is None:
+            from image_probe import ImageProber
+            self._image_prober = ImageProber(session=self.session)
+        return self._image_prober
+    
+    def _extract_image_candidates(self, soup, base_url):
+        """이미지 후보 URL 수집 (실제 크기 검사는 ImageProber에서 수행)"""
+        candidates = []
         
         # img 태그에서 이미지 추출
         for img in soup.find_all('img'):
             src = img.get('src') or img.get('data-src')
-            if src:
-                # 상대 URL을 절대 URL로 변환
-                absolute_url = urljoin(base_url, src)
-                
-                # 기본적인 이미지 필터링
-                if self._is_valid_image(absolute_url):
-                    images.append({
-                        'url': absolute_url,
-                        'alt': img.get('alt', ''),
-                        'title': img.get('title', '')
-                    })
+            if not src or src.startswith('data:'):
+                continue
+            
+            # 상대 URL을 절대 URL로 변환
+            absolute_url = urljoin(base_url, src)
+            
+            # 명백한 아이콘/트래커는 요청 전에 제외
+            if self._is_valid_image(absolute_url):
+                candidates.append({
+                    'url': absolute_url,
+                    'alt': img.get('alt', ''),
+                    'title': img.get('title', '')
+                })
         
-        return images[:5]  # 최대 5개만
+        return candidates
     
     def _is_valid_image(self, url):
-        """유효한 이미지인지 확인"""
+        """명백히 제외할 이미지인지 URL로 1차 확인"""
         if not url:
             return False
         
-        # 기본 확장자 체크
-        valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
         url_lower = url.lower()
         
-        if any(ext in url_lower for ext in valid_extensions):
-            return True
-        
         # 너무 작은 이미지나 아이콘 제외
-        exclude_keywords = ['icon', 'logo', 'avatar', 'thumbnail', '1x1', 'pixel']
+        exclude_keywords = ['icon', 'logo', 'avatar', '1x1', 'pixel', 'spacer', 'tracking']
         if any(keyword in url_lower for keyword in exclude_keywords):
             return False
         
@@ -254,10 +541,15 @@ class ArticleCrawler:
         print(f"  • 성공: {self.stats['successful_crawls']}개 ({success_rate:.1f}%)")
         print(f"  • 실패: {self.stats['failed_crawls']}개")
         print(f"  • 폴백 사용: {self.stats['fallback_used']}개")
+        if self.stats['resumed']:
+            print(f"  • 저널 재개: {self.stats['resumed']}개")
+        if self.stats['cache_hits']:
+            print(f"  • prewarm 캐시 사용: {self.stats['cache_hits']}개")
     
     def test_single_article(self, url):
         """단일 기사 크롤링 테스트"""
         print(f"🧪 단일 기사 크롤링 테스트: {url}")
+        print(f"  • 이미지 추출: {'활성화' if self.extract_images else '비활성화'}")
         
         try:
             content, images = self._extract_content(url)
@@ -276,10 +568,25 @@ class ArticleCrawler:
             print(f"❌ 크롤링 실패: {e}")
             return "", []
     
+    def reset_statistics(self):
+        """크롤링 통계 초기화"""
+        self.stats = {
+            'total_attempts': 0,
+            'successful_crawls': 0,
+            'failed_crawls': 0,
+            'fallback_used': 0,
+            'resumed': 0,
+            'cache_hits': 0
+        }
+    
     def get_statistics(self):
         """통계 정보 반환"""
         return self.stats.copy()
     
+    def get_image_statistics(self):
+        """이미지 검사 누적 통계 (검사기를 아직 만들지 않았으면 빈 딕셔너리)"""
+        return self._image_prober.get_statistics() if self._image_prober is not None else {}
+    
     def add_custom_selector(self, domain, selectors):
         """사이트별 커스텀 선택자 추가"""
         self.content_selectors[domain] = selectors
@@ -65,19 +65,100 @@ class Config:
     NOTION_DATABASE_ID = os.getenv('NOTION_DATABASE_ID')
     NOTION_PAGE_ID = os.getenv('NOTION_PAGE_ID')
     
+    # Notion 저장 모드: "page" (실행마다 리포트 페이지 1개) / "rows" (기사별 데이터베이스 행)
+    #                  / "daily" (날짜별 페이지 1개에 새 기사만 추가)
+    NOTION_SAVE_MODE = os.getenv('NOTION_SAVE_MODE', 'page')
+    NOTION_ARTICLES_DATABASE_ID = os.getenv('NOTION_ARTICLES_DATABASE_ID') or NOTION_DATABASE_ID
+    NOTION_RATE_LIMIT = 3  # Notion API 평균 요청 한도 (초당)
+    NOTION_MAX_RETRIES = 5  # 429/일시 오류 재시도 횟수
+    NOTION_ROW_WORKERS = 3  # 기사 행 동시 생성 수
+    
+    # 기사 행 속성명 (데이터베이스에 없는 속성은 자동으로 제외)
+    NOTION_ROW_PROPERTIES = {
+        'url': 'URL',
+        'source': 'Source',
+        'published': 'Published',
+        'keywords': 'Keywords'
+    }
+    
     # Telegram 설정
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
     TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+    TELEGRAM_MESSAGE_LIMIT = 4096  # 메시지 최대 길이 (넘으면 분할 전송)
+    TELEGRAM_CHAT_INTERVAL = 1.0  # 개인 채팅당 전송 간격 (초)
+    TELEGRAM_GROUP_INTERVAL = 3.0  # 그룹 채팅당 전송 간격 (초, 분당 20개)
+    TELEGRAM_GLOBAL_RATE = 25  # 봇 전체 초당 전송 한도
+    TELEGRAM_SEND_WORKERS = 4  # 동시에 전송하는 채팅 수
+    TELEGRAM_MAX_RETRIES = 3  # 네트워크/서버 오류 재시도 횟수 (429는 retry_after만큼 대기 후 재시도)
+    TELEGRAM_SEND_TIMEOUT = 120  # 동기 전송 시 결과를 기다리는 최대 시간 (초)
+    TELEGRAM_FLUSH_TIMEOUT = 30  # 프로세스 종료 시 남은 메시지 전송 대기 시간 (초)
+    NOTIFY_DEDUPE_WINDOW = 300  # 같은 오류 알림을 한 번만 보내는 시간 창 (초)
+    NOTIFY_MAX_ERRORS_PER_WINDOW = 5  # 시간 창마다 바로 보내는 서로 다른 오류 수 (나머지는 요약)
+    SUBSCRIPTIONS_FILE = os.getenv('SUBSCRIPTIONS_FILE', 'subscriptions.json')  # 채팅별 키워드 구독 목록
     
     # 스케줄 설정
     SCHEDULE_TIME = "07:30"  # 매일 오전 7시 30분
     TIMEZONE = "Asia/Seoul"
+    # 여러 일정은 ';'로 구분 (cron 5필드 또는 HH:MM, 예: "30 7 * * *;0 18 * * 1-5")
+    SCHEDULES = [spec.strip() for spec in os.getenv('SCHEDULES', '').split(';') if spec.strip()] or [SCHEDULE_TIME]
+    SCHEDULE_CATCHUP_MAX_AGE = 12 * 60 * 60  # 재시작 시 이보다 오래된 놓친 실행은 보충하지 않음 (초, 0이면 무제한)
+    # 예약 실행 몇 분 전에 피드 조회/원본 URL 해석/본문 크롤링으로 캐시를 미리 채움 (전송은 하지 않음)
+    PREWARM_MINUTES = int(os.getenv('PREWARM_MINUTES', '0'))  # 모든 일정의 기본값 (0이면 사용 안 함)
+    SCHEDULE_PREWARM = {
+        # 일정별 지정 (SCHEDULES 항목 -> 분, 예: "07:30": 5, "0 18 * * 1-5": 0)
+    }
+    PREWARM_CACHE_TTL = 30 * 60  # prewarm으로 채운 URL/본문 캐시 유효 시간 (초)
+    
+    # 파이프라인 실행 방식 (컨트롤러/스케줄러/디스코드 공용)
+    PIPELINE_SUBPROCESS = os.getenv('PIPELINE_SUBPROCESS', 'false').lower() == 'true'  # true면 실행마다 별도 프로세스
+    PIPELINE_SCRIPT = "main_004.py"
+    PIPELINE_TIMEOUT = 600  # 서브프로세스 실행 제한 시간 (초)
+    PIPELINE_OUTPUT_BUFFER_LINES = 200  # 서브프로세스 출력 중 메모리에 유지할 최근 줄 수
+    
+    # 실시간 폴링 모드 (새 기사만 바로 짧게 전송, 간격은 기사 발생 속도에 맞춰 조절)
+    POLL_ENABLED = os.getenv('POLL_ENABLED', 'false').lower() == 'true'
+    POLL_MIN_INTERVAL = 60  # 기사가 몰릴 때 최소 폴링 간격 (초)
+    POLL_MAX_INTERVAL = 30 * 60  # 조용할 때 최대 폴링 간격 (초)
+    POLL_INITIAL_INTERVAL = 5 * 60
+    POLL_VELOCITY_ALPHA = 0.3  # 기사 발생 속도 지수이동평균 가중치 (클수록 최근 폴링 반영)
+    POLL_MAX_ARTICLES = 5  # 폴링 1회에 전송할 최대 기사 수 (나머지는 다음 폴링)
+    POLL_RESOLVE_ATTEMPTS = 3  # 원본 URL 해석에 이만큼 실패한 기사는 보내지 않고 본 것으로 기록
+    SEEN_ARTICLES_RETENTION_DAYS = 14  # 본 기사 기록 보존 기간 (일)
+    
+    # 작업 큐 설정 (실행 중 들어온 요청은 후속 실행 1회로 합쳐짐)
+    JOB_MAX_CONCURRENT = int(os.getenv('JOB_MAX_CONCURRENT', '2'))  # 서로 다른 토픽 동시 실행 수
+    JOB_DEFAULT_TOPIC = "default"
+    JOB_TOPICS = {
+        # 추가 토픽: 이름 -> 검색 키워드 목록 (예: "robotics": ["로봇", "휴머노이드"])
+    }
     
     # 크롤링 설정
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     REQUEST_TIMEOUT = 30
+    CRAWL_MAX_WORKERS = 8  # 전체 동시 크롤링 수 (호스트별 한도는 HostLimiter가 조절)
+    CRAWL_STREAM_BUFFER = 16  # 스트리밍 파이프라인에서 크롤링 중이거나 다음 단계를 기다리는 최대 기사 수
     MAX_RETRIES = 3
     
+    # HTTP 연결 풀 설정 (http_client.py)
+    HTTP_POOL_CONNECTIONS = 20  # 유지할 호스트 풀 개수
+    HTTP_POOL_MAXSIZE = 8  # 기본 호스트당 최대 연결 수
+    HTTP_HOST_POOL_SIZES = {
+        'https://news.google.com': 8,
+        'https://api.notion.com': 4,
+        'https://api.telegram.org': 2,
+    }
+    DNS_CACHE_TTL = 300  # 초
+    
+    # 이미지 추출 설정 (기본 비활성화 - 파이프라인에서 사용하지 않음)
+    EXTRACT_IMAGES = False
+    MAX_IMAGES = 5
+    IMAGE_MIN_WIDTH = 200
+    IMAGE_MIN_HEIGHT = 100
+    IMAGE_MIN_BYTES = 5000  # 크기를 알 수 없을 때 최소 용량
+    IMAGE_PROBE_BYTES = 32768  # Range 요청으로 받을 헤더 크기
+    IMAGE_PROBE_TIMEOUT = 5
+    IMAGE_PROBE_WORKERS = 5
+    
     # Google News 설정
     GOOGLE_NEWS_URL = "https://news.google.com/rss"
     NEWS_LANGUAGE = "ko"
@@ -87,6 +168,50 @@ class Config:
     MIN_ARTICLE_LENGTH = 100
     MAX_ARTICLE_LENGTH = 10000
     
+    # 상태 파일 설정 (재시작/재개용)
+    STATE_DIR = ".state"
+    CRAWL_JOURNAL_FILE = os.path.join(STATE_DIR, "crawl_journal.jsonl")
+    HOST_LIMITS_FILE = os.path.join(STATE_DIR, "host_limits.json")
+    NOTION_SCHEMA_CACHE_FILE = os.path.join(STATE_DIR, "notion_schema.json")
+    NOTION_SCHEMA_TTL = 6 * 60 * 60  # 스키마 캐시 유효 시간 (초)
+    NOTION_MIRROR_DB_FILE = os.path.join(STATE_DIR, "notion_mirror.db")
+    NOTION_MIRROR_SYNC_INTERVAL = 10 * 60  # 미러 증분 동기화 최소 간격 (초)
+    OUTBOX_DB_FILE = os.path.join(STATE_DIR, "outbox.db")
+    SCHEDULER_STATE_FILE = os.path.join(STATE_DIR, "scheduler.json")
+    RUN_HISTORY_DB_FILE = os.path.join(STATE_DIR, "run_history.db")
+    SEEN_ARTICLES_DB_FILE = os.path.join(STATE_DIR, "seen_articles.db")
+    
+    # 프로세스 간 조정 (master_controller/simple_scheduler/discord_trigger가 같은 호스트에서 동시에 떠 있을 때)
+    LEADER_LEASE_FILE = os.path.join(STATE_DIR, "leader.json")
+    LEADER_LEASE_SECONDS = 60  # 리더 하트비트가 이 시간 동안 없으면 대기 인스턴스가 승계 (초)
+    LEADER_HEARTBEAT_INTERVAL = 15  # 임대 연장/확인 주기 (초)
+    PIPELINE_LOCK_FILE = os.path.join(STATE_DIR, "pipeline.lock")
+    PIPELINE_LOCK_WAIT = PIPELINE_TIMEOUT  # 다른 프로세스 실행이 끝나길 기다리는 최대 시간 (초)
+    RUN_HISTORY_STATS_DAYS = 7  # 상태 조회 시 p50/p95를 계산할 기간 (일)
+    RUN_HISTORY_RETENTION_DAYS = 90  # 실행 기록 보존 기간 (일)
+    
+    # 구간별 시간 추적 (tracing.py) - 단계/기사/HTTP 요청(DNS·연결·첫 바이트·다운로드) span을 JSON Lines로 기록
+    TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'false').lower() == 'true'
+    TRACE_FILE = os.path.join(STATE_DIR, "trace.jsonl")
+    TRACE_MAX_BYTES = 20 * 1024 * 1024  # 넘으면 trace.jsonl.1로 넘기고 새로 기록
+    TRACE_FLUSH_SPANS = 200  # 이만큼 쌓이면 실행 중에도 파일에 기록
+    
+    # 아웃박스 설정 (Notion/Telegram 전송을 수집 파이프라인과 분리 - Notion 장애에도 수집 결과 보존)
+    # OUTBOX_ENABLED=false면 예전처럼 파이프라인 안에서 직접 전송 (Notion 저장 실패 = 실행 실패)
+    OUTBOX_ENABLED = os.getenv('OUTBOX_ENABLED', 'true').lower() == 'true'
+    OUTBOX_WAIT_SECONDS = int(os.getenv('OUTBOX_WAIT_SECONDS', '0'))  # 파이프라인이 전송 결과를 기다리는 최대 시간 (0이면 등록 후 즉시 반환)
+    OUTBOX_MAX_ATTEMPTS = 10
+    OUTBOX_BASE_BACKOFF = 30  # 재시도 간격 (초, 실패할 때마다 2배)
+    OUTBOX_MAX_BACKOFF = 3600
+    OUTBOX_LEASE_SECONDS = 300  # 전송 중 항목 점유 시간 (프로세스 종료 시 회수)
+    
+    # 도메인별 적응형 동시성 설정 (AIMD)
+    HOST_CONCURRENCY_INITIAL = 2
+    HOST_CONCURRENCY_MIN = 1
+    HOST_CONCURRENCY_MAX = 8
+    HOST_LATENCY_TARGET = 3.0  # 평균 지연시간이 이 값(초) 이하일 때만 동시성 증가
+    HOST_BACKOFF_SECONDS = 5  # 429/503/타임아웃 발생 시 대기 시간 (Retry-After 우선)
+    
     # 로그 설정
     LOG_LEVEL = "INFO"
     LOG_FILE = "simple_news_collector.log"
@@ -113,6 +238,19 @@ class Config:
         """모든 검색 키워드 반환"""
         return cls.AI_KEYWORDS + cls.TECH_KEYWORDS
     
+    @classmethod
+    def get_prewarm_minutes(cls, spec):
+        """일정별 prewarm 시작 시점 (몇 분 전, 0이면 사용 안 함)"""
+        return cls.SCHEDULE_PREWARM.get(spec, cls.PREWARM_MINUTES)
+    
+    @classmethod
+    def get_topic_file(cls, path, topic=None):
+        """토픽별 상태 파일 경로 (기본 토픽은 원래 경로, 예: crawl_journal.robotics.jsonl)"""
+        if not topic or topic == cls.JOB_DEFAULT_TOPIC:
+            return path
+        root, ext = os.path.splitext(path)
+        return f"{root}.{topic}{ext}"
+    
     @classmethod
     def get_headers(cls):
         """HTTP 요청 헤더 반환"""
@@ -0,0 +1,366 @@
+# cron_scheduler.py - 다음 실행 시각까지 정확히 대기하는 스케줄러 (cron 표현식 + 놓친 실행 보충)
+import os
+import json
+import threading
+import logging
+from datetime import datetime, timedelta
+from config import Config
+
+try:
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+except ImportError:  # Python 3.8 이하
+    ZoneInfo = None
+    ZoneInfoNotFoundError = Exception
+
+logger = logging.getLogger(__name__)
+
+def get_timezone(name=None):
+    """Config.TIMEZONE의 tzinfo 반환 (tzdata가 없으면 시스템 로컬 시간대)"""
+    name = name or Config.TIMEZONE
+    if ZoneInfo is not None:
+        try:
+            return ZoneInfo(name)
+        except ZoneInfoNotFoundError:
+            logger.warning(f"⚠️ 시간대 '{name}'를 찾을 수 없어 시스템 시간대를 사용합니다 (pip install tzdata)")
+    return datetime.now().astimezone().tzinfo
+
+def _seconds_between(start, end):
+    """실제 경과 시간(초)
+    
+    같은 tzinfo를 가진 datetime끼리 빼면 UTC 오프셋을 무시한 벽시계 차이가 나와
+    서머타임 전환일에 한 시간씩 어긋나므로 타임스탬프로 계산한다.
+    """
+    return end.timestamp() - start.timestamp()
+
+class CronExpression:
+    """5필드 cron 표현식 (분 시 일 월 요일)
+    
+    *, 목록(1,15), 범위(1-5), 간격(*/10, 8-18/2)을 지원한다. 요일은 0/7=일요일.
+    "HH:MM" 형식은 매일 해당 시각으로 변환한다 (SCHEDULE_TIME 호환).
+    """
+    
+    FIELDS = (
+        ('minute', 0, 59),
+        ('hour', 0, 23),
+        ('day', 1, 31),
+        ('month', 1, 12),
+        ('weekday', 0, 7)
+    )
+    
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        fields = self._normalize(self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드여야 합니다: '{expression}'")
+        
+        parsed = [self._parse_field(field, low, high) for field, (_, low, high) in zip(fields, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = [sorted(values) for values in parsed]
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        # 일/요일 둘 다 지정되면 cron 규칙대로 둘 중 하나만 맞아도 실행
+        self.day_restricted = fields[2] != '*'
+        self.weekday_restricted = fields[4] != '*'
+    
+    @staticmethod
+    def _normalize(expression):
+        if ':' in expression and len(expression.split()) == 1:
+            hour, minute = expression.split(':')
+            return f"{int(minute)} {int(hour)} * * *"
+        return expression
+    
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f"잘못된 간격: '{field}'")
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(value) for value in part.split('-', 1))
+            else:
+                start = end = int(part)
+                if step > 1:
+                    end = high
+            if start < low or end > high or start > end:
+                raise ValueError(f"범위를 벗어난 값: '{field}' ({low}-{high})")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def _day_matches(self, date):
+        weekday = (date.weekday() + 1) % 7  # cron 기준: 일요일=0
+        day_ok = date.day in self.days
+        weekday_ok = weekday in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+    
+    def next_after(self, moment):
+        """moment(시간대 포함) 이후 처음 실행될 시각"""
+        tz = moment.tzinfo
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        date = start.date()
+        
+        # 최대 5년 앞까지 탐색 (2월 30일처럼 불가능한 표현식 방지)
+        for _ in range(366 * 5):
+            if date.month in self.months and self._day_matches(date):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime(date.year, date.month, date.day, hour, minute, tzinfo=tz)
+                        if candidate >= start:
+                            return candidate
+            date += timedelta(days=1)
+        raise ValueError(f"실행 시각을 찾을 수 없는 cron 표현식: '{self.expression}'")
+    
+    def __str__(self):
+        return self.expression
+
+class ScheduledJob:
+    """등록된 일정 하나"""
+    
+    def __init__(self, name, cron, func, offset=None, catch_up=True, guard=None):
+        self.name = name
+        self.cron = cron
+        self.func = func
+        self.offset = offset or timedelta(0)  # cron 시각 기준 실행 시점 이동 (음수면 미리 실행)
+        self.catch_up = catch_up
+        self.guard = guard  # False를 반환하면 이번 일정은 실행하지 않음 (예: 리더가 아님)
+        self.next_run = None
+        self.last_run = None
+        self.pending_due = None  # guard 때문에 건너뛰고 재확인 중인 일정 시각
+        self.run_count = 0
+
+class CronScheduler:
+    """다음 실행 시각까지 한 번에 대기하는 스케줄러
+    
+    60초마다 깨어나 확인하는 대신 가장 가까운 실행 시각까지 Condition.wait()로 잠들고,
+    일정 추가나 stop() 호출 시에만 즉시 깨어난다. 마지막 실행 시각을 파일에 저장해
+    프로세스가 꺼져 있던 동안 놓친 실행은 재시작 후 한 번만 보충한다
+    (SCHEDULE_CATCHUP_MAX_AGE보다 오래된 실행은 건너뜀).
+    
+    guard가 False를 반환한 일정은 실행 기록을 남기지 않고, retry_interval마다 다시 확인한다.
+    상태 파일을 같이 쓰는 다른 프로세스가 그 일정을 실행했으면 재확인을 멈춘다.
+    """
+    
+    def __init__(self, timezone=None, state_file=None, retry_interval=None):
+        self.config = Config
+        self.tz = get_timezone(timezone)
+        self.state_file = state_file or self.config.SCHEDULER_STATE_FILE
+        self.retry_interval = retry_interval or self.config.LEADER_HEARTBEAT_INTERVAL
+        self.jobs = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = None
+        self._last_runs = self._load()
+    
+    def _now(self):
+        return datetime.now(self.tz)
+    
+    def _load(self):
+        """일정별 마지막 실행 시각 불러오기"""
+        if not os.path.exists(self.state_file):
+            return {}
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            return {name: datetime.fromisoformat(value) for name, value in saved.items()}
+        except (OSError, ValueError) as e:
+            logger.warning(f"스케줄 상태 파일 로드 실패 (무시됨): {e}")
+            return {}
+    
+    def _save(self):
+        """마지막 실행 시각 저장 (다른 프로세스가 기록한 더 최근 시각은 유지)"""
+        saved = self._load()
+        with self._condition:
+            for name, moment in self._last_runs.items():
+                if name not in saved or moment > saved[name]:
+                    saved[name] = moment
+            snapshot = {name: moment.isoformat() for name, moment in saved.items()}
+        
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.state_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"스케줄 상태 저장 실패: {e}")
+    
+    def add_job(self, spec, func, name=None, offset_minutes=0, catch_up=True, guard=None):
+        """일정 등록 (spec: cron 표현식 또는 "HH:MM"). 놓친 실행이 있으면 바로 실행되도록 예약
+        
+        offset_minutes만큼 cron 시각에서 앞뒤로 옮겨 실행한다 (예: -5면 5분 전).
+        catch_up=False면 놓친 실행을 보충하지 않는다.
+        guard()가 False면 실행/기록하지 않고, catch_up이면 같은 일정을 나중에 다시 확인한다.
+        """
+        cron = CronExpression(spec)
+        job = ScheduledJob(name or str(cron), cron, func, timedelta(minutes=offset_minutes), catch_up, guard)
+        now = self._now()
+        
+        with self._condition:
+            last_run = self._last_runs.get(job.name)
+            job.last_run = last_run
+            job.next_run = self._next_time(job, now)
+            
+            if last_run is not None and catch_up:
+                missed = self._latest_missed(job, last_run.astimezone(self.tz), now)
+                max_age = self.config.SCHEDULE_CATCHUP_MAX_AGE
+                if missed is not None and (not max_age or _seconds_between(missed, now) <= max_age):
+                    logger.info(f"⏪ [{job.name}] 놓친 실행 보충 예정 (예정 시각: {missed.strftime('%Y-%m-%d %H:%M')})")
+                    job.next_run = now
+            else:
+                # 처음 등록된 일정은 지금부터 계산 (과거 실행을 보충하지 않음)
+                self._last_runs[job.name] = now
+            
+            self.jobs[job.name] = job
+            self._condition.notify_all()
+        
+        if last_run is None:
+            self._save()
+        return job
+    
+    @staticmethod
+    def _next_time(job, moment):
+        """moment 이후 job이 실행될 시각 (offset 반영)"""
+        return job.cron.next_after(moment - job.offset) + job.offset
+    
+    @classmethod
+    def _latest_missed(cls, job, last_run, now):
+        """last_run 이후 now까지 지나간 일정 중 가장 최근 시각 (없으면 None)"""
+        missed = None
+        moment = cls._next_time(job, last_run)
+        for _ in range(100000):
+            if moment > now:
+                break
+            missed = moment
+            moment = cls._next_time(job, moment)
+        return missed
+    
+    def next_run(self, include_offset=False):
+        """가장 가까운 실행 시각 (일정이 없으면 None, 기본은 prewarm처럼 시각을 옮긴 일정 제외)"""
+        with self._condition:
+            upcoming = [
+                job.next_run for job in self.jobs.values()
+                if job.next_run and (include_offset or not job.offset)
+            ]
+        return min(upcoming) if upcoming else None
+    
+    def get_jobs(self):
+        with self._condition:
+            return [{
+                'name': job.name,
+                'cron': str(job.cron),
+                'offset_minutes': int(job.offset.total_seconds() // 60),
+                'next_run': job.next_run.strftime('%Y-%m-%d %H:%M:%S') if job.next_run else None,
+                'last_run': job.last_run.strftime('%Y-%m-%d %H:%M:%S') if job.last_run else None,
+                'run_count': job.run_count
+            } for job in self.jobs.values()]
+    
+    def run(self):
+        """스케줄 루프 (stop() 호출 시 즉시 반환)"""
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    due_job = min(self.jobs.values(), key=lambda job: job.next_run, default=None)
+                    if due_job is not None:
+                        delay = _seconds_between(self._now(), due_job.next_run)
+                        if delay <= 0:
+                            break
+                    else:
+                        delay = None
+                    # 다음 실행 시각까지 한 번에 대기 (일정 추가/stop 시 notify로 깨어남)
+                    self._condition.wait(delay)
+                if self._stopped:
+                    return
+                due = due_job.next_run
+            
+            self._run_job(due_job, due)
+    
+    def _run_job(self, job, due):
+        due = job.pending_due or due
+        if job.guard is not None and not self._check_guard(job, due):
+            return
+        
+        started = self._now()
+        logger.info(f"⏰ [{job.name}] 예약 실행 (예정: {due.strftime('%H:%M:%S')}, 실제: {started.strftime('%H:%M:%S')})")
+        
+        with self._condition:
+            job.pending_due = None
+            job.last_run = started
+            job.run_count += 1
+            self._last_runs[job.name] = started
+        self._save()
+        
+        try:
+            job.func()
+        except Exception as e:
+            logger.error(f"❌ [{job.name}] 예약 작업 오류: {e}")
+        
+        finished = self._now()
+        next_run = self._next_time(job, max(due, started))
+        if next_run <= finished:
+            if job.catch_up:
+                # 실행이 길어져 다음 일정을 넘긴 경우 한 번만 바로 보충
+                logger.info(f"⏪ [{job.name}] 실행 중 지나간 일정 1회 보충")
+                next_run = finished
+            else:
+                next_run = self._next_time(job, finished)
+        
+        with self._condition:
+            job.next_run = next_run
+    
+    def _check_guard(self, job, due):
+        """guard 확인 - 실행하면 True, 아니면 다음 확인 시각을 잡고 False"""
+        now = self._now()
+        if job.pending_due is not None:
+            # 상태 파일을 같이 쓰는 다른 프로세스(리더)가 이 일정을 이미 실행했으면 재확인 중단
+            shared = self._load().get(job.name)
+            if shared is not None and shared >= due:
+                with self._condition:
+                    job.pending_due = None
+                    job.last_run = shared
+                    self._last_runs[job.name] = max(shared, self._last_runs.get(job.name, shared))
+                    job.next_run = self._next_time(job, now)
+                return False
+        
+        try:
+            allowed = job.guard()
+        except Exception as e:
+            logger.error(f"❌ [{job.name}] 실행 조건 확인 오류: {e}")
+            allowed = False
+        if allowed:
+            return True
+        
+        max_age = self.config.SCHEDULE_CATCHUP_MAX_AGE
+        expired = max_age and _seconds_between(due, now) > max_age
+        with self._condition:
+            if job.catch_up and not expired:
+                # 실행 기록 없이 잠시 뒤 다시 확인 (리더 승계 중에 온 일정을 잃지 않도록)
+                if job.pending_due is None:
+                    logger.info(f"⏸️ [{job.name}] 실행 조건 불충족 - {self.retry_interval}초마다 다시 확인 (예정: {due.strftime('%H:%M:%S')})")
+                job.pending_due = due
+                job.next_run = now + timedelta(seconds=self.retry_interval)
+            else:
+                job.pending_due = None
+                job.next_run = self._next_time(job, max(due, now))
+        return False
+    
+    def start(self):
+        """별도 데몬 스레드에서 스케줄 루프 시작"""
+        self._thread = threading.Thread(target=self.run, name="cron-scheduler", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def stop(self, timeout=None):
+        """대기 중인 루프를 즉시 깨워 종료 (실행 중인 작업은 끝날 때까지 기다림)"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
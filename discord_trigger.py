@@ -3,12 +3,13 @@
 
 import discord
 import asyncio
-import subprocess
-import sys
 import os
 import logging
-from datetime import datetime
 from config import Config
+from pipeline_runner import PipelineRunner
+from job_queue import JobQueue
+from run_history import get_run_history
+from process_lock import PipelineRunLock
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,6 +22,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class StageProgress:
+    """파이프라인 단계 콜백을 Discord 상태 메시지 수정으로 바꿔 주는 클래스
+    
+    콜백은 executor 스레드에서 호출되므로 수정 작업은 run_coroutine_threadsafe로
+    이벤트 루프에 넘긴다. 수정은 순서대로 처리하고, 밀린 중간 단계는 건너뛴다.
+    """
+    
+    def __init__(self, status_msg, loop, title="🚀 **Google News AI 뉴스 수집 중...**"):
+        self.status_msg = status_msg
+        self.loop = loop
+        self.title = title
+        self.completed = []
+        self._version = 0
+        self._closed = False
+        self._futures = []
+        self._edit_lock = asyncio.Lock()
+    
+    def __call__(self, stage, total, name):
+        """단계 시작 콜백 (파이프라인 실행 스레드)"""
+        self._version += 1
+        lines = [self.title, ""]
+        lines.extend(f"✅ {done}" for done in self.completed)
+        lines.append(f"🔄 **{stage}/{total}단계:** {name} 진행 중...")
+        self.completed.append(name)
+        
+        future = asyncio.run_coroutine_threadsafe(self._edit(self._version, '\n'.join(lines)), self.loop)
+        self._futures.append(future)
+    
+    async def _edit(self, version, content):
+        async with self._edit_lock:
+            # 더 최신 단계가 이미 들어왔거나 최종 결과가 표시되면 건너뜀
+            if self._closed or version < self._version:
+                return
+            try:
+                await self.status_msg.edit(content=content)
+            except Exception as e:
+                logger.warning(f"⚠️ 진행 상황 메시지 수정 실패: {e}")
+    
+    async def close(self):
+        """남은 단계 수정을 정리 (최종 결과 메시지를 덮어쓰지 않도록)"""
+        self._closed = True
+        if self._futures:
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in self._futures), return_exceptions=True)
+
 class DiscordTrigger:
     """디스코드 메시지 기반 Google News AI 트리거 시스템"""
     
@@ -53,12 +98,21 @@ class DiscordTrigger:
         self.client = discord.Client(intents=intents)
         
         # 실행 상태 관리
-        self.is_running = False
         self.last_execution = None
         
+        # 파이프라인 실행기 (기본: 프로세스 내 실행, 세션/캐시 재사용)
+        self.runner = PipelineRunner()
+        
+        # 작업 큐 (실행 중 들어온 요청은 후속 실행 1회로 합쳐짐, MasterController는 자신의 큐로 교체)
+        self.jobs = JobQueue(runner=self.runner.run)
+        
         # 이벤트 핸들러 등록
         self._setup_events()
     
+    @property
+    def is_running(self):
+        return self.jobs.is_busy()
+    
     def _setup_events(self):
         """Discord 이벤트 핸들러 설정"""
         
@@ -129,12 +183,7 @@ class DiscordTrigger:
                     break
             
             if triggered:
-                if self.is_running:
-                    await message.add_reaction('⏳')
-                    await message.reply("🔄 현재 AI 뉴스 수집이 진행 중입니다. 잠시만 기다려주세요!")
-                    return
-                
-                # 실행 트리거
+                # 실행 트리거 (실행 중이면 후속 실행에 합류)
                 await self._trigger_news_collection(message)
             else:
                 # 트리거 키워드가 없지만 AI나 뉴스 관련 언급이 있으면 힌트 제공
@@ -156,45 +205,41 @@ class DiscordTrigger:
     
     async def _trigger_news_collection(self, message):
         """AI 뉴스 수집 트리거"""
+        status_msg = None
         try:
-            # 실행 상태 설정
-            self.is_running = True
+            queued = self.jobs.is_busy()
             
             # 즉시 반응 및 알림
-            await message.add_reaction('🚀')
-            status_msg = await message.reply("🚀 Google News AI 뉴스 수집을 시작합니다! 약 1-2분 소요될 예정입니다...")
-            
-            logger.info(f"🚀 뉴스 수집 트리거됨 by {message.author.name}")
-            
-            # 현재 디렉토리 확인
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            main_script = os.path.join(script_dir, 'main.py')
+            if queued:
+                await message.add_reaction('⏳')
+                status_msg = await message.reply("🔄 현재 AI 뉴스 수집이 진행 중입니다. 끝나는 대로 한 번 더 실행하고 결과를 알려드릴게요!")
+            else:
+                await message.add_reaction('🚀')
+                status_msg = await message.reply("🚀 Google News AI 뉴스 수집을 시작합니다! 약 1-2분 소요될 예정입니다...")
             
-            start_time = datetime.now()
+            logger.info(f"🚀 뉴스 수집 트리거됨 by {message.author.name}{' (후속 실행 대기)' if queued else ''}")
             
-            # main.py 실행
-            result = subprocess.run(
-                [sys.executable, main_script],
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5분 타임아웃
-                cwd=script_dir
-            )
+            # 작업 큐에 제출 후 결과 대기 (실행은 작업 스레드 - 기다리는 동안에도 봇은 응답 유지)
+            progress = StageProgress(status_msg, asyncio.get_running_loop())
+            try:
+                future = self.jobs.submit("discord", on_stage=progress)
+                result = await asyncio.wrap_future(future)
+            finally:
+                await progress.close()
             
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            self.last_execution = end_time.strftime('%Y-%m-%d %H:%M:%S')
+            duration = result['duration']
+            self.last_execution = result['end_time'].strftime('%Y-%m-%d %H:%M:%S')
             
             # 결과 처리
-            if result.returncode == 0:
+            if result['success']:
                 # 성공
                 await message.add_reaction('✅')
                 
-                success_msg = f"""✅ **Google News AI 뉴스 수집 완료!**
+                success_msg = f"""✅ **Google News AI 뉴스 수집 완료!**{' (다른 프로세스에서 진행 중이던 실행 결과)' if result.get('shared_run') else ''}
 
 ⏱️ **소요시간:** {duration:.1f}초
 🕐 **완료시간:** {self.last_execution}
-📊 **상태:** 성공
+📊 **상태:** {'성공 (Notion/Telegram 전송은 아웃박스에서 진행 중)' if result.get('delivery') == 'queued' else '성공'}
 
 🔗 **결과 확인:**
 • Notion 페이지에서 상세 내용 확인
@@ -204,6 +249,10 @@ class DiscordTrigger:
                 
                 await status_msg.edit(content=success_msg)
                 
+                # 대기했던 요청자에게는 완료를 따로 알림 (메시지 수정은 알림이 가지 않음)
+                if queued:
+                    await message.reply(f"{message.author.mention} 요청하신 AI 뉴스 수집이 완료되었습니다! ✅")
+                
                 logger.info(f"✅ 뉴스 수집 성공 - {duration:.1f}초 소요")
                 
             else:
@@ -214,7 +263,6 @@ class DiscordTrigger:
 
 ⏱️ **소요시간:** {duration:.1f}초
 🕐 **시도시간:** {self.last_execution}
-❌ **오류코드:** {result.returncode}
 
 🔧 **해결방법:**
 1. 잠시 후 다시 시도해주세요
@@ -222,31 +270,38 @@ class DiscordTrigger:
 
 **오류 로그:**
 ```
-{result.stderr[:500] if result.stderr else '로그 없음'}
+{result['error'][:500] if result.get('error') else '로그 없음'}
 ```"""
                 
                 await status_msg.edit(content=error_msg)
                 
-                logger.error(f"❌ 뉴스 수집 실패 - 코드: {result.returncode}")
-                logger.error(f"STDERR: {result.stderr}")
+                logger.error(f"❌ 뉴스 수집 실패: {result.get('error')}")
                 
-        except subprocess.TimeoutExpired:
-            await message.add_reaction('⏰')
-            await status_msg.edit(content="⏰ **실행 시간 초과**\n\n5분이 경과하여 작업이 중단되었습니다. 네트워크 상태를 확인 후 다시 시도해주세요.")
-            logger.error("⏰ 뉴스 수집 시간 초과")
-            
         except Exception as e:
             await message.add_reaction('💥')
-            await status_msg.edit(content=f"💥 **예상치 못한 오류**\n\n{str(e)}\n\n개발자에게 문의해주세요.")
+            error_msg = f"💥 **예상치 못한 오류**\n\n{str(e)}\n\n개발자에게 문의해주세요."
+            if status_msg:
+                await status_msg.edit(content=error_msg)
+            else:
+                await message.reply(error_msg)
             logger.error(f"💥 예상치 못한 오류: {e}")
-            
-        finally:
-            # 실행 상태 해제
-            self.is_running = False
     
     async def _send_status(self, message):
         """봇 상태 정보 전송"""
         status = "🔄 실행 중" if self.is_running else "⭐ 대기 중"
+        progress = self.runner.format_progress()
+        if progress:
+            status += f" - {progress}"
+        if self.jobs.has_pending():
+            status += " (후속 실행 예약됨)"
+        
+        # 실행 기록 통계 / 다른 프로세스 실행 여부 (파일·SQLite 조회는 이벤트 루프 밖에서)
+        loop = asyncio.get_running_loop()
+        history_lines = await loop.run_in_executor(None, get_run_history().format_summary)
+        other_run = await loop.run_in_executor(None, PipelineRunLock().holder)
+        if other_run and not self.is_running:
+            status = f"🔄 다른 프로세스에서 실행 중 (트리거: {other_run['trigger']})"
+        history_text = '\n'.join(f"• {line}" for line in history_lines)
         
         status_msg = f"""📊 **Google News AI 봇 상태**
 
@@ -255,6 +310,9 @@ class DiscordTrigger:
 📡 **모니터링 채널:** #{message.channel.name}
 👤 **요청자:** {message.author.mention}
 
+📈 **실행 통계:**
+{history_text}
+
 ⚡ **사용 가능한 명령어:**
 • `!뉴스`, `!news` - AI 뉴스 수집 실행
 • `!상태`, `!status` - 현재 상태 확인  
@@ -290,7 +348,7 @@ class DiscordTrigger:
 5. Telegram으로 결과 전송
 
 ⏱️ **소요시간:** 약 1-2분
-🔄 **실행제한:** 동시 실행 불가 (순차 처리)
+🔄 **실행제한:** 실행 중 요청은 후속 실행 1회로 합쳐서 처리
 
 💡 **팁:** 메시지에 AI, 뉴스 관련 키워드만 포함해도 힌트를 받을 수 있어요!
 
@@ -299,6 +357,18 @@ class DiscordTrigger:
         
         await message.reply(help_msg)
     
+    def push_article(self, article):
+        """다른 스레드(폴링)에서 채널로 새 기사 알림 전송. 봇이 준비되지 않았으면 False"""
+        if not self.channel_id or not self.client.is_ready():
+            return False
+        channel = self.client.get_channel(self.channel_id)
+        if channel is None:
+            return False
+        
+        content = f"⚡ **{article.get('title', '')}**\n📰 {article.get('source', '')}\n{article.get('url', '')}"
+        asyncio.run_coroutine_threadsafe(channel.send(content), self.client.loop)
+        return True
+    
     def run(self):
         """Discord 봇 실행"""
         if not self.bot_token:
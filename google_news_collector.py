@@ -1,31 +1,54 @@
 # google_news_collector.py - Google News 최신 AI 기사 수집
-import requests
 from datetime import datetime, timedelta
 import time
 import re
+import hashlib
 from urllib.parse import quote
 from bs4 import BeautifulSoup
 import feedparser
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from host_limiter import get_host_limiter
+from http_client import get_http_client
+from tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
+# 핵심 AI 키워드 (제목/요약 선별용)
+AI_KEYWORDS = [
+    '인공지능', 'ai', '생성형ai', 'chatgpt', 'gpt', 'llm',
+    '머신러닝', '딥러닝', '신경망', '자율주행', 'ai반도체',
+    '네이버', '카카오', '삼성ai', '클로바'
+]
+AI_KEYWORDS_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in AI_KEYWORDS), re.IGNORECASE)
+
 class GoogleNewsCollector:
     """Google News에서 최신 AI 기사를 수집하는 클래스"""
     
     def __init__(self, max_articles=5):
         self.max_articles = max_articles
         self.base_url = "https://news.google.com/rss/search"
-        self.session = requests.Session()
         
-        # User-Agent 설정 (Google News 접근용)
-        self.session.headers.update({
+        # User-Agent 설정 (Google News 접근용, 공유 연결 풀 사용)
+        self.session = get_http_client().create_session({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'application/rss+xml,application/xml,text/xml,*/*',
             'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
             'Accept-Encoding': 'gzip, deflate, br',
             'Connection': 'keep-alive'
         })
+        
+        # 호스트별 적응형 동시성 제어 (Google News 요청 보호, 크롤러와 공유)
+        self.host_limiter = get_host_limiter()
+        
+        # Google News URL -> (원본 URL, 해석 시각). prewarm에서 채워 예약 실행은 리다이렉트 요청 없이 재사용
+        self._resolved_urls = {}
+        self._resolved_lock = threading.Lock()
+        
+        # 피드 URL -> 조건부 요청 정보 (ETag, Last-Modified, 본문 해시) - 폴링 시 변경 없으면 파싱 생략
+        self._feed_validators = {}
     
     def build_search_query(self, keywords):
         """키워드 기반 검색 쿼리 생성"""
@@ -49,60 +72,162 @@ class GoogleNewsCollector:
     
     def collect_latest_news(self, keywords):
         """Google News에서 최신 AI 뉴스 수집"""
-        print(f"🔍 Google News에서 최신 AI 뉴스 검색 중...")
+        return list(self.iter_latest_news(keywords))
+    
+    def iter_latest_news(self, keywords):
+        """최신 AI 뉴스를 피드(최신순) 순서대로 하나씩 내보내는 제너레이터
         
-        search_query = self.build_search_query(keywords)
-        encoded_query = quote(search_query)
+        원본 URL은 병렬로 해석하고, 앞선 기사가 준비되는 대로 바로 내보내므로 스트리밍 파이프라인은
+        전체 수집을 기다리지 않고 크롤링을 시작한다. 해석에 실패한 자리는 다음 후보로 채운다.
+        """
+        print(f"🔍 Google News에서 최신 AI 뉴스 검색 중...")
         
-        # Google News RSS URL 구성
-        rss_url = f"{self.base_url}?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
+        rss_url = self.build_feed_url(keywords)
         
         print(f"📡 검색 URL: {rss_url}")
         
         try:
             # RSS 피드 파싱
-            response = self.session.get(rss_url, timeout=30)
-            response.raise_for_status()
-            
-            # feedparser로 RSS 파싱
-            feed = feedparser.parse(response.content)
-            
-            if not feed.entries:
-                print("⚠️ Google News에서 검색 결과가 없습니다.")
-                return []
-            
-            articles = []
-            processed_count = 0
-            
-            print(f"📰 {len(feed.entries)}개 기사 발견, 최대 {self.max_articles}개 수집...")
-            
-            for entry in feed.entries:
-                if processed_count >= self.max_articles:
-                    break
-                
-                try:
-                    # 기사 정보 추출
-                    article = self.extract_article_info(entry)
-                    
-                    if article and self.is_ai_related(article, keywords):
-                        articles.append(article)
-                        processed_count += 1
-                        print(f"✅ [{processed_count}] {article['title'][:50]}...")
-                    
-                    # 요청 간 딜레이
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    logger.warning(f"기사 처리 중 오류: {e}")
-                    continue
-            
-            print(f"🎯 총 {len(articles)}개 AI 관련 최신 기사 수집 완료")
-            return articles
-            
+            feed = self.fetch_feed(rss_url)
         except Exception as e:
             logger.error(f"Google News 수집 실패: {e}")
             print(f"❌ Google News 수집 실패: {e}")
+            return
+        
+        if not feed.entries:
+            print("⚠️ Google News에서 검색 결과가 없습니다.")
+            return
+        
+        print(f"📰 {len(feed.entries)}개 기사 발견, 최대 {self.max_articles}개 수집...")
+        
+        # 제목/요약만으로 AI 관련 기사 후보 선별 (네트워크 요청 없음, 피드 순서 유지)
+        candidates = []
+        for entry in feed.entries:
+            preview = {
+                'title': getattr(entry, 'title', ''),
+                'summary': getattr(entry, 'summary', '')[:200]
+            }
+            if self.is_ai_related(preview, keywords):
+                candidates.append(entry)
+        
+        # 앞쪽 후보부터 max_articles개만 원본 URL 해석 (호스트 한도 내에서 병렬 처리)
+        count = 0
+        if candidates:
+            workers = min(Config.CRAWL_MAX_WORKERS, self.max_articles, len(candidates))
+            extract = get_tracer().wrap(self._safe_extract_article_info)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {}  # 후보 순번 -> Future
+                submitted = 0
+                while submitted < len(candidates) and submitted < self.max_articles:
+                    futures[submitted] = executor.submit(extract, candidates[submitted])
+                    submitted += 1
+                
+                index = 0
+                while count < self.max_articles and index < submitted:
+                    article = futures.pop(index).result()
+                    index += 1
+                    if article:
+                        count += 1
+                        print(f"✅ [{count}] {article['title'][:50]}...")
+                        yield article
+                    elif submitted < len(candidates):
+                        # 실패한 자리는 다음 후보로 채움
+                        futures[submitted] = executor.submit(extract, candidates[submitted])
+                        submitted += 1
+        
+        self.host_limiter.save()
+        
+        print(f"🎯 총 {count}개 AI 관련 최신 기사 수집 완료")
+    
+    def build_feed_url(self, keywords):
+        """키워드 검색용 Google News RSS URL"""
+        encoded_query = quote(self.build_search_query(keywords))
+        return f"{self.base_url}?q={encoded_query}&hl=ko&gl=KR&ceid=KR:ko"
+    
+    def fetch_feed(self, rss_url, conditional=False):
+        """RSS 피드 요청 후 파싱 결과 반환
+        
+        conditional=True면 지난 응답의 ETag/Last-Modified로 조건부 요청을 보내고,
+        304이거나 본문이 지난번과 같으면 파싱하지 않고 None을 반환한다.
+        """
+        headers = {}
+        validators = self._feed_validators.get(rss_url, {}) if conditional else {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        with get_tracer().span('collect.feed', conditional=bool(headers)) as span:
+            with self.host_limiter.slot(rss_url) as slot:
+                response = self.session.get(rss_url, headers=headers, timeout=30)
+                slot.observe(response)
+            span.tag(status=response.status_code)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        
+        # 검증자를 보내지 않는 응답도 있으므로 본문 해시로 한 번 더 확인
+        digest = hashlib.sha1(response.content).hexdigest()
+        unchanged = conditional and validators.get('digest') == digest
+        self._feed_validators[rss_url] = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'digest': digest
+        }
+        if unchanged:
+            return None
+        
+        # feedparser로 RSS 파싱
+        with get_tracer().span('collect.parse', bytes=len(response.content)):
+            return feedparser.parse(response.content)
+    
+    def fetch_new_entries(self, keywords, seen_store, conditional=True):
+        """폴링용 - 피드가 바뀌었을 때 아직 보지 않은 AI 관련 RSS 항목만 반환
+        
+        (새 항목 목록, 피드 변경 여부) 반환. 변경이 없으면 조건부 요청 1회로 끝난다.
+        """
+        feed = self.fetch_feed(self.build_feed_url(keywords), conditional=conditional)
+        if feed is None:
+            return [], False
+        
+        candidates = []
+        for entry in feed.entries:
+            preview = {
+                'title': getattr(entry, 'title', ''),
+                'summary': getattr(entry, 'summary', '')[:200]
+            }
+            if getattr(entry, 'link', None) and self.is_ai_related(preview, keywords):
+                candidates.append(entry)
+        
+        # 본 적 있는 기사는 원본 URL 해석도 하지 않음
+        unseen = set(seen_store.filter_unseen([entry.link for entry in candidates]))
+        return [entry for entry in candidates if entry.link in unseen], True
+    
+    def resolve_entries(self, entries):
+        """RSS 항목들을 기사 딕셔너리로 변환 (원본 URL 병렬 해석, 'feed_id'에 RSS 링크 보관)"""
+        if not entries:
             return []
+        
+        workers = min(Config.CRAWL_MAX_WORKERS, len(entries))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(get_tracer().wrap(self._safe_extract_article_info), entries))
+        self.host_limiter.save()
+        
+        articles = []
+        for entry, article in zip(entries, results):
+            if article:
+                article['feed_id'] = entry.link
+                articles.append(article)
+        return articles
+    
+    def _safe_extract_article_info(self, entry):
+        """워커 스레드용 기사 정보 추출 (예외를 로그로 처리)"""
+        try:
+            with get_tracer().span('collect.article', article=getattr(entry, 'title', '')[:80]):
+                return self.extract_article_info(entry)
+        except Exception as e:
+            logger.warning(f"기사 처리 중 오류: {e}")
+            return None
     
     def extract_article_info(self, entry):
         """RSS entry에서 기사 정보 추출"""
@@ -140,7 +265,26 @@ class GoogleNewsCollector:
             return None
     
     def extract_original_url(self, google_news_url):
-        """Google News URL에서 원본 기사 URL 추출"""
+        """Google News URL에서 원본 기사 URL 추출 (PREWARM_CACHE_TTL 동안 해석 결과 재사용)"""
+        now = time.time()
+        with self._resolved_lock:
+            cached = self._resolved_urls.get(google_news_url)
+        if cached and now - cached[1] < Config.PREWARM_CACHE_TTL:
+            return cached[0]
+        
+        original_url = self._resolve_original_url(google_news_url)
+        if original_url != google_news_url:
+            with self._resolved_lock:
+                # 만료된 항목 정리 후 저장
+                self._resolved_urls = {
+                    url: entry for url, entry in self._resolved_urls.items()
+                    if now - entry[1] < Config.PREWARM_CACHE_TTL
+                }
+                self._resolved_urls[google_news_url] = (original_url, now)
+        return original_url
+    
+    def _resolve_original_url(self, google_news_url):
+        """리다이렉트를 따라가 원본 기사 URL 확인"""
         try:
             # Google News 리다이렉트 URL 처리
             if 'news.google.com' in google_news_url:
@@ -153,7 +297,9 @@ class GoogleNewsCollector:
                         return params['url'][0]
                 
                 # 다른 방법으로 실제 URL 추출 시도
-                response = self.session.head(google_news_url, allow_redirects=True, timeout=10)
+                with self.host_limiter.slot(google_news_url) as slot:
+                    response = self.session.head(google_news_url, allow_redirects=True, timeout=10)
+                    slot.observe(response)
                 return response.url
             
             return google_news_url
@@ -164,20 +310,10 @@ class GoogleNewsCollector:
     
     def is_ai_related(self, article, keywords):
         """기사가 AI 관련인지 확인"""
-        text_to_check = f"{article['title']} {article['summary']}".lower()
-        
-        # 핵심 AI 키워드 체크
-        ai_keywords = [
-            '인공지능', 'ai', '생성형ai', 'chatgpt', 'gpt', 'llm',
-            '머신러닝', '딥러닝', '신경망', '자율주행', 'ai반도체',
-            '네이버', '카카오', '삼성ai', '클로바'
-        ]
-        
-        for keyword in ai_keywords:
-            if keyword.lower() in text_to_check:
-                return True
+        text_to_check = f"{article['title']} {article['summary']}"
         
-        return False
+        # 핵심 AI 키워드 체크 (모듈 로드 시 한 번만 컴파일)
+        return AI_KEYWORDS_PATTERN.search(text_to_check) is not None
     
     def filter_recent_articles(self, articles, hours=24):
         """최근 시간 내 기사만 필터링"""
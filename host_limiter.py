@@ -0,0 +1,177 @@
+# host_limiter.py - 도메인별 적응형 동시성 제어 (AIMD)
+import os
+import json
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlparse
+import requests
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class HostState:
+    """호스트 하나의 동시성 상태"""
+    
+    def __init__(self, limit, ewma_latency=None):
+        self.limit = float(limit)
+        self.inflight = 0
+        self.ewma_latency = ewma_latency
+        self.cooldown_until = 0.0
+        self.successes = 0
+        self.failures = 0
+    
+    def to_dict(self):
+        return {
+            'limit': round(self.limit, 3),
+            'ewma_latency': round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+            'successes': self.successes,
+            'failures': self.failures
+        }
+
+class RequestSlot:
+    """요청 하나의 결과를 기록하는 슬롯"""
+    
+    def __init__(self):
+        self.status_code = None
+        self.retry_after = None
+    
+    def observe(self, response):
+        """응답 상태 코드와 Retry-After 헤더 기록"""
+        self.status_code = response.status_code
+        retry_after = response.headers.get('Retry-After', '')
+        if retry_after.isdigit():
+            self.retry_after = int(retry_after)
+
+class HostLimiter:
+    """호스트별 동시 요청 수를 AIMD 방식으로 조절하는 클래스
+    
+    지연시간과 오류율이 양호하면 동시성을 조금씩 늘리고(additive increase),
+    429/503 응답이나 타임아웃이 발생하면 절반으로 줄인다(multiplicative decrease).
+    """
+    
+    BACKOFF_STATUS = (429, 503)
+    
+    def __init__(self, state_file=None):
+        self.config = Config
+        self.state_file = state_file or self.config.HOST_LIMITS_FILE
+        self.hosts = {}
+        self._condition = threading.Condition()
+        self._load()
+    
+    def _load(self):
+        """이전 실행에서 학습한 호스트별 한도 불러오기"""
+        if not os.path.exists(self.state_file):
+            return
+        
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"호스트 한도 파일 로드 실패 (무시됨): {e}")
+            return
+        
+        for host, info in saved.items():
+            limit = self._clamp(info.get('limit', self.config.HOST_CONCURRENCY_INITIAL))
+            state = HostState(limit, info.get('ewma_latency'))
+            state.successes = info.get('successes', 0)
+            state.failures = info.get('failures', 0)
+            self.hosts[host] = state
+    
+    def save(self):
+        """호스트별 한도를 파일로 저장"""
+        with self._condition:
+            snapshot = {host: state.to_dict() for host, state in self.hosts.items()}
+        
+        try:
+            directory = os.path.dirname(self.state_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.state_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning(f"호스트 한도 저장 실패: {e}")
+    
+    def _clamp(self, limit):
+        return max(self.config.HOST_CONCURRENCY_MIN, min(self.config.HOST_CONCURRENCY_MAX, limit))
+    
+    def _state(self, host):
+        state = self.hosts.get(host)
+        if state is None:
+            state = HostState(self.config.HOST_CONCURRENCY_INITIAL)
+            self.hosts[host] = state
+        return state
+    
+    @contextmanager
+    def slot(self, url):
+        """호스트 슬롯을 확보한 뒤 요청 실행, 종료 시 결과를 반영"""
+        host = urlparse(url).netloc.lower()
+        self._acquire(host)
+        
+        slot = RequestSlot()
+        started = time.monotonic()
+        try:
+            yield slot
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            self._release(host, time.monotonic() - started, backoff=True)
+            raise
+        except BaseException:
+            self._release(host, None, backoff=False)
+            raise
+        else:
+            backoff = slot.status_code in self.BACKOFF_STATUS
+            self._release(host, time.monotonic() - started, backoff=backoff, retry_after=slot.retry_after)
+    
+    def _acquire(self, host):
+        with self._condition:
+            state = self._state(host)
+            while True:
+                wait = state.cooldown_until - time.monotonic()
+                if wait <= 0 and state.inflight < int(state.limit):
+                    state.inflight += 1
+                    return
+                self._condition.wait(timeout=wait if wait > 0 else None)
+    
+    def _release(self, host, latency, backoff=False, retry_after=None):
+        with self._condition:
+            state = self._state(host)
+            state.inflight -= 1
+            
+            if backoff:
+                # Multiplicative decrease + 잠시 대기
+                state.failures += 1
+                state.limit = self._clamp(state.limit / 2)
+                cooldown = retry_after if retry_after is not None else self.config.HOST_BACKOFF_SECONDS
+                state.cooldown_until = time.monotonic() + cooldown
+                logger.info(f"🐢 {host} 동시성 감소 → {state.limit:.1f} ({cooldown}초 대기)")
+            elif latency is not None:
+                state.successes += 1
+                if state.ewma_latency is None:
+                    state.ewma_latency = latency
+                else:
+                    state.ewma_latency = 0.8 * state.ewma_latency + 0.2 * latency
+                
+                # 지연시간이 목표 이내일 때만 Additive increase
+                if state.ewma_latency <= self.config.HOST_LATENCY_TARGET:
+                    state.limit = self._clamp(state.limit + 1.0 / state.limit)
+            
+            self._condition.notify_all()
+    
+    def get_statistics(self):
+        """호스트별 현재 상태 반환"""
+        with self._condition:
+            return {host: state.to_dict() for host, state in self.hosts.items()}
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+def get_host_limiter():
+    """수집기/크롤러가 공유하는 HostLimiter 반환"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostLimiter()
+        return _shared_limiter
@@ -0,0 +1,240 @@
+# http_client.py - 공유 HTTP 클라이언트 (연결 풀, keep-alive, DNS 캐시, 요청 지표)
+import socket
+import time
+import threading
+import logging
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+from tracing import get_tracer, record_phase
+
+logger = logging.getLogger(__name__)
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """timeout을 지정하지 않은 요청에 기본 타임아웃을 적용하는 어댑터"""
+    
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+class TracedSession(requests.Session):
+    """요청마다 HTTP span을 남기는 세션 (추적이 꺼져 있으면 일반 Session과 같음)"""
+    
+    def send(self, request, **kwargs):
+        tracer = get_tracer()
+        if not tracer.enabled:
+            return super().send(request, **kwargs)
+        
+        with tracer.http_span(request.method, urlparse(request.url).netloc.lower()) as span:
+            response = super().send(request, **kwargs)
+            # 리다이렉트를 따라간 경우 첫 응답의 elapsed가 이 요청의 첫 바이트까지 시간
+            first = response.history[0] if response.history else response
+            span.elapsed = first.elapsed.total_seconds()
+            span.tag(status=response.status_code)
+            if not kwargs.get('stream'):
+                span.tag(bytes=len(response.content))
+            return response
+
+def _install_connect_timing():
+    """urllib3 연결 수립(DNS+TCP+TLS) 시간을 진행 중인 HTTP span에 기록하도록 connect() 감싸기 (한 번만)"""
+    try:
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+    except ImportError:
+        return
+    
+    for cls in (HTTPConnection, HTTPSConnection):
+        original = cls.__dict__.get('connect')
+        if original is None or getattr(original, 'traced', False):
+            continue
+        
+        def connect(self, _original=original):
+            started = time.perf_counter()
+            try:
+                return _original(self)
+            finally:
+                record_phase('connect', time.perf_counter() - started)
+        
+        connect.traced = True
+        cls.connect = connect
+
+class DNSCache:
+    """socket.getaddrinfo 결과를 TTL 동안 캐시"""
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._original = None
+        self.hits = 0
+        self.misses = 0
+        self.run_counts = {}  # 실행 id -> {'hits', 'misses'} (그 실행 스레드의 조회만)
+    
+    def install(self):
+        """프로세스 전역 getaddrinfo 교체 (한 번만)"""
+        if self._original is not None:
+            return
+        self._original = socket.getaddrinfo
+        socket.getaddrinfo = self.getaddrinfo
+    
+    def getaddrinfo(self, host, port, *args, **kwargs):
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        run_id = get_tracer().current_run()
+        
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self.hits += 1
+                self._count_run(run_id, 'hits')
+                return cached[1]
+        
+        started = time.perf_counter()
+        result = self._original(host, port, *args, **kwargs)
+        record_phase('dns', time.perf_counter() - started)
+        
+        with self._lock:
+            self._cache[key] = (now + self.ttl, result)
+            self.misses += 1
+            self._count_run(run_id, 'misses')
+        
+        return result
+    
+    def _count_run(self, run_id, kind):
+        if run_id is not None:
+            counts = self.run_counts.setdefault(run_id, {'hits': 0, 'misses': 0})
+            counts[kind] += 1
+    
+    def get_counts(self, run_id=None):
+        """적중/실패 횟수 (run_id를 주면 그 실행분만)"""
+        with self._lock:
+            if run_id is None:
+                return {'hits': self.hits, 'misses': self.misses}
+            return dict(self.run_counts.get(run_id, {'hits': 0, 'misses': 0}))
+    
+    def end_run(self, run_id):
+        with self._lock:
+            self.run_counts.pop(run_id, None)
+
+class HttpClient:
+    """모든 모듈이 공유하는 HTTP 연결 풀 관리 클래스
+    
+    모듈별 기본 헤더는 create_session()으로 만든 세션에 두고,
+    실제 연결 풀(어댑터)은 모든 세션이 함께 사용한다.
+    """
+    
+    def __init__(self):
+        self.config = Config
+        self.timeout = self.config.REQUEST_TIMEOUT
+        
+        # 기본 어댑터 + 호스트별 크기 지정 어댑터
+        self.default_adapter = TimeoutHTTPAdapter(
+            timeout=self.timeout,
+            pool_connections=self.config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.config.HTTP_POOL_MAXSIZE
+        )
+        self.host_adapters = {
+            prefix: TimeoutHTTPAdapter(timeout=self.timeout, pool_connections=1, pool_maxsize=size)
+            for prefix, size in self.config.HTTP_HOST_POOL_SIZES.items()
+        }
+        
+        # DNS 캐시
+        self.dns_cache = DNSCache(self.config.DNS_CACHE_TTL)
+        self.dns_cache.install()
+        # 연결 시간 계측은 추적이 켜졌을 때만 urllib3에 설치
+        get_tracer().on_enable(_install_connect_timing)
+        
+        # 호스트별 요청 지표 (프로세스 전체 + 실행별)
+        self.metrics = {}
+        self.run_metrics = {}  # 실행 id -> 호스트별 지표 (Tracer.run_scope() 안에서 보낸 요청만)
+        self._metrics_lock = threading.Lock()
+    
+    def create_session(self, headers=None):
+        """공유 연결 풀을 사용하는 세션 생성"""
+        session = TracedSession()
+        if headers:
+            session.headers.update(headers)
+        
+        session.mount('http://', self.default_adapter)
+        session.mount('https://', self.default_adapter)
+        for prefix, adapter in self.host_adapters.items():
+            session.mount(prefix, adapter)
+        
+        session.hooks['response'].append(self._record_response)
+        return session
+    
+    def _record_response(self, response, *args, **kwargs):
+        """응답 지표 기록 (response hook - 요청을 보낸 스레드에서 호출되므로 그 스레드의 실행에 귀속)"""
+        host = urlparse(response.url).netloc.lower()
+        run_id = get_tracer().current_run()
+        
+        with self._metrics_lock:
+            self._add_response(self.metrics, host, response)
+            if run_id is not None:
+                self._add_response(self.run_metrics.setdefault(run_id, {}), host, response)
+        
+        return response
+    
+    @staticmethod
+    def _add_response(metrics, host, response):
+        metric = metrics.setdefault(host, {
+            'requests': 0,
+            'errors': 0,
+            'total_time': 0.0,
+            'max_time': 0.0,
+            'bytes': 0
+        })
+        elapsed = response.elapsed.total_seconds()
+        length = response.headers.get('Content-Length', '')
+        metric['requests'] += 1
+        metric['total_time'] += elapsed
+        metric['max_time'] = max(metric['max_time'], elapsed)
+        if response.status_code >= 400:
+            metric['errors'] += 1
+        if length.isdigit():
+            metric['bytes'] += int(length)
+    
+    def get_metrics(self, run_id=None):
+        """호스트별 요청 지표 반환 (run_id를 주면 그 실행에서 보낸 요청만)"""
+        with self._metrics_lock:
+            source = self.metrics if run_id is None else self.run_metrics.get(run_id, {})
+            metrics = {}
+            for host, metric in source.items():
+                metric = dict(metric)
+                metric['avg_time'] = metric['total_time'] / metric['requests'] if metric['requests'] else 0
+                metrics[host] = metric
+        
+        metrics['_dns'] = self.dns_cache.get_counts(run_id)
+        return metrics
+    
+    def end_run(self, run_id):
+        """실행이 끝난 뒤 실행별 지표 정리"""
+        with self._metrics_lock:
+            self.run_metrics.pop(run_id, None)
+        self.dns_cache.end_run(run_id)
+    
+    def print_metrics(self):
+        """요청 지표 출력"""
+        metrics = self.get_metrics()
+        dns = metrics.pop('_dns')
+        
+        print(f"\n🌐 HTTP 요청 통계:")
+        for host, metric in sorted(metrics.items(), key=lambda item: -item[1]['total_time']):
+            print(f"  • {host}: {metric['requests']}회, 평균 {metric['avg_time']:.2f}초, 오류 {metric['errors']}회")
+        print(f"  • DNS 캐시: {dns['hits']} hit / {dns['misses']} miss")
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+def get_http_client():
+    """프로세스 전역 HttpClient 반환"""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
@@ -0,0 +1,203 @@
+# image_probe.py - 기사 이미지 후보 검사 (실제 크기/용량 기반 필터링)
+import struct
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from config import Config
+from tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+class ImageProber:
+    """이미지 URL을 부분 요청(Range)으로 검사하여 작은 트래커/아이콘을 걸러내는 클래스"""
+    
+    def __init__(self, session=None):
+        self.config = Config
+        self.session = session or requests.Session()
+        
+        # 이미지 URL별 검사 결과 캐시
+        self._cache = {}
+        self._lock = threading.Lock()
+        
+        self.stats = {
+            'probed': 0,
+            'cache_hits': 0,
+            'rejected': 0
+        }
+    
+    def filter_images(self, candidates, limit=None):
+        """후보 이미지를 병렬 검사 후 유효한 이미지만 반환 (원래 순서 유지)"""
+        limit = limit or self.config.MAX_IMAGES
+        if not candidates:
+            return []
+        
+        # 중복 URL 제거
+        unique = []
+        seen = set()
+        for candidate in candidates:
+            if candidate['url'] not in seen:
+                seen.add(candidate['url'])
+                unique.append(candidate)
+        
+        workers = min(self.config.IMAGE_PROBE_WORKERS, len(unique))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(get_tracer().wrap(lambda c: self.probe(c['url'])), unique))
+        
+        images = []
+        for candidate, result in zip(unique, results):
+            if not result['valid']:
+                continue
+            image = dict(candidate)
+            image['width'] = result['width']
+            image['height'] = result['height']
+            image['bytes'] = result['bytes']
+            images.append(image)
+            if len(images) >= limit:
+                break
+        
+        return images
+    
+    def probe(self, url):
+        """이미지 하나 검사 (캐시 우선)"""
+        with self._lock:
+            cached = self._cache.get(url)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return cached
+        
+        result = self._probe_remote(url)
+        
+        with self._lock:
+            self._cache[url] = result
+            self.stats['probed'] += 1
+            if not result['valid']:
+                self.stats['rejected'] += 1
+        
+        return result
+    
+    def _probe_remote(self, url):
+        """이미지 앞부분만 받아 헤더에서 크기 확인"""
+        result = {'url': url, 'width': None, 'height': None, 'bytes': None, 'valid': False}
+        probe_bytes = self.config.IMAGE_PROBE_BYTES
+        
+        try:
+            response = self.session.get(
+                url,
+                headers={'Range': f'bytes=0-{probe_bytes - 1}'},
+                timeout=self.config.IMAGE_PROBE_TIMEOUT,
+                stream=True
+            )
+            try:
+                if response.status_code not in (200, 206):
+                    return result
+                
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and not content_type.startswith('image/'):
+                    return result
+                
+                result['bytes'] = self._total_size(response)
+                
+                head = b''
+                for chunk in response.iter_content(chunk_size=4096):
+                    head += chunk
+                    if len(head) >= probe_bytes:
+                        break
+            finally:
+                response.close()
+            
+            if result['bytes'] is None:
+                result['bytes'] = len(head) if len(head) < probe_bytes else None
+            
+            size = self._parse_dimensions(head)
+            if size:
+                result['width'], result['height'] = size
+            
+            result['valid'] = self._is_large_enough(result)
+        
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"이미지 검사 실패 ({url}): {e}")
+        
+        return result
+    
+    def _total_size(self, response):
+        """응답 헤더에서 전체 파일 크기 추출"""
+        content_range = response.headers.get('Content-Range', '')
+        if '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            if total.isdigit():
+                return int(total)
+        
+        if response.status_code == 200:
+            length = response.headers.get('Content-Length', '')
+            if length.isdigit():
+                return int(length)
+        
+        return None
+    
+    def _is_large_enough(self, result):
+        """최소 크기/용량 기준 충족 여부"""
+        if result['width'] is not None and result['height'] is not None:
+            return (result['width'] >= self.config.IMAGE_MIN_WIDTH and
+                    result['height'] >= self.config.IMAGE_MIN_HEIGHT)
+        
+        # 크기를 알 수 없으면 용량으로 판단
+        if result['bytes'] is not None:
+            return result['bytes'] >= self.config.IMAGE_MIN_BYTES
+        
+        return False
+    
+    def _parse_dimensions(self, data):
+        """이미지 헤더에서 (가로, 세로) 추출 - PNG/GIF/JPEG/WebP"""
+        if len(data) < 24:
+            return None
+        
+        # PNG
+        if data[:8] == b'\x89PNG\r\n\x1a\n':
+            return struct.unpack('>II', data[16:24])
+        
+        # GIF
+        if data[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', data[6:10])
+        
+        # WebP
+        if data[:4] == b'RIFF' and data[8:12] == b'WEBP' and len(data) >= 30:
+            chunk = data[12:16]
+            if chunk == b'VP8 ':
+                width, height = struct.unpack('<HH', data[26:30])
+                return width & 0x3fff, height & 0x3fff
+            if chunk == b'VP8L':
+                bits = int.from_bytes(data[21:25], 'little')
+                return (bits & 0x3fff) + 1, ((bits >> 14) & 0x3fff) + 1
+            if chunk == b'VP8X':
+                width = int.from_bytes(data[24:27], 'little') + 1
+                height = int.from_bytes(data[27:30], 'little') + 1
+                return width, height
+            return None
+        
+        # JPEG - SOF 마커 탐색
+        if data[:2] == b'\xff\xd8':
+            index = 2
+            while index + 9 < len(data):
+                if data[index] != 0xff:
+                    index += 1
+                    continue
+                marker = data[index + 1]
+                if marker in (0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7, 0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf):
+                    height, width = struct.unpack('>HH', data[index + 5:index + 9])
+                    return width, height
+                if marker in (0xd8, 0x01) or 0xd0 <= marker <= 0xd7:
+                    index += 2
+                    continue
+                segment_length = struct.unpack('>H', data[index + 2:index + 4])[0]
+                index += 2 + segment_length
+            return None
+        
+        return None
+    
+    def get_statistics(self):
+        """검사 통계 반환"""
+        with self._lock:
+            stats = self.stats.copy()
+            stats['cached'] = len(self._cache)
+        return stats
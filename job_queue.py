@@ -0,0 +1,229 @@
+# job_queue.py - 파이프라인 작업 큐 (토픽별 상태 머신 + 중복 요청 합치기)
+import os
+import sys
+import time
+import tempfile
+import threading
+import logging
+from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """파이프라인 1회 실행 (여러 요청자가 같은 실행을 공유할 수 있음)"""
+    
+    def __init__(self, job_id, topic):
+        self.job_id = job_id
+        self.topic = topic
+        self.state = "queued"  # queued -> running -> done
+        self.triggers = []
+        self.stage_callbacks = []
+        self.requested_at = datetime.now()
+        self.started_at = None
+        self.future = Future()
+    
+    def add_requester(self, trigger_source, on_stage=None):
+        self.triggers.append(trigger_source)
+        if on_stage is not None:
+            self.stage_callbacks.append(on_stage)
+    
+    def on_stage(self, stage, total, name):
+        """요청자들의 진행 상황 콜백에 단계 전달"""
+        for callback in list(self.stage_callbacks):
+            try:
+                callback(stage, total, name)
+            except Exception as e:
+                logger.warning(f"진행 상황 콜백 오류 (작업 #{self.job_id}): {e}")
+    
+    @property
+    def trigger_label(self):
+        """실행 기록용 트리거 이름 (합쳐진 요청은 '+'로 연결)"""
+        return '+'.join(dict.fromkeys(self.triggers))
+
+class JobQueue:
+    """토픽별로 한 번에 하나의 실행만 허용하는 작업 큐
+    
+    토픽 상태는 idle(running 없음) → running → running + 후속 작업 대기 순으로 바뀐다.
+    실행 중에 들어온 요청은 모두 하나의 후속 작업으로 합쳐지므로, 요청이 몰려도
+    추가 실행은 최대 1회다. 요청자는 submit()이 돌려준 Future로 자기 요청이 반영된
+    실행 결과를 받는다. 서로 다른 토픽은 JOB_MAX_CONCURRENT개까지 동시에 실행된다.
+    """
+    
+    def __init__(self, runner=None, max_concurrent=None):
+        self.config = Config
+        self.max_concurrent = max_concurrent or self.config.JOB_MAX_CONCURRENT
+        self._lock = threading.Lock()
+        self._runners = {}
+        self._running = {}  # topic -> Job
+        self._pending = {}  # topic -> Job (후속 작업, 토픽당 최대 1개)
+        self._next_id = 1
+        self._executor = None
+        self.stats = {'submitted': 0, 'runs': 0, 'coalesced': 0}
+        
+        self.register_topic(self.config.JOB_DEFAULT_TOPIC, runner=runner)
+        for topic, keywords in self.config.JOB_TOPICS.items():
+            self.register_topic(topic, keywords=keywords)
+    
+    def register_topic(self, topic, keywords=None, runner=None):
+        """토픽 등록. runner(trigger_source, on_stage)는 결과 딕셔너리를 반환해야 한다"""
+        if runner is None:
+            from pipeline_runner import PipelineRunner
+            runner = PipelineRunner(keywords=keywords, topic=topic).run
+        with self._lock:
+            self._runners[topic] = runner
+    
+    @property
+    def topics(self):
+        return list(self._runners)
+    
+    def submit(self, trigger_source="manual", topic=None, on_stage=None):
+        """실행 요청 후 Future 반환 (결과: runner가 돌려준 딕셔너리)
+        
+        토픽이 실행 중이면 후속 작업에 합류하고, 후속 작업이 이미 있으면 그 Future를 공유한다.
+        """
+        topic = topic or self.config.JOB_DEFAULT_TOPIC
+        with self._lock:
+            if topic not in self._runners:
+                raise KeyError(f"등록되지 않은 토픽: {topic}")
+            self.stats['submitted'] += 1
+            
+            if topic not in self._running:
+                job = self._new_job(topic)
+                job.add_requester(trigger_source, on_stage)
+                self._start(job)
+                return job.future
+            
+            job = self._pending.get(topic)
+            if job is None:
+                job = self._pending[topic] = self._new_job(topic)
+                logger.info(f"⏳ [{topic}] 실행 중 - 후속 작업 #{job.job_id} 예약 ({trigger_source})")
+            else:
+                self.stats['coalesced'] += 1
+                logger.info(f"🔗 [{topic}] 후속 작업 #{job.job_id}에 요청 합침 ({trigger_source})")
+            job.add_requester(trigger_source, on_stage)
+            return job.future
+    
+    def is_busy(self, topic=None):
+        with self._lock:
+            return (topic or self.config.JOB_DEFAULT_TOPIC) in self._running
+    
+    def has_pending(self, topic=None):
+        with self._lock:
+            return (topic or self.config.JOB_DEFAULT_TOPIC) in self._pending
+    
+    def get_status(self):
+        """토픽별 상태 (idle / running / running+pending)"""
+        with self._lock:
+            status = {}
+            for topic in self._runners:
+                running = self._running.get(topic)
+                pending = self._pending.get(topic)
+                status[topic] = {
+                    'state': 'idle' if running is None else ('running+pending' if pending else 'running'),
+                    'running_job': running.job_id if running else None,
+                    'running_since': running.started_at.strftime('%Y-%m-%d %H:%M:%S') if running and running.started_at else None,
+                    'pending_requests': len(pending.triggers) if pending else 0
+                }
+            return status
+    
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor:
+            executor.shutdown(wait=wait)
+    
+    def _new_job(self, topic):
+        job = Job(self._next_id, topic)
+        self._next_id += 1
+        return job
+    
+    def _start(self, job):
+        """lock을 잡은 상태에서 호출"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="pipeline-job")
+        self._running[job.topic] = job
+        self.stats['runs'] += 1
+        self._executor.submit(self._run, job)
+    
+    def _run(self, job):
+        job.state = "running"
+        job.started_at = datetime.now()
+        logger.info(f"🚀 [{job.topic}] 작업 #{job.job_id} 시작 (요청 {len(job.triggers)}건: {job.trigger_label})")
+        
+        try:
+            result = self._runners[job.topic](job.trigger_label, job.on_stage)
+            job.future.set_result(result)
+        except Exception as e:
+            logger.error(f"❌ [{job.topic}] 작업 #{job.job_id} 오류: {e}")
+            job.future.set_exception(e)
+        finally:
+            job.state = "done"
+            with self._lock:
+                del self._running[job.topic]
+                follow_up = self._pending.pop(job.topic, None)
+                if follow_up is not None:
+                    self._start(follow_up)
+
+def check_topic_overlap(hold_seconds=1.0):
+    """서로 다른 토픽 작업이 실제로 겹쳐서 실행되는지 확인 (토픽별 실행 잠금/크롤링 저널 경로 포함)"""
+    from process_lock import PipelineRunLock
+    
+    print("🧪 토픽 동시 실행 확인")
+    print("=" * 40)
+    
+    topics = ['overlap-a', 'overlap-b']
+    periods = {}
+    
+    with tempfile.TemporaryDirectory() as state_dir:
+        def make_runner(topic):
+            # NewsPipeline과 같은 규칙으로 토픽별 잠금 파일 사용
+            lock_path = Config.get_topic_file(os.path.join(state_dir, 'pipeline.lock'), topic)
+            
+            def runner(trigger_source, on_stage=None):
+                with PipelineRunLock(lock_path).hold(trigger_source, wait=hold_seconds * 4) as lock_state:
+                    started = time.monotonic()
+                    if lock_state == 'acquired':
+                        time.sleep(hold_seconds)
+                    periods[topic] = (started, time.monotonic(), lock_state)
+                return {'success': lock_state == 'acquired'}
+            return runner
+        
+        queue = JobQueue(runner=lambda trigger_source, on_stage=None: {'success': True}, max_concurrent=len(topics))
+        for topic in topics:
+            queue.register_topic(topic, runner=make_runner(topic))
+        futures = [queue.submit("check", topic=topic) for topic in topics]
+        results = [future.result(timeout=hold_seconds * 10) for future in futures]
+        queue.shutdown()
+    
+    (a_start, a_end, a_state), (b_start, b_end, b_state) = periods[topics[0]], periods[topics[1]]
+    overlapped = a_start < b_end and b_start < a_end
+    acquired = all(result['success'] for result in results)
+    print(f"  • 실행 잠금: {a_state} / {b_state}")
+    print(f"  • 실행 구간 겹침: {'✅' if overlapped else '❌'} ({min(a_end, b_end) - max(a_start, b_start):.2f}초)")
+    
+    # 설정된 토픽들이 크롤링 저널/실행 잠금 파일을 나눠 쓰는지
+    configured = [Config.JOB_DEFAULT_TOPIC] + list(Config.JOB_TOPICS)
+    journals = {Config.get_topic_file(Config.CRAWL_JOURNAL_FILE, topic) for topic in configured}
+    locks = {Config.get_topic_file(Config.PIPELINE_LOCK_FILE, topic) for topic in configured}
+    separated = len(journals) == len(locks) == len(configured)
+    print(f"  • 토픽별 저널/잠금 파일 분리: {'✅' if separated else '❌'} (토픽 {len(configured)}개)")
+    
+    if Config.JOB_MAX_CONCURRENT < 2 and Config.JOB_TOPICS:
+        print(f"  ⚠️ JOB_MAX_CONCURRENT={Config.JOB_MAX_CONCURRENT} - 설정상 토픽은 하나씩 실행됩니다")
+    
+    ok = overlapped and acquired and separated
+    print(f"\n{'✅ 토픽 작업이 동시에 실행됩니다' if ok else '❌ 토픽 작업이 동시에 실행되지 않습니다'}")
+    return ok
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    if command == 'check':
+        sys.exit(0 if check_topic_overlap() else 1)
+    print("사용법:")
+    print("  python3 job_queue.py check  # 서로 다른 토픽 작업이 동시에 실행되는지 확인")
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,8 @@ Google News 간단 수집 시스템 - OpenAI 제외 버전
 """
 
 import time
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 import logging
 import sys
 import os
@@ -16,6 +17,14 @@ try:
     from config import Config
     from google_news_collector import GoogleNewsCollector
     from article_crawler import ArticleCrawler
+    from http_client import get_http_client
+    from outbox import Outbox, get_outbox
+    from subscriptions import get_subscription_registry, send_digests
+    from notifier import get_notifier
+    from run_history import get_run_history, diff_metrics
+    from pipeline_runner import PIPELINE_STAGES
+    from process_lock import PipelineRunLock
+    from tracing import get_tracer, print_summary
     
     # Notion 모듈
     try:
@@ -49,33 +58,32 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def create_simple_summary(articles):
-    """OpenAI 없이 간단한 요약 데이터 생성"""
+class SummaryBuilder:
+    """요약 데이터를 기사 단위로 쌓는 클래스 (스트리밍 파이프라인에서 크롤링되는 대로 추가)
     
-    # 기사들을 시간순으로 정렬
-    sorted_articles = sorted(articles, key=lambda x: x.get('published', datetime.now()), reverse=True)
-    
-    # 간단한 메타데이터 생성
-    summary_data = {
-        'total_articles': len(articles),
-        'collection_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'articles': [],
-        'sources': set(),
-        'keywords_found': set(),
-        'date_range': {
-            'latest': None,
-            'earliest': None
-        }
-    }
+    키워드 검색 등 기사별 처리는 add()에서 바로 하고, 순위/날짜 범위/통계는 build()에서 계산한다.
+    """
     
-    # 각 기사 처리
-    for i, article in enumerate(sorted_articles, 1):
+    def __init__(self):
+        self.entries = []
+        self.sources = set()
+        self.keywords_found = set()
+        self.search_keywords = [keyword.lower() for keyword in Config.get_search_keywords()]
+        self.original_keywords = Config.get_search_keywords()
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def add(self, article):
+        """크롤링이 끝난 기사 하나 추가"""
+        published = article.get('published', datetime.now())
+        
         # 기본 정보 추출
         article_data = {
-            'rank': i,
+            'rank': None,
             'title': article.get('title', 'No Title'),
             'source': article.get('source', 'Unknown Source'),
-            'published': article.get('published', datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+            'published': published.strftime('%Y-%m-%d %H:%M:%S'),
             'url': article.get('url', ''),
             'content': article.get('content', '')[:500] + '...' if article.get('content') else 'No Content',
             'content_length': len(article.get('content', '')),
@@ -83,33 +91,49 @@ def create_simple_summary(articles):
         }
         
         # 소스 추가
-        summary_data['sources'].add(article_data['source'])
+        self.sources.add(article_data['source'])
         
         # 키워드 찾기 (제목과 내용에서)
         text_to_check = (article_data['title'] + ' ' + article.get('content', '')).lower()
-        for keyword in Config.get_search_keywords():
-            if keyword.lower() in text_to_check:
-                summary_data['keywords_found'].add(keyword)
+        for keyword, original in zip(self.search_keywords, self.original_keywords):
+            if keyword in text_to_check:
+                self.keywords_found.add(original)
         
-        summary_data['articles'].append(article_data)
+        self.entries.append((published, article_data))
     
-    # 날짜 범위 설정
-    if summary_data['articles']:
-        summary_data['date_range']['latest'] = summary_data['articles'][0]['published']
-        summary_data['date_range']['earliest'] = summary_data['articles'][-1]['published']
-    
-    # set을 list로 변환
-    summary_data['sources'] = list(summary_data['sources'])
-    summary_data['keywords_found'] = list(summary_data['keywords_found'])
-    
-    # 간단한 통계 생성
-    summary_data['stats'] = {
-        'total_sources': len(summary_data['sources']),
-        'keywords_found_count': len(summary_data['keywords_found']),
-        'avg_content_length': sum(a['content_length'] for a in summary_data['articles']) // len(summary_data['articles']) if summary_data['articles'] else 0
-    }
-    
-    return summary_data
+    def build(self):
+        """수집된 기사로 요약 데이터 완성 (최신순 정렬 후 순위 부여)"""
+        ordered = [data for _, data in sorted(self.entries, key=lambda entry: entry[0], reverse=True)]
+        for i, article_data in enumerate(ordered, 1):
+            article_data['rank'] = i
+        
+        summary_data = {
+            'total_articles': len(ordered),
+            'collection_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'articles': ordered,
+            'sources': list(self.sources),
+            'keywords_found': list(self.keywords_found),
+            'date_range': {
+                'latest': ordered[0]['published'] if ordered else None,
+                'earliest': ordered[-1]['published'] if ordered else None
+            }
+        }
+        
+        # 간단한 통계 생성
+        summary_data['stats'] = {
+            'total_sources': len(summary_data['sources']),
+            'keywords_found_count': len(summary_data['keywords_found']),
+            'avg_content_length': sum(a['content_length'] for a in ordered) // len(ordered) if ordered else 0
+        }
+        
+        return summary_data
+
+def create_simple_summary(articles):
+    """OpenAI 없이 간단한 요약 데이터 생성"""
+    builder = SummaryBuilder()
+    for article in articles:
+        builder.add(article)
+    return builder.build()
 
 def send_success_notification(summary_data, notion_url):
     """성공 알림 전송 - telegram_sender.py의 send_summary_message 사용"""
@@ -123,13 +147,37 @@ def send_success_notification(summary_data, notion_url):
         return False
 
 def send_error_notification(error_message):
-    """에러 알림 전송 - telegram_sender.py의 send_error_notification 사용"""
-    try:
-        telegram = TelegramSender()
-        return telegram.send_error_notification(error_message)
-    except Exception as e:
-        logger.error(f"에러 알림 전송 실패: {e}")
-        return False
+    """에러 알림 전송 - 전송 큐에 넣고 바로 반환 (같은 오류 반복은 묶어서 전송)"""
+    return get_notifier().notify_error("Google News 수집", error_message)
+
+def deliver_via_outbox(summary_data, html_content):
+    """리포트를 아웃박스에 등록하고 항목 반환 (OUTBOX_WAIT_SECONDS 동안만 전송 결과를 기다림, 기본은 즉시 반환)"""
+    outbox = get_outbox()
+    
+    # 같은 수집 결과는 한 번만 전송되도록 내용 기반 key 사용
+    idempotency_key = Outbox.make_key(
+        'report',
+        summary_data['collection_time'],
+        *[article['url'] for article in summary_data['articles']]
+    )
+    outbox.enqueue('report', {
+        'summary_data': summary_data,
+        'html_content': html_content,
+        'notion_mode': Config.NOTION_SAVE_MODE
+    }, idempotency_key=idempotency_key)
+    outbox.start_flusher()
+    
+    deadline = time.time() + Config.OUTBOX_WAIT_SECONDS
+    while True:
+        item = outbox.get_item(idempotency_key)
+        if item['status'] in ('done', 'dead') or time.time() >= deadline:
+            break
+        time.sleep(0.5)
+    
+    if item['status'] == 'dead':
+        send_error_notification(f"리포트 전송 실패: {item['last_error']}")
+    
+    return item
 
 def create_simple_html_report(summary_data):
     """간단한 HTML 리포트 생성 (OpenAI 없는 버전)"""
@@ -219,126 +267,385 @@ def create_simple_html_report(summary_data):
     
     return html_content
 
-def main():
-    """Google News 간단 수집 메인 함수 (OpenAI 제외)"""
-    start_time = time.time()
-    
-    print("\n🤖 Google News 간단 수집 시스템 (OpenAI 제외)")
-    print("=" * 70)
-    print(f"🔧 프로젝트: {Config.PROJECT_CODE}")
-    print(f"⚙️ 시스템: {Config.SYSTEM_NAME} {Config.SYSTEM_VERSION}")
-    print(f"📊 목표: 최신 {Config.MAX_ARTICLES}개 AI 뉴스 수집")
-    print(f"💰 특징: OpenAI API 비용 없음!")
-    print(f"🕐 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-
-    try:
-        # 1단계: 설정 검증 (OpenAI 제외)
-        print(f"\n🔍 1단계: 설정 검증 중...")
-        Config.validate_config()
-        print("✅ 설정 검증 완료 (OpenAI API 불필요)")
-
-        # 2단계: Google News 검색
-        print(f"\n🔍 2단계: Google News에서 AI 뉴스 검색 중...")
-        print(f"🎯 검색 키워드: {', '.join(Config.get_search_keywords()[:5])}...")
+class NewsPipeline:
+    """수집 → 크롤링 → 정리 → Notion → Telegram 파이프라인 (프로세스 안에서 반복 실행)
+    
+    수집기/크롤러/저장기는 처음 실행할 때 만들어 두고 다음 실행에서 재사용하므로
+    HTTP 연결 풀, DNS/스키마 캐시, 컴파일된 정규식이 실행 간에 유지된다.
+    컨트롤러는 서브프로세스 없이 run()을 직접 호출한다.
+    """
+    
+    def __init__(self, keywords=None, max_articles=None, topic=None):
+        self.keywords = keywords or Config.get_all_keywords()
+        self.max_articles = max_articles or Config.MAX_ARTICLES
+        self.topic = topic or Config.JOB_DEFAULT_TOPIC
+        self.result = {}
+        self._on_stage = None
+        self._stage_marks = []
+        self._stage_span = None
+        self._lock = threading.Lock()
+        # 같은 호스트의 다른 컨트롤러 프로세스와 같은 토픽 동시 실행 방지 (토픽마다 별도 잠금)
+        self.run_lock = PipelineRunLock(Config.get_topic_file(Config.PIPELINE_LOCK_FILE, self.topic))
+        self._shared_record = None  # 기다린 다른 프로세스 실행의 기록
+        self._collector = None
+        self._crawler = None
+        self._notion_saver = None
+    
+    @property
+    def collector(self):
+        if self._collector is None:
+            self._collector = GoogleNewsCollector(max_articles=self.max_articles)
+        return self._collector
+    
+    @property
+    def crawler(self):
+        if self._crawler is None:
+            self._crawler = ArticleCrawler(journal_path=Config.get_topic_file(Config.CRAWL_JOURNAL_FILE, self.topic))
+        return self._crawler
+    
+    @property
+    def notion_saver(self):
+        if self._notion_saver is None:
+            self._notion_saver = NotionSaver()
+        return self._notion_saver
+    
+    def run(self, trigger_source="manual", on_stage=None):
+        """파이프라인 1회 실행 후 결과 딕셔너리 반환 (같은 인스턴스는 한 번에 하나만 실행)
         
-        collector = GoogleNewsCollector(max_articles=Config.MAX_ARTICLES)
-        articles = collector.collect_latest_news(Config.get_all_keywords())
+        on_stage(stage, total, name)는 각 단계가 시작될 때 실행 스레드에서 호출된다.
+        """
+        with self._lock, self.run_lock.hold(trigger_source, finished=self._finished_since) as lock_state:
+            if lock_state != 'acquired':
+                # 다른 프로세스(컨트롤러)가 실행 중이었음 - 다시 크롤링/저장하지 않고 그 결과를 공유
+                return self._shared_result(trigger_source, lock_state)
+            
+            self._on_stage = on_stage
+            self._stage_marks = []
+            metrics_before = self._metrics_snapshot()
+            start_time = datetime.now()
+            self.result = {
+                'trigger': trigger_source,
+                'topic': self.topic,
+                'start_time': start_time,
+                'success': False,
+                'error': None,
+                'articles': 0,
+                'notion_url': None
+            }
+            
+            tracer = get_tracer()
+            try:
+                # 이 실행(과 wrap()으로 넘긴 워커 스레드)에서 보낸 HTTP 요청만 이 실행 지표로 집계
+                with tracer.run_scope() as run_id, tracer.trace('pipeline.run', trigger=trigger_source) as trace_span:
+                    try:
+                        success = self._execute()
+                    finally:
+                        self._finish_stage_span()
+            finally:
+                self._on_stage = None
+            
+            if trace_span.summary:
+                print_summary(trace_span.summary)
+                logger.info(f"⏱️ 추적 기록: {tracer.path} (trace {trace_span.summary['trace']})")
+            
+            end_time = datetime.now()
+            self.result.update({
+                'success': bool(success),
+                'end_time': end_time,
+                'duration': (end_time - start_time).total_seconds(),
+                'stages': self._stage_durations(),
+                'metrics': diff_metrics(metrics_before, self._metrics_snapshot(run_id)),
+                # 크롤링 단계 전에 끝난 실행은 크롤러 통계가 이전 실행 값이므로 제외
+                'crawl': self._crawler.get_statistics() if self._crawler and self.result.get('stage', 0) >= 3 else {}
+            })
+            get_http_client().end_run(run_id)
+            self._record_history()
+            return dict(self.result)
+    
+    def prewarm(self):
+        """예약 실행 전 캐시 채우기 - 피드 조회, 원본 URL 해석, 본문 크롤링까지만 하고 전송하지 않음
         
-        if not articles:
-            error_msg = "Google News에서 AI 관련 최신 기사를 찾을 수 없습니다."
-            print(f"❌ {error_msg}")
-            send_error_notification(error_msg)
+        DNS/TLS 연결과 URL/본문 캐시가 데워져 있어 이어지는 run()은 대부분 캐시를 읽는다.
+        실패해도 예약 실행에는 영향이 없으며, 성공 여부를 반환한다.
+        """
+        with self._lock, get_tracer().trace('pipeline.prewarm'):
+            started = time.monotonic()
+            try:
+                articles = self.collector.collect_latest_news(self.keywords)
+                cached = self.crawler.warm_cache(articles) if articles else 0
+            except Exception as e:
+                logger.warning(f"⚠️ prewarm 실패 (예약 실행은 그대로 진행): {e}")
+                return False
+            
+            logger.info(f"🔥 prewarm 완료: 기사 {len(articles)}개 중 {cached}개 본문 캐시 ({time.monotonic() - started:.1f}초)")
+            return True
+    
+    def _finished_since(self, started_at):
+        """started_at 이후에 시작된 같은 토픽 실행 기록이 있는지 (있으면 공유할 기록으로 보관)"""
+        self._shared_record = None
+        try:
+            # 같은 토픽의 기록만 (다른 토픽 실행 결과를 이 토픽 결과로 돌려주지 않음)
+            latest = get_run_history().recent(1, topic=self.topic)
+        except Exception as e:
+            logger.warning(f"실행 기록 조회 실패 - 직접 실행: {e}")
             return False
-
-        print(f"✅ {len(articles)}개 기사 수집 완료")
-
-        # 3단계: 기사 본문 크롤링
-        print(f"\n📄 3단계: 기사 본문 크롤링 중...")
         
-        crawler = ArticleCrawler()
-        crawled_articles = crawler.crawl_articles(articles)
+        # 기다린 실행보다 오래된 기록(어제 성공 등)은 그 실행의 결과가 아님
+        if latest and latest[0]['start_time'].timestamp() >= started_at:
+            self._shared_record = latest[0]
+        return self._shared_record is not None
+    
+    def _shared_result(self, trigger_source, lock_state):
+        """같은 토픽을 실행하던 다른 프로세스를 기다린 경우의 결과 (그 실행의 기록을 공유)"""
+        now = datetime.now()
+        result = {
+            'trigger': trigger_source,
+            'topic': self.topic,
+            'start_time': now,
+            'end_time': now,
+            'duration': 0,
+            'success': False,
+            'error': None,
+            'articles': 0,
+            'notion_url': None,
+            'shared_run': True,
+            'notified': True
+        }
         
-        if not crawled_articles:
-            error_msg = "기사 본문 크롤링에 실패했습니다."
-            print(f"❌ {error_msg}")
-            send_error_notification(error_msg)
-            return False
+        if lock_state == 'timeout':
+            result['error'] = f"다른 프로세스의 파이프라인 실행이 {Config.PIPELINE_LOCK_WAIT}초 안에 끝나지 않았습니다"
+            result['notified'] = False
+            return result
+        
+        record = self._shared_record
+        if record:
+            result.update({key: record[key] for key in ('start_time', 'success', 'error', 'articles', 'notion_url')})
+            result['duration'] = record['duration'] or 0
+            result['end_time'] = record['start_time'] + timedelta(seconds=result['duration'])
+        else:
+            result['error'] = "다른 프로세스의 실행 결과를 찾을 수 없습니다"
+        return result
+    
+    def _metrics_snapshot(self, run_id=None):
+        """실행별 HTTP 지표 + 누적 이미지 캐시 지표 (실행 전후 차이로 실행별 지표 계산)
+        
+        HTTP 지표는 run_id 실행에서 보낸 요청만 세므로(실행 전에는 비어 있음) 동시에 도는
+        다른 토픽 실행, prewarm, 폴러의 요청은 섞이지 않는다. 아웃박스/텔레그램 큐처럼
+        자체 스레드에서 보내는 전송은 실행 지표에 포함되지 않는다.
+        """
+        snapshot = {'http': get_http_client().get_metrics(run_id) if run_id else {}, 'images': {}}
+        if self._crawler is not None:
+            snapshot['images'] = self._crawler.get_image_statistics()
+        return snapshot
+    
+    def _stage_durations(self):
+        """단계 이름 -> 소요시간(초). 각 단계는 다음 단계 시작(마지막은 종료) 시점까지"""
+        marks = self._stage_marks + [(None, time.monotonic())]
+        return {
+            name: round(marks[i + 1][1] - started, 3)
+            for i, (name, started) in enumerate(marks[:-1])
+        }
+    
+    def _record_history(self):
+        """실행 기록 저장 (기록 실패는 파이프라인 결과에 영향 없음)"""
+        try:
+            history = get_run_history()
+            history.record(self.result)
+            history.prune()
+        except Exception as e:
+            logger.warning(f"실행 기록 저장 실패: {e}")
+    
+    def _stage(self, stage):
+        """단계 시작 알림 (콜백 오류는 파이프라인에 영향 없음)"""
+        self.result['stage'] = stage
+        self._stage_marks.append((PIPELINE_STAGES[stage - 1], time.monotonic()))
+        self._finish_stage_span()
+        self._stage_span = get_tracer().start_span('stage', stage=stage, stage_name=PIPELINE_STAGES[stage - 1])
+        if self._on_stage is None:
+            return
+        try:
+            self._on_stage(stage, len(PIPELINE_STAGES), PIPELINE_STAGES[stage - 1])
+        except Exception as e:
+            logger.warning(f"진행 상황 콜백 오류: {e}")
+    
+    def _finish_stage_span(self):
+        if self._stage_span is not None:
+            self._stage_span.finish()
+            self._stage_span = None
+    
+    def _mark_first(self, items, stage, message):
+        """스트림에서 첫 항목이 나오는 시점을 다음 단계 시작으로 표시"""
+        for i, item in enumerate(items):
+            if i == 0:
+                print(message)
+                self._stage(stage)
+            yield item
+    
+    def _fail(self, error_msg):
+        """실패 사유 기록 + 에러 알림"""
+        self.result['error'] = error_msg
+        send_error_notification(error_msg)
+    
+    def _execute(self):
+        """파이프라인 단계 실행 (성공 시 True)"""
+        start_time = time.time()
+        
+        print("\n🤖 Google News 간단 수집 시스템 (OpenAI 제외)")
+        print("=" * 70)
+        print(f"🔧 프로젝트: {Config.PROJECT_CODE}")
+        print(f"⚙️ 시스템: {Config.SYSTEM_NAME} {Config.SYSTEM_VERSION}")
+        print(f"📊 목표: 최신 {self.max_articles}개 AI 뉴스 수집")
+        print(f"💰 특징: OpenAI API 비용 없음!")
+        print(f"🕐 실행 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        try:
+            # 1단계: 설정 검증 (OpenAI 제외)
+            print(f"\n🔍 1단계: 설정 검증 중...")
+            self._stage(1)
+            Config.validate_config()
+            print("✅ 설정 검증 완료 (OpenAI API 불필요)")
+
+            # 2-4단계: 수집 → 크롤링 → 정리를 스트림으로 연결
+            # (원본 URL이 해석된 기사는 바로 크롤링, 크롤링이 끝난 기사는 바로 정리 - 단계 사이 버퍼는 CRAWL_STREAM_BUFFER로 제한)
+            print(f"\n🔍 2단계: Google News에서 AI 뉴스 검색 중...")
+            self._stage(2)
+            print(f"🎯 검색 키워드: {', '.join(Config.get_search_keywords()[:5])}...")
+            
+            collected = self._mark_first(
+                self.collector.iter_latest_news(self.keywords), 3, "\n📄 3단계: 기사 본문 크롤링 중 (수집과 동시 진행)..."
+            )
+            # 같은 날 같은 검색의 중단된 크롤링만 저널에서 이어받음
+            journal_key = f"{datetime.now().strftime('%Y-%m-%d')} {self.collector.build_feed_url(self.keywords)}"
+            crawled = self._mark_first(
+                self.crawler.crawl_stream(collected, journal_key), 4, "\n📊 4단계: 데이터 정리 중 (크롤링과 동시 진행, AI 요약 없음)..."
+            )
+            
+            builder = SummaryBuilder()
+            for article in crawled:
+                builder.add(article)
             
-        print(f"✅ {len(crawled_articles)}개 기사 크롤링 완료")
+            if not len(builder):
+                error_msg = "Google News에서 AI 관련 최신 기사를 찾을 수 없습니다."
+                print(f"❌ {error_msg}")
+                self._fail(error_msg)
+                return False
+            
+            summary_data = builder.build()
+            self.result['articles'] = len(summary_data['articles'])
+            print(f"✅ {len(summary_data['articles'])}개 기사 수집/크롤링/정리 완료")
 
-        # 4단계: 간단한 요약 데이터 생성 (OpenAI 없이)
-        print(f"\n📊 4단계: 데이터 정리 중 (AI 요약 없음)...")
-        
-        summary_data = create_simple_summary(crawled_articles)
-        print("✅ 데이터 정리 완료")
+            # 5단계: HTML 리포트 생성
+            print(f"\n📋 5단계: 리포트 생성 중...")
+            self._stage(5)
+            
+            html_content = create_simple_html_report(summary_data)
+            print("✅ 리포트 생성 완료")
 
-        # 5단계: HTML 리포트 생성
-        print(f"\n📋 5단계: 리포트 생성 중...")
-        
-        html_content = create_simple_html_report(summary_data)
-        print("✅ 리포트 생성 완료")
+            if Config.OUTBOX_ENABLED:
+                # 6-7단계: 아웃박스에 리포트 등록 → 백그라운드 전송 (장애 시에도 수집 결과 보존)
+                print(f"\n📮 6단계: 아웃박스 등록 중...")
+                self._stage(6)
+                
+                item = deliver_via_outbox(summary_data, html_content)
+                notion_url = item['state'].get('notion_url')
+                telegram_success = item['state'].get('telegram_sent', False)
+                # 실행 결과에는 전송 상태만 기록 (전송 완료를 기다리지 않음)
+                self.result['delivery'] = {'done': 'delivered', 'dead': 'failed'}.get(item['status'], 'queued')
+                
+                if notion_url:
+                    print(f"✅ Notion 저장 완료")
+                    logger.info(f"Notion URL: {notion_url}")
+                else:
+                    print("📮 전송 대기열에 등록 - 백그라운드에서 전송/재시도합니다 (python3 outbox.py flush)")
+            else:
+                # 6단계: Notion 저장
+                print(f"\n💾 6단계: Notion 저장 중...")
+                self._stage(6)
+                
+                # 저장 모드(page/rows/daily)는 NOTION_SAVE_MODE 설정을 따름
+                notion_url = self.notion_saver.save(summary_data, html_content)
+                
+                if not notion_url:
+                    error_msg = "Notion 저장에 실패했습니다."
+                    print(f"❌ {error_msg}")
+                    self._fail(error_msg)
+                    return False
+                
+                print(f"✅ Notion 저장 완료")
+                logger.info(f"Notion URL: {notion_url}")
 
-        # 6단계: Notion 저장
-        print(f"\n💾 6단계: Notion 저장 중...")
-        
-        notion_saver = NotionSaver()
-        notion_url = notion_saver.save_to_notion(summary_data, html_content)
-        
-        if not notion_url:
-            error_msg = "Notion 저장에 실패했습니다."
-            print(f"❌ {error_msg}")
-            send_error_notification(error_msg)
-            return False
+                # 7단계: Telegram 전송
+                print(f"\n📱 7단계: Telegram 전송 중...")
+                self._stage(7)
+                
+                telegram_success = send_success_notification(summary_data, notion_url)
+                
+                # 구독 채팅별 맞춤 다이제스트 (같은 수집 결과 재사용)
+                if get_subscription_registry().subscribers:
+                    delivered = send_digests(summary_data, notion_url)
+                    print(f"✅ 구독 다이제스트 전송: {len(delivered)}개 채팅")
+
+            self.result['notion_url'] = notion_url
             
-        print(f"✅ Notion 저장 완료")
-        logger.info(f"Notion URL: {notion_url}")
+            # 실행 완료 요약
+            end_time = time.time()
+            duration = round(end_time - start_time, 2)
 
-        # 7단계: Telegram 전송
-        print(f"\n📱 7단계: Telegram 전송 중...")
-        
-        telegram_success = send_success_notification(summary_data, notion_url)
+            print("\n" + "=" * 70)
+            print(f"🎉 Google News 간단 수집 완료!")
+            print(f"📊 처리 결과:")
+            print(f"   • 수집된 기사: {len(summary_data['articles'])}개")
+            print(f"   • 언론사: {summary_data['stats']['total_sources']}곳")
+            print(f"   • 발견된 키워드: {summary_data['stats']['keywords_found_count']}개")
+            print(f"   • 소요시간: {duration}초")
+            print(f"   • Notion 저장: {'✅' if notion_url else '📮 대기'}")
+            print(f"   • Telegram 전송: {'✅' if telegram_success else ('📮 대기' if self.result.get('delivery') == 'queued' else '❌')}")
+            print(f"   • 완료시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print(f"   • 💰 OpenAI API 비용: $0.00")
 
-        # 실행 완료 요약
-        end_time = time.time()
-        duration = round(end_time - start_time, 2)
+            # 주요 뉴스 헤드라인
+            print(f"\n📰 수집된 AI 뉴스 TOP {min(5, len(summary_data['articles']))}:")
+            for i, article in enumerate(summary_data['articles'][:5], 1):
+                print(f"  {i}. {article['title']}")
+                print(f"     📰 {article['source']} | 🕐 {article['published']}")
 
-        print("\n" + "=" * 70)
-        print(f"🎉 Google News 간단 수집 완료!")
-        print(f"📊 처리 결과:")
-        print(f"   • 수집된 기사: {len(summary_data['articles'])}개")
-        print(f"   • 언론사: {summary_data['stats']['total_sources']}곳")
-        print(f"   • 발견된 키워드: {summary_data['stats']['keywords_found_count']}개")
-        print(f"   • 소요시간: {duration}초")
-        print(f"   • Notion 저장: ✅")
-        print(f"   • Telegram 전송: {'✅' if telegram_success else '❌'}")
-        print(f"   • 완료시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"   • 💰 OpenAI API 비용: $0.00")
+            # 주요 키워드
+            if summary_data['keywords_found']:
+                keywords = summary_data['keywords_found'][:8]
+                print(f"\n🏷️ 발견된 키워드: {' '.join([f'#{keyword}' for keyword in keywords])}")
 
-        # 주요 뉴스 헤드라인
-        print(f"\n📰 수집된 AI 뉴스 TOP {min(5, len(summary_data['articles']))}:")
-        for i, article in enumerate(summary_data['articles'][:5], 1):
-            print(f"  {i}. {article['title']}")
-            print(f"     📰 {article['source']} | 🕐 {article['published']}")
+            # HTTP 요청 통계
+            get_http_client().print_metrics()
 
-        # 주요 키워드
-        if summary_data['keywords_found']:
-            keywords = summary_data['keywords_found'][:8]
-            print(f"\n🏷️ 발견된 키워드: {' '.join([f'#{keyword}' for keyword in keywords])}")
+            # 성공 로그
+            logger.info(f"Google News 간단 수집 완료 - {len(summary_data['articles'])}개 기사, {duration}초, OpenAI 비용 없음")
 
-        # 성공 로그
-        logger.info(f"Google News 간단 수집 완료 - {len(summary_data['articles'])}개 기사, {duration}초, OpenAI 비용 없음")
+            return True
 
-        return True
+        except Exception as e:
+            error_msg = f"시스템 실행 중 오류 발생: {str(e)}"
+            logger.error(f"❌ {error_msg}")
+            print(f"❌ {error_msg}")
+            
+            # 에러 알림 전송
+            self._fail(error_msg)
+            
+            return False
 
-    except Exception as e:
-        error_msg = f"시스템 실행 중 오류 발생: {str(e)}"
-        logger.error(f"❌ {error_msg}")
-        print(f"❌ {error_msg}")
-        
-        # 에러 알림 전송
-        send_error_notification(error_msg)
-        
-        return False
+_shared_pipeline = None
+_shared_pipeline_lock = threading.Lock()
+
+def get_pipeline():
+    """프로세스 전역 NewsPipeline 반환 (컨트롤러가 실행 간 재사용)"""
+    global _shared_pipeline
+    with _shared_pipeline_lock:
+        if _shared_pipeline is None:
+            _shared_pipeline = NewsPipeline()
+        return _shared_pipeline
+
+def main():
+    """Google News 간단 수집 메인 함수 (OpenAI 제외)"""
+    return get_pipeline().run(trigger_source="cli")['success']
 
 def test_system():
     """시스템 간단 테스트"""
@@ -378,6 +685,7 @@ def print_help():
     print("  python3 main.py        # 메인 실행")
     print("  python3 main.py test   # 시스템 테스트") 
     print("  python3 main.py config # 설정 정보")
+    print("  python3 main.py trace  # 구간별 시간 추적과 함께 실행 (.state/trace.jsonl)")
     print("  python3 main.py help   # 도움말")
     print("\n💰 특징:")
     print("  • OpenAI API 비용 없음!")
@@ -399,6 +707,11 @@ if __name__ == "__main__":
             test_system()
         elif command == "config":
             Config.print_config()
+        elif command == "trace":
+            # 이번 실행만 구간별 시간 추적 (TRACE_ENABLED 설정과 무관)
+            get_tracer().enable()
+            success = main()
+            sys.exit(0 if success else 1)
         elif command == "help":
             print_help()
         else:
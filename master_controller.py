@@ -2,11 +2,6 @@
 # master_controller.py - 스케줄링 + 디스코드 트리거 통합 시스템
 
 import asyncio
-import schedule
-import time
-import threading
-import subprocess
-import sys
 import os
 import logging
 from datetime import datetime
@@ -20,6 +15,13 @@ except ImportError:
     print("⚠️ discord_trigger.py가 없습니다. Discord 기능이 비활성화됩니다.")
 
 from config import Config
+from notifier import get_notifier
+from pipeline_runner import PipelineRunner
+from job_queue import JobQueue
+from cron_scheduler import CronScheduler
+from run_history import get_run_history
+from news_poller import NewsPoller
+from process_lock import LeaderLease, PipelineRunLock
 
 # 로깅 설정
 logging.basicConfig(
@@ -38,110 +40,101 @@ class MasterController:
     def __init__(self):
         self.config = Config
         self.script_dir = os.path.dirname(os.path.abspath(__file__))
-        self.main_script = os.path.join(self.script_dir, 'main.py')
+        self.main_script = os.path.join(self.script_dir, self.config.PIPELINE_SCRIPT)
         
-        # 실행 상태 관리
-        self.is_running = False
-        self.execution_history = []
+        # 파이프라인 실행기 (기본: 프로세스 내 실행, 세션/캐시 재사용)
+        self.runner = PipelineRunner()
+        
+        # 작업 큐 (실행 중 들어온 요청은 후속 실행 1회로 합쳐짐)
+        self.jobs = JobQueue(runner=self._run_pipeline)
+        
+        # 실행 기록 (재시작해도 유지되는 SQLite 저장소)
+        self.history = get_run_history()
         
         # Discord 트리거 봇
         self.discord_trigger = None
         
+        # 스케줄러 (Config.SCHEDULES, Config.TIMEZONE 기준 - 다음 실행 시각까지 대기)
+        self.scheduler = CronScheduler()
+        
+        # 실시간 폴링 (새 기사만 바로 전송, Config.POLL_ENABLED 또는 poll 명령으로 활성화)
+        self.poller = None
+        
+        # 프로세스 간 조정 - 같은 호스트의 컨트롤러 중 리더만 예약 실행/폴링
+        self.leader = LeaderLease(role="master_controller")
+        
         # 스케줄 설정
         self.schedule_enabled = True
         self.discord_enabled = True
+        self.poll_enabled = self.config.POLL_ENABLED
         
-    def run_news_automation(self, trigger_source="schedule"):
-        """뉴스 자동화 실행 (스케줄 또는 디스코드에서 호출)"""
-        if self.is_running:
-            logger.warning(f"⚠️ 이미 실행 중입니다. 요청 무시됨 (소스: {trigger_source})")
-            return False
+    @property
+    def is_running(self):
+        return self.jobs.is_busy()
+    
+    def run_news_automation(self, trigger_source="schedule", on_stage=None):
+        """뉴스 자동화 실행 (스케줄/수동 - 결과가 나올 때까지 블로킹)
         
+        실행 중이면 거절하지 않고 후속 실행 1회에 합쳐진다.
+        """
+        try:
+            result = self.jobs.submit(trigger_source, on_stage=on_stage).result()
+            return result['success']
+        except Exception as e:
+            logger.error(f"❌ 작업 실행 오류: {e}")
+            return False
+    
+    def _run_pipeline(self, trigger_source, on_stage=None):
+        """작업 큐 runner - 파이프라인 1회 실행 + 기록/알림 (작업 스레드에서 호출)"""
+        start_time = datetime.now()
         try:
-            self.is_running = True
-            start_time = datetime.now()
-            
             logger.info(f"🚀 Google News AI 자동화 시작 (트리거: {trigger_source})")
             logger.info(f"📍 실행 경로: {self.script_dir}")
             logger.info(f"⏰ 시작 시간: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info(f"⚙️ 실행 방식: {'서브프로세스' if self.runner.use_subprocess else '프로세스 내'}")
             
-            # 작업 디렉토리 변경 후 main.py 실행
-            os.chdir(self.script_dir)
+            result = self.runner.run(trigger_source, on_stage)
+            duration = result['duration']
             
-            # Python 스크립트 실행
-            result = subprocess.run(
-                [sys.executable, 'main.py'],
-                capture_output=True,
-                text=True,
-                timeout=300  # 5분 타임아웃
-            )
+            # 실행 기록은 파이프라인이 run_history에 저장 (서브프로세스 실행도 동일)
             
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
-            
-            # 실행 기록 저장
-            execution_record = {
-                'trigger': trigger_source,
-                'start_time': start_time,
-                'end_time': end_time,
-                'duration': duration,
-                'success': result.returncode == 0,
-                'return_code': result.returncode
-            }
-            
-            self.execution_history.append(execution_record)
-            
-            # 최근 10개만 유지
-            if len(self.execution_history) > 10:
-                self.execution_history = self.execution_history[-10:]
-            
-            if result.returncode == 0:
+            if result['success']:
                 logger.info("✅ Google News AI 자동화 성공")
                 logger.info(f"⏱️ 소요시간: {duration:.1f}초")
                 logger.info("📤 결과가 Notion과 Telegram으로 전송되었습니다")
                 
-                # 성공 시 결과 로그 (마지막 10줄만)
-                if result.stdout:
+                # 서브프로세스 실행 시 결과 로그 (마지막 10줄만)
+                if result.get('output_tail'):
                     logger.info("📋 실행 결과:")
-                    for line in result.stdout.split('\n')[-10:]:
-                        if line.strip():
-                            logger.info(f"   {line}")
-                
-                return True
+                    for line in result['output_tail']:
+                        logger.info(f"   {line}")
             else:
                 logger.error("❌ Google News AI 자동화 실패")
-                logger.error(f"Exit code: {result.returncode}")
-                if result.stderr:
-                    logger.error(f"Error: {result.stderr}")
+                if result.get('error'):
+                    logger.error(f"Error: {result['error']}")
                 
-                # 에러 알림
-                self._send_error_notification(trigger_source, result.stderr)
-                return False
+                # 에러 알림 (프로세스 내 실행은 파이프라인이 이미 알림)
+                if not result.get('notified'):
+                    self._send_error_notification(trigger_source, result.get('error'))
+            
+            return result
                 
-        except subprocess.TimeoutExpired:
-            logger.error("⏰ 실행 시간 초과 (5분)")
-            self._send_error_notification(trigger_source, "실행 시간 초과")
-            return False
         except Exception as e:
             logger.error(f"❌ 예상치 못한 오류: {e}")
             self._send_error_notification(trigger_source, str(e))
-            return False
-        finally:
-            self.is_running = False
+            end_time = datetime.now()
+            return {
+                'trigger': trigger_source,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration': (end_time - start_time).total_seconds(),
+                'success': False,
+                'error': str(e)
+            }
     
     def _send_error_notification(self, trigger_source, error_message):
-        """에러 발생 시 텔레그램 알림"""
-        try:
-            error_script = f"""
-import sys
-sys.path.append('{self.script_dir}')
-from telegram_sender import TelegramSender
-telegram = TelegramSender()
-telegram.send_error_notification('시스템 오류 (트리거: {trigger_source}): {error_message[:100]}')
-"""
-            subprocess.run([sys.executable, '-c', error_script], timeout=30)
-        except Exception as e:
-            logger.error(f"에러 알림 전송 실패: {e}")
+        """에러 발생 시 텔레그램 알림 (같은 오류 반복은 묶어서 전송)"""
+        get_notifier().notify_error(f"시스템 오류 (트리거: {trigger_source})", error_message)
     
     def setup_schedule(self):
         """스케줄 설정"""
@@ -149,19 +142,43 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
             logger.info("📅 스케줄 기능이 비활성화되어 있습니다")
             return
         
-        # 매일 오전 7시 30분에 실행
-        schedule.every().day.at("07:30").do(self.run_news_automation, trigger_source="schedule")
+        # Config.SCHEDULES의 일정마다 등록 (기본: 매일 SCHEDULE_TIME)
+        for spec in self.config.SCHEDULES:
+            # 리더만 실행 - 대기 인스턴스는 기록 없이 건너뛰고, 승계되거나 리더가 실행할 때까지 재확인
+            self.scheduler.add_job(spec, self._run_scheduled, guard=self._is_leader)
+            # 일정별 prewarm (Config.SCHEDULE_PREWARM / PREWARM_MINUTES) - 몇 분 전에 캐시만 채움
+            prewarm_minutes = self.config.get_prewarm_minutes(spec)
+            if prewarm_minutes > 0:
+                self.scheduler.add_job(
+                    spec, self._run_prewarm, name=f"{spec} (prewarm)",
+                    offset_minutes=-prewarm_minutes, catch_up=False, guard=self._is_leader
+                )
         
         logger.info("📅 스케줄 설정 완료:")
-        logger.info("   • 실행 시간: 매일 오전 7시 30분")
+        logger.info(f"   • 실행 일정: {', '.join(self.config.SCHEDULES)} ({self.config.TIMEZONE})")
+        prewarms = [f"{spec} -{self.config.get_prewarm_minutes(spec)}분" for spec in self.config.SCHEDULES if self.config.get_prewarm_minutes(spec) > 0]
+        if prewarms:
+            logger.info(f"   • prewarm: {', '.join(prewarms)}")
         logger.info("   • 작업: Google News AI 자동화")
         logger.info("   • 결과: Notion + Telegram 자동 전송")
         
         # 다음 실행 시간 표시
-        next_run = schedule.next_run()
+        next_run = self.scheduler.next_run()
         if next_run:
             logger.info(f"   • 다음 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
     
+    def _run_scheduled(self):
+        """예약 실행 (리더만 - guard로 확인) - 작업 큐에 넣고 바로 반환 (스케줄러는 다음 일정을 계속 대기)"""
+        self.jobs.submit("schedule")
+    
+    def _run_prewarm(self):
+        """prewarm 예약 실행 (리더만 - guard로 확인, 별도 스레드)"""
+        self.runner.start_prewarm()
+    
+    def _is_leader(self):
+        """예약 실행 조건 (스케줄러 guard)"""
+        return self.leader.is_leader
+    
     def setup_discord_trigger(self):
         """Discord 트리거 설정"""
         if not self.discord_enabled:
@@ -186,56 +203,9 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
         # Discord 트리거 커스터마이징
         self.discord_trigger = DiscordTrigger()
         
-        # 원본 트리거 메서드를 래핑하여 통합 관리
-        original_trigger = self.discord_trigger._trigger_news_collection
-        
-        async def wrapped_trigger(message):
-            """Discord 트리거를 Master Controller를 통해 실행"""
-            try:
-                # 실행 상태 확인
-                if self.is_running:
-                    await message.add_reaction('⏳')
-                    await message.reply("🔄 현재 AI 뉴스 수집이 진행 중입니다. 잠시만 기다려주세요!")
-                    return
-                
-                # 즉시 반응
-                await message.add_reaction('🚀')
-                status_msg = await message.reply("🚀 Google News AI 뉴스 수집을 시작합니다! 약 1-2분 소요될 예정입니다...")
-                
-                logger.info(f"🚀 Discord 트리거 수신: {message.author.name}")
-                
-                # Master Controller를 통해 실행
-                success = self.run_news_automation(trigger_source="discord")
-                
-                # 결과 처리
-                if success:
-                    await message.add_reaction('✅')
-                    
-                    success_message = f"""✅ **Google News AI 뉴스 수집 완료!**
-
-🕐 **완료시간:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-📊 **상태:** 성공
-🎯 **트리거:** Discord ({message.author.name})
-
-🔗 **결과 확인:**
-• Notion 페이지에서 상세 내용 확인
-• Telegram에서 요약 리포트 수신
-
-다음 수집을 원하시면 언제든 `!뉴스`를 입력해주세요! 🚀"""
-                    
-                    await status_msg.edit(content=success_message)
-                    
-                else:
-                    await message.add_reaction('❌')
-                    await status_msg.edit(content="❌ **뉴스 수집 실패**\n\n로그를 확인하거나 잠시 후 다시 시도해주세요.")
-                
-            except Exception as e:
-                logger.error(f"❌ Discord 트리거 처리 오류: {e}")
-                await message.add_reaction('💥')
-                await message.reply(f"💥 오류가 발생했습니다: {str(e)}")
-        
-        # 트리거 메서드 교체
-        self.discord_trigger._trigger_news_collection = wrapped_trigger
+        # 컨트롤러 작업 큐를 공유 - 스케줄/Discord 요청이 같은 실행에 합쳐지고 실행 기록도 한 곳에 남음
+        self.discord_trigger.jobs = self.jobs
+        self.discord_trigger.runner = self.runner
         
         logger.info("🤖 Discord 트리거 설정 완료:")
         logger.info(f"   • 봇 토큰: {'설정됨' if discord_token else '없음'}")
@@ -244,28 +214,46 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
         
         return self.discord_trigger
     
+    def setup_poller(self):
+        """실시간 폴링 설정 (Discord 트리거가 있으면 채널로도 전송)"""
+        if not self.poll_enabled:
+            return None
+        
+        push_targets = [self.discord_trigger.push_article] if self.discord_trigger else []
+        self.poller = NewsPoller(push_targets=push_targets, leader=self.leader)
+        
+        logger.info("⚡ 실시간 폴링 설정 완료:")
+        logger.info(f"   • 간격: {self.config.POLL_MIN_INTERVAL}~{self.config.POLL_MAX_INTERVAL}초 (기사 발생 속도에 맞춰 조절)")
+        logger.info(f"   • 전송: Telegram{' + Discord' if push_targets else ''}")
+        return self.poller
+    
     def run_schedule_loop(self):
-        """스케줄 루프 (별도 스레드에서 실행)"""
+        """스케줄 루프 (scheduler.stop() 호출 시 즉시 종료)"""
         logger.info("📅 스케줄 루프 시작")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # 1분마다 체크
+            self.scheduler.run()
         except Exception as e:
             logger.error(f"❌ 스케줄 루프 오류: {e}")
     
     def get_status(self):
         """현재 상태 반환"""
-        next_run = schedule.next_run()
+        next_run = self.scheduler.next_run()
         
         status = {
             'is_running': self.is_running,
+            'progress': self.runner.get_progress(),
+            'jobs': self.jobs.get_status(),
             'schedule_enabled': self.schedule_enabled,
             'discord_enabled': self.discord_enabled,
+            'leader': self.leader.get_status(),
+            'other_process_run': PipelineRunLock().holder(),
+            'poller': self.poller.get_status() if self.poller else None,
             'next_scheduled_run': next_run.strftime('%Y-%m-%d %H:%M:%S') if next_run else None,
-            'execution_history': self.execution_history[-5:],  # 최근 5개
-            'total_executions': len(self.execution_history)
+            'schedules': self.scheduler.get_jobs(),
+            'execution_history': self.history.recent(5),  # 최근 5개
+            'total_executions': self.history.count(),
+            'statistics': self.history.get_statistics()
         }
         
         return status
@@ -277,8 +265,22 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
         print("\n📊 Master Controller 상태:")
         print("=" * 50)
         print(f"🔄 현재 실행 상태: {'실행 중' if status['is_running'] else '대기 중'}")
+        progress = self.runner.format_progress()
+        if progress:
+            print(f"   • 진행: {progress}")
+        if status['progress'].get('last_line'):
+            print(f"   • 마지막 출력: {status['progress']['last_line']}")
+        for topic, job_status in status['jobs'].items():
+            if job_status['state'] != 'idle':
+                print(f"   • [{topic}] {job_status['state']} (작업 #{job_status['running_job']}, 대기 요청 {job_status['pending_requests']}건)")
+        if status['other_process_run'] and not status['is_running']:
+            print(f"   • 다른 프로세스 실행 중: {status['other_process_run']['owner']} (트리거: {status['other_process_run']['trigger']})")
+        print(f"👑 리더: {'이 프로세스' if status['leader']['is_leader'] else (status['leader']['leader'] or '없음')}")
         print(f"📅 스케줄 기능: {'활성화' if status['schedule_enabled'] else '비활성화'}")
         print(f"🤖 Discord 트리거: {'활성화' if status['discord_enabled'] else '비활성화'}")
+        if status['poller']:
+            poller = status['poller']
+            print(f"⚡ 실시간 폴링: {poller['interval']}초 간격, 폴링 {poller['polls']}회 (변경 없음 {poller['unchanged']}회), 전송 {poller['delivered']}개")
         
         if status['next_scheduled_run']:
             print(f"⏰ 다음 스케줄 실행: {status['next_scheduled_run']}")
@@ -290,6 +292,10 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
             for i, record in enumerate(status['execution_history'], 1):
                 result = "✅ 성공" if record['success'] else "❌ 실패"
                 print(f"  {i}. {record['start_time'].strftime('%m-%d %H:%M')} | {record['trigger']} | {result} | {record['duration']:.1f}s")
+        
+        print("\n⏱️ 실행 통계:")
+        for line in self.history.format_summary():
+            print(f"  • {line}")
     
     def run(self):
         """마스터 컨트롤러 실행"""
@@ -298,33 +304,46 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
         logger.info(f"🔧 프로젝트: {self.config.PROJECT_CODE}")
         logger.info(f"⚙️ 시스템: {self.config.SYSTEM_NAME} {self.config.SYSTEM_VERSION}")
         
+        # 리더 선출 (대기 인스턴스는 리더가 죽으면 임대 만료 후 승계)
+        self.leader.start()
+        
         # 스케줄 설정
         self.setup_schedule()
         
         # Discord 트리거 설정
         discord_trigger = self.setup_discord_trigger()
         
+        # 실시간 폴링 설정
+        poller = self.setup_poller()
+        
         print("\n🎯 실행 방법:")
         print("=" * 50)
         if self.schedule_enabled:
-            next_run = schedule.next_run()
+            next_run = self.scheduler.next_run()
             if next_run:
                 print(f"📅 자동 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
         
         if self.discord_enabled and discord_trigger:
             print("🤖 Discord 트리거: 디스코드 채널에 '!뉴스' 입력")
         
-        print("⚡ 수동 실행: python3 main.py")
+        if poller:
+            print("⚡ 실시간 폴링: 새 AI 기사를 바로 Telegram으로 전송")
+        
+        print(f"⚡ 수동 실행: python3 {self.config.PIPELINE_SCRIPT}")
         print("📊 상태 확인: Ctrl+C 후 'status' 명령어")
         
         try:
+            if poller and (self.schedule_enabled or discord_trigger):
+                # 폴링은 다른 모드와 함께 별도 스레드에서 실행
+                poller.start()
+                logger.info("⚡ 폴링 스레드 시작됨")
+            
             if self.schedule_enabled and self.discord_enabled and DISCORD_AVAILABLE and discord_trigger:
                 # 둘 다 활성화된 경우: 스케줄은 별도 스레드, Discord는 메인 스레드
                 logger.info("🔄 스케줄 + Discord 통합 모드 시작")
                 
                 # 스케줄 스레드 시작
-                schedule_thread = threading.Thread(target=self.run_schedule_loop, daemon=True)
-                schedule_thread.start()
+                self.scheduler.start()
                 logger.info("📅 스케줄 스레드 시작됨")
                 
                 # Discord 봇 실행 (메인 스레드)
@@ -341,10 +360,16 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
                 logger.info("🤖 Discord 전용 모드 시작")
                 discord_trigger.run()
                 
+            elif poller:
+                # 폴링만 활성화
+                logger.info("⚡ 폴링 전용 모드 시작")
+                poller.run()
+                
             else:
                 logger.warning("⚠️ 스케줄과 Discord 모두 비활성화 또는 사용 불가")
                 print("📅 스케줄 전용 모드로 실행합니다...")
                 self.schedule_enabled = True
+                self.setup_schedule()
                 self.run_schedule_loop()
                 
         except KeyboardInterrupt:
@@ -353,6 +378,12 @@ telegram.send_error_notification('시스템 오류 (트리거: {trigger_source})
         except Exception as e:
             logger.error(f"❌ Master Controller 오류: {e}")
             return False
+        finally:
+            # 스케줄/폴링 스레드가 대기 중이면 즉시 깨워 종료
+            self.scheduler.stop()
+            if self.poller:
+                self.poller.stop()
+            self.leader.stop()
         
         return True
 
@@ -380,6 +411,14 @@ def main():
         elif sys.argv[1] == "discord-only":
             controller.schedule_enabled = False
             print("🤖 Discord 전용 모드")
+        elif sys.argv[1] == "poll":
+            controller.poll_enabled = True
+            print("⚡ 실시간 폴링 포함 통합 모드")
+        elif sys.argv[1] == "poll-only":
+            controller.schedule_enabled = False
+            controller.discord_enabled = False
+            controller.poll_enabled = True
+            print("⚡ 실시간 폴링 전용 모드")
         elif sys.argv[1] == "help":
             print("사용법:")
             print("  python3 master_controller.py              # 스케줄 + Discord 통합 실행")
@@ -387,6 +426,8 @@ def main():
             print("  python3 master_controller.py status       # 상태 확인")
             print("  python3 master_controller.py schedule-only # 스케줄만 실행")
             print("  python3 master_controller.py discord-only  # Discord만 실행")
+            print("  python3 master_controller.py poll         # 통합 실행 + 실시간 폴링")
+            print("  python3 master_controller.py poll-only    # 실시간 폴링만 실행")
             print("  python3 master_controller.py help         # 도움말")
             return
     
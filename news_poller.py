@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# news_poller.py - 실시간 폴링 모드 (조건부 요청 + 본 기사 기록으로 새 기사만 즉시 전송)
+import sys
+import time
+import threading
+import logging
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from seen_articles import get_seen_store
+
+logger = logging.getLogger(__name__)
+
+class NewsPoller:
+    """피드를 주기적으로 확인해 새 AI 기사만 크롤링하고 짧은 알림으로 바로 보내는 클래스
+    
+    피드는 ETag/Last-Modified 조건부 요청으로 확인하므로 변경이 없으면 폴링 1회가
+    요청 1번(대부분 304)으로 끝난다. 새 기사 판별은 SeenArticleStore가 맡는다.
+    폴링 간격은 새 기사 발생 속도(분당, 지수이동평균)에 맞춰 폴링마다 기사 1개 정도가
+    잡히도록 POLL_MIN_INTERVAL ~ POLL_MAX_INTERVAL 사이에서 조절한다.
+    처음 실행할 때(기록이 비어 있을 때)는 현재 피드를 기준선으로 기록만 하고 보내지 않는다.
+    """
+    
+    def __init__(self, keywords=None, seen_store=None, push_targets=None, leader=None):
+        self.config = Config
+        self.keywords = keywords or self.config.get_all_keywords()
+        self.seen_store = seen_store or get_seen_store()
+        # 추가 전송 대상 - callable(article) (예: DiscordTrigger.push_article)
+        self.push_targets = list(push_targets or [])
+        # LeaderLease가 주어지면 리더 프로세스에서만 폴링 (여러 컨트롤러의 중복 전송 방지)
+        self.leader = leader
+        
+        self.interval = self.config.POLL_INITIAL_INTERVAL
+        self.velocity = None  # 분당 새 기사 수 (지수이동평균)
+        self._collector = None
+        self._crawler = None
+        self._telegram = None
+        self._force_refresh = False
+        self._resolve_failures = {}  # feed_id -> 원본 URL 해석 실패 횟수
+        self._last_poll = None
+        self._last_prune = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {'polls': 0, 'unchanged': 0, 'new_articles': 0, 'delivered': 0, 'errors': 0}
+    
+    @property
+    def collector(self):
+        if self._collector is None:
+            from google_news_collector import GoogleNewsCollector
+            self._collector = GoogleNewsCollector()
+        return self._collector
+    
+    @property
+    def crawler(self):
+        if self._crawler is None:
+            from article_crawler import ArticleCrawler
+            self._crawler = ArticleCrawler()
+        return self._crawler
+    
+    @property
+    def telegram(self):
+        if self._telegram is None:
+            from telegram_sender import TelegramSender
+            self._telegram = TelegramSender()
+        return self._telegram
+    
+    def poll_once(self):
+        """피드 1회 확인 후 전송한 새 기사 수 반환"""
+        now = time.monotonic()
+        elapsed = now - self._last_poll if self._last_poll else self.interval
+        self._last_poll = now
+        self.stats['polls'] += 1
+        
+        try:
+            entries, changed = self.collector.fetch_new_entries(
+                self.keywords, self.seen_store, conditional=not self._force_refresh
+            )
+        except Exception as e:
+            self._back_off("폴링 실패", e)
+            return 0
+        
+        if not changed:
+            self.stats['unchanged'] += 1
+        
+        if entries and self.seen_store.is_empty():
+            # 첫 폴링 - 이미 피드에 있던 기사는 기준선으로만 기록
+            self.seen_store.mark_seen([{'feed_id': entry.link, 'title': getattr(entry, 'title', '')} for entry in entries], delivered=False)
+            logger.info(f"👀 폴링 기준선 설정: 기존 기사 {len(entries)}개는 보내지 않음")
+            return 0
+        
+        batch = entries[:self.config.POLL_MAX_ARTICLES]
+        # 한도를 넘은 기사는 피드가 그대로여도 다음 폴링에서 처리하도록 조건부 요청 생략
+        self._force_refresh = len(entries) > len(batch)
+        self._update_interval(len(batch), elapsed)
+        
+        if not batch:
+            return 0
+        
+        self.stats['new_articles'] += len(batch)
+        articles = self.collector.resolve_entries(batch)
+        self._track_resolve_failures(entries, batch, articles)
+        if articles:
+            with ThreadPoolExecutor(max_workers=min(self.config.CRAWL_MAX_WORKERS, len(articles))) as executor:
+                list(executor.map(self.crawler.crawl_single, articles))
+        
+        delivered = 0
+        for article in articles:
+            sent = self._deliver(article)
+            # 기사마다 바로 기록 (배치 중간에 종료돼도 이미 보낸 기사는 다시 보내지 않음)
+            self.seen_store.mark_seen([article], delivered=sent)
+            if sent:
+                delivered += 1
+        self.stats['delivered'] += delivered
+        
+        logger.info(f"⚡ 새 기사 {len(articles)}개 전송 (다음 폴링 {self.interval:.0f}초 후)")
+        return delivered
+    
+    def _track_resolve_failures(self, entries, batch, articles):
+        """원본 URL 해석에 실패한 항목은 다음 폴링에서 조건부 요청 없이 다시 시도
+        
+        피드가 바뀌지 않으면 304로 끝나 재시도 기회가 없으므로 _force_refresh를 켠다.
+        POLL_RESOLVE_ATTEMPTS번 실패하면 본 것으로 기록해 더 늦게 "새 기사"로 보내지 않는다.
+        """
+        resolved = {article['feed_id'] for article in articles}
+        failed = [entry for entry in batch if entry.link not in resolved]
+        # 해석에 성공했거나 피드에서 빠진 항목은 실패 기록에서 제거
+        current = {entry.link for entry in entries}
+        self._resolve_failures = {
+            link: attempts for link, attempts in self._resolve_failures.items()
+            if link in current and link not in resolved
+        }
+        if not failed:
+            return
+        
+        given_up = []
+        for entry in failed:
+            attempts = self._resolve_failures.get(entry.link, 0) + 1
+            if attempts >= self.config.POLL_RESOLVE_ATTEMPTS:
+                self._resolve_failures.pop(entry.link, None)
+                given_up.append({'feed_id': entry.link, 'title': getattr(entry, 'title', '')})
+            else:
+                self._resolve_failures[entry.link] = attempts
+        
+        if given_up:
+            self.seen_store.mark_seen(given_up, delivered=False)
+            logger.warning(f"⚠️ 원본 URL 해석 {self.config.POLL_RESOLVE_ATTEMPTS}회 실패 - 기사 {len(given_up)}개 건너뜀")
+        if self._resolve_failures:
+            self._force_refresh = True
+    
+    def _update_interval(self, new_count, elapsed):
+        """관측한 기사 발생 속도로 다음 폴링 간격 계산 (폴링당 기사 1개 정도가 목표)"""
+        observed = new_count / max(elapsed / 60, 1e-6)
+        if self.velocity is None:
+            self.velocity = observed
+        else:
+            alpha = self.config.POLL_VELOCITY_ALPHA
+            self.velocity = alpha * observed + (1 - alpha) * self.velocity
+        
+        target = 60 / self.velocity if self.velocity > 0 else self.config.POLL_MAX_INTERVAL
+        self.interval = min(self.config.POLL_MAX_INTERVAL, max(self.config.POLL_MIN_INTERVAL, target))
+    
+    def _deliver(self, article):
+        """기본 채팅 + 키워드가 맞는 구독 채팅 + 추가 대상으로 전송 (하나라도 성공하면 True)"""
+        from subscriptions import get_subscription_registry
+        
+        message = self.telegram.format_push_message(article)
+        chat_ids = [self.telegram.chat_id]
+        try:
+            chat_ids.extend(get_subscription_registry().match_article(article))
+        except Exception as e:
+            logger.warning(f"구독 매칭 실패 (기본 채팅만 전송): {e}")
+        
+        sent = False
+        for chat_id in dict.fromkeys(chat_id for chat_id in chat_ids if chat_id):
+            sent = self.telegram.send_message_async(message, chat_id=chat_id) is not None or sent
+        
+        for target in self.push_targets:
+            try:
+                sent = bool(target(article)) or sent
+            except Exception as e:
+                logger.warning(f"추가 전송 대상 오류: {e}")
+        return sent
+    
+    def _back_off(self, message, error):
+        """오류 기록 후 폴링 간격 늘리기 (오류가 이어지면 피드 서버/DB 부담을 줄임)"""
+        self.stats['errors'] += 1
+        self.interval = min(self.config.POLL_MAX_INTERVAL, self.interval * 2)
+        logger.warning(f"⚠️ {message} (다음 시도 {self.interval:.0f}초 후): {error}")
+    
+    def run(self):
+        """폴링 루프 (stop() 호출 시 즉시 반환)
+        
+        한 번의 폴링에서 난 오류(URL 해석, 크롤링, 전송, DB 잠금 등)는 기록만 하고 루프를 이어간다.
+        """
+        logger.info(f"⚡ 실시간 폴링 시작 (간격 {self.config.POLL_MIN_INTERVAL}~{self.config.POLL_MAX_INTERVAL}초)")
+        while not self._stop.is_set():
+            try:
+                if self.leader is None or self.leader.is_leader:
+                    self.poll_once()
+                if time.time() - self._last_prune > 86400:
+                    self._last_prune = time.time()
+                    self.seen_store.prune()
+            except Exception as e:
+                self._back_off("폴링 처리 오류", e)
+            self._stop.wait(self.interval)
+    
+    def start(self):
+        """별도 데몬 스레드에서 폴링 시작"""
+        self._thread = threading.Thread(target=self.run, name="news-poller", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+    
+    def get_status(self):
+        return {
+            'running': bool(self._thread and self._thread.is_alive()),
+            'interval': round(self.interval),
+            'articles_per_hour': round(self.velocity * 60, 2) if self.velocity is not None else None,
+            **self.stats
+        }
+
+def main():
+    """폴링 모드 단독 실행"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    poller = NewsPoller()
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "once":
+        print(f"⚡ 새 기사 {poller.poll_once()}개 전송 ({datetime.now().strftime('%H:%M:%S')})")
+        poller.telegram.flush(Config.TELEGRAM_FLUSH_TIMEOUT)
+        return
+    
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        print("\n⏹️ 폴링 종료")
+
+if __name__ == "__main__":
+    main()
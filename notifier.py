@@ -0,0 +1,130 @@
+# notifier.py - 프로세스 내 알림 (중복 오류 억제 + 오류 폭주 시 요약 전송)
+import re
+import html
+import time
+import atexit
+import hashlib
+import threading
+import logging
+from datetime import datetime
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class Notifier:
+    """Telegram 전송 큐를 직접 사용하는 알림 클래스 (새 인터프리터를 띄우지 않음)
+    
+    - 같은 오류(숫자만 다른 경우 포함)는 NOTIFY_DEDUPE_WINDOW 동안 처음 한 번만 보내고,
+      창이 끝날 때 반복 횟수를 한 번에 알린다.
+    - 창마다 서로 다른 오류는 NOTIFY_MAX_ERRORS_PER_WINDOW개까지만 바로 보내고,
+      나머지는 창이 끝날 때 요약 메시지 하나로 묶는다.
+    """
+    
+    def __init__(self, sender=None):
+        self.config = Config
+        self._sender = sender
+        self._lock = threading.Lock()
+        self._errors = {}  # key -> {'source', 'message', 'count', 'sent'}
+        self._window_started = None
+        self._window_timer = None
+    
+    @property
+    def sender(self):
+        if self._sender is None:
+            from telegram_sender import TelegramSender
+            self._sender = TelegramSender()
+        return self._sender
+    
+    def notify(self, message):
+        """일반 알림 (큐에 넣고 바로 반환)"""
+        try:
+            return self.sender.send_notification(message, wait=False)
+        except Exception as e:
+            logger.error(f"알림 전송 실패: {e}")
+            return False
+    
+    def notify_error(self, source, error_message):
+        """오류 알림 (중복/폭주 억제). 바로 전송했으면 True"""
+        error_message = (error_message or "Unknown error").strip()
+        key = self._error_key(source, error_message)
+        
+        with self._lock:
+            if self._window_started is None:
+                self._start_window()
+            
+            entry = self._errors.get(key)
+            if entry is not None:
+                entry['count'] += 1
+                logger.info(f"🔕 중복 오류 알림 억제 ({entry['count']}회째): {source}")
+                return False
+            
+            entry = self._errors[key] = {'source': source, 'message': error_message, 'count': 1, 'sent': False}
+            sent_count = sum(1 for e in self._errors.values() if e['sent'])
+            if sent_count >= self.config.NOTIFY_MAX_ERRORS_PER_WINDOW:
+                logger.info(f"🔕 오류 알림 한도 초과 - 요약으로 전송 예정: {source}")
+                return False
+            entry['sent'] = True
+        
+        return self._send_error(source, error_message)
+    
+    def flush(self):
+        """억제된 오류 요약을 즉시 전송하고 창 초기화"""
+        with self._lock:
+            if self._window_timer:
+                self._window_timer.cancel()
+            errors = list(self._errors.values())
+            self._errors = {}
+            self._window_started = None
+            self._window_timer = None
+        
+        repeated = [e for e in errors if e['sent'] and e['count'] > 1]
+        unsent = [e for e in errors if not e['sent']]
+        if not repeated and not unsent:
+            return
+        
+        window = self.config.NOTIFY_DEDUPE_WINDOW
+        period = f"{window // 60}분" if window >= 60 else f"{window}초"
+        lines = [f"📦 <b>오류 알림 요약</b> (최근 {period})"]
+        for entry in repeated:
+            lines.append(f"• {html.escape(entry['source'])}: 같은 오류 {entry['count'] - 1}회 더 발생")
+        for entry in unsent:
+            repeat = f" ({entry['count']}회)" if entry['count'] > 1 else ""
+            lines.append(f"• {html.escape(entry['source'])}{repeat}: {html.escape(entry['message'][:100])}")
+        self.notify('\n'.join(lines))
+    
+    def _start_window(self):
+        self._window_started = time.time()
+        self._window_timer = threading.Timer(self.config.NOTIFY_DEDUPE_WINDOW, self.flush)
+        self._window_timer.daemon = True
+        self._window_timer.start()
+    
+    def _send_error(self, source, error_message):
+        try:
+            message = f"{source}\n\n{error_message[:500]}\n\n시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            return self.sender.send_error_notification(html.escape(message), wait=False)
+        except Exception as e:
+            logger.error(f"에러 알림 전송 실패: {e}")
+            return False
+    
+    def _error_key(self, source, error_message):
+        """숫자(시간, 포트, 횟수 등)만 다른 오류는 같은 오류로 취급"""
+        normalized = re.sub(r'\d+', '#', error_message.splitlines()[0] if error_message else '')[:200]
+        return hashlib.sha1(f"{source}\n{normalized}".encode('utf-8')).hexdigest()
+
+_shared_notifier = None
+_shared_lock = threading.Lock()
+
+def get_notifier():
+    """프로세스 전역 Notifier 반환 (종료 시 남은 요약 전송)"""
+    global _shared_notifier
+    with _shared_lock:
+        if _shared_notifier is None:
+            _shared_notifier = Notifier()
+            atexit.register(_flush_at_exit, _shared_notifier)
+        return _shared_notifier
+
+def _flush_at_exit(notifier):
+    """억제된 오류 요약을 큐에 넣고 전송이 끝날 때까지 대기"""
+    notifier.flush()
+    if notifier._sender is not None:
+        notifier._sender.flush(Config.TELEGRAM_FLUSH_TIMEOUT)
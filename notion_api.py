@@ -0,0 +1,126 @@
+# notion_api.py - Notion API 요청 스케줄러 (공유 속도 제한 + 429/Retry-After + 재시도)
+import time
+import random
+import threading
+import logging
+import requests
+from config import Config
+from http_client import get_http_client
+from rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+NOTION_API_BASE = "https://api.notion.com/v1"
+NOTION_VERSION = '2022-06-28'
+
+class NotionRequestScheduler:
+    """모든 Notion API 요청이 거쳐가는 스케줄러
+    
+    - 공유 토큰 버킷으로 요청을 줄 세워 평균 NOTION_RATE_LIMIT 요청/초 유지
+    - 429 응답은 Retry-After 만큼 버킷 전체를 멈춘 뒤 재시도 (서버가 처리하지 않은 요청)
+    - 5xx/타임아웃은 멱등 요청(GET 등)만 지수 백오프로 재시도
+    """
+    
+    IDEMPOTENT_METHODS = ('GET', 'HEAD', 'DELETE')
+    RETRY_STATUS = (500, 502, 503, 504)
+    
+    def __init__(self, api_key=None, session=None, limiter=None):
+        self.config = Config
+        self.api_key = api_key or self.config.NOTION_API_KEY
+        self.headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json',
+            'Notion-Version': NOTION_VERSION
+        }
+        self.session = session or get_http_client().create_session(self.headers)
+        self.limiter = limiter or TokenBucket(self.config.NOTION_RATE_LIMIT)
+        self.max_retries = self.config.NOTION_MAX_RETRIES
+        
+        self.stats = {
+            'requests': 0,
+            'rate_limited': 0,
+            'retries': 0
+        }
+        self._stats_lock = threading.Lock()
+    
+    def request(self, method, path, idempotent=None, timeout=30, **kwargs):
+        """Notion API 요청 (path는 '/pages' 같은 상대 경로 또는 전체 URL)"""
+        method = method.upper()
+        url = path if path.startswith('http') else f"{NOTION_API_BASE}{path}"
+        if idempotent is None:
+            idempotent = method in self.IDEMPOTENT_METHODS
+        
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            self._count('requests')
+            
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                delay = self._backoff(attempt)
+                logger.warning(f"Notion {method} 연결 오류, {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries}): {e}")
+                self._count('retries')
+                time.sleep(delay)
+                continue
+            
+            if response.status_code == 429 and attempt < self.max_retries:
+                attempt += 1
+                delay = self._retry_after(response, attempt)
+                logger.warning(f"Notion 요청 한도 초과(429), {delay:.1f}초 대기 후 재시도 ({attempt}/{self.max_retries})")
+                self._count('rate_limited')
+                # 다른 스레드의 요청도 함께 멈춤
+                self.limiter.pause(delay)
+                continue
+            
+            if response.status_code in self.RETRY_STATUS and idempotent and attempt < self.max_retries:
+                attempt += 1
+                delay = self._retry_after(response, attempt)
+                logger.warning(f"Notion 서버 오류({response.status_code}), {delay:.1f}초 후 재시도 ({attempt}/{self.max_retries})")
+                self._count('retries')
+                time.sleep(delay)
+                continue
+            
+            return response
+    
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+    
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+    
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+    
+    def _retry_after(self, response, attempt):
+        """Retry-After 헤더 우선, 없으면 지수 백오프"""
+        retry_after = response.headers.get('Retry-After', '')
+        try:
+            return max(float(retry_after), 0.5)
+        except ValueError:
+            return self._backoff(attempt)
+    
+    def _backoff(self, attempt):
+        return min(30.0, (2 ** (attempt - 1)) + random.uniform(0, 0.5))
+    
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def get_statistics(self):
+        with self._stats_lock:
+            return self.stats.copy()
+
+_shared_scheduler = None
+_shared_lock = threading.Lock()
+
+def get_notion_scheduler():
+    """프로세스 전역 Notion 요청 스케줄러 반환"""
+    global _shared_scheduler
+    with _shared_lock:
+        if _shared_scheduler is None:
+            _shared_scheduler = NotionRequestScheduler()
+        return _shared_scheduler
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# notion_mirror.py - Notion 데이터베이스 로컬 미러 (SQLite, last_edited_time 기반 증분 동기화)
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from config import Config
+from notion_api import get_notion_scheduler
+
+logger = logging.getLogger(__name__)
+
+class NotionMirror:
+    """Notion 데이터베이스 페이지를 로컬 SQLite에 복제하는 클래스
+    
+    URL/날짜/키워드에 색인을 두어 중복 확인과 리포트 조회를 API 호출 없이 처리한다.
+    동기화는 마지막으로 본 last_edited_time 이후에 수정된 페이지만 가져온다.
+    """
+    
+    def __init__(self, path=None, api=None):
+        self.config = Config
+        self.path = path or self.config.NOTION_MIRROR_DB_FILE
+        self.api = api or get_notion_scheduler()
+        self._sync_lock = threading.Lock()
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 단위 연결 (정상 종료 시 commit, 항상 close)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    id TEXT PRIMARY KEY,
+                    database_id TEXT NOT NULL,
+                    title TEXT,
+                    url TEXT,
+                    date TEXT,
+                    last_edited_time TEXT,
+                    page_url TEXT,
+                    properties TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_pages_url ON pages (database_id, url);
+                CREATE INDEX IF NOT EXISTS idx_pages_date ON pages (database_id, date);
+                
+                CREATE TABLE IF NOT EXISTS page_keywords (
+                    page_id TEXT NOT NULL,
+                    keyword TEXT NOT NULL,
+                    PRIMARY KEY (page_id, keyword)
+                );
+                CREATE INDEX IF NOT EXISTS idx_page_keywords_keyword ON page_keywords (keyword);
+                
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    database_id TEXT PRIMARY KEY,
+                    last_edited_time TEXT,
+                    synced_at REAL
+                );
+                
+                CREATE TABLE IF NOT EXISTS daily_pages (
+                    database_id TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    page_id TEXT NOT NULL,
+                    page_url TEXT,
+                    PRIMARY KEY (database_id, date)
+                );
+                
+                CREATE TABLE IF NOT EXISTS daily_page_articles (
+                    page_id TEXT NOT NULL,
+                    article_key TEXT NOT NULL,
+                    PRIMARY KEY (page_id, article_key)
+                );
+            """)
+    
+    def sync(self, database_id, full=False):
+        """변경된 페이지만 가져와 미러 갱신. 갱신된 페이지 수 반환
+        
+        중간에 요청이 실패하면 RuntimeError - 받은 페이지는 반영하되 동기화 시각(sync_state)과
+        전체 동기화의 삭제 정리는 모든 페이지를 받았을 때만 기록한다.
+        """
+        with self._sync_lock:
+            since = None if full else self._last_edited_time(database_id)
+            
+            query = {
+                "page_size": 100,
+                "sorts": [{"timestamp": "last_edited_time", "direction": "ascending"}]
+            }
+            if since:
+                query["filter"] = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": since}
+                }
+            
+            updated = 0
+            latest = since
+            seen_ids = set()
+            
+            while True:
+                response = self.api.post(f"/databases/{database_id}/query", json=query, idempotent=True)
+                if response.status_code != 200:
+                    # 불완전한 미러를 최신으로 기록하지 않도록 여기서 중단
+                    raise RuntimeError(f"Notion 미러 동기화 실패 ({updated}개 반영 후 중단): {response.status_code} {response.text[:200]}")
+                
+                result = response.json()
+                pages = result.get('results', [])
+                with self._connect() as conn:
+                    for page in pages:
+                        self._upsert(conn, database_id, page)
+                        seen_ids.add(page['id'])
+                        if not latest or page.get('last_edited_time', '') > latest:
+                            latest = page['last_edited_time']
+                updated += len(pages)
+                
+                if not result.get('has_more'):
+                    break
+                query["start_cursor"] = result.get('next_cursor')
+            
+            with self._connect() as conn:
+                if full and seen_ids:
+                    # 전체 동기화에서 보이지 않은 페이지는 삭제/보관된 것으로 간주
+                    placeholders = ','.join('?' * len(seen_ids))
+                    conn.execute(
+                        f"DELETE FROM page_keywords WHERE page_id IN "
+                        f"(SELECT id FROM pages WHERE database_id = ? AND id NOT IN ({placeholders}))",
+                        (database_id, *seen_ids)
+                    )
+                    conn.execute(
+                        f"DELETE FROM pages WHERE database_id = ? AND id NOT IN ({placeholders})",
+                        (database_id, *seen_ids)
+                    )
+                conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (database_id, last_edited_time, synced_at) VALUES (?, ?, ?)",
+                    (database_id, latest, time.time())
+                )
+            
+            if updated:
+                logger.info(f"🔄 Notion 미러 동기화: {updated}개 페이지 갱신")
+            return updated
+    
+    def sync_if_stale(self, database_id):
+        """마지막 동기화 후 NOTION_MIRROR_SYNC_INTERVAL이 지났을 때만 동기화"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT synced_at FROM sync_state WHERE database_id = ?", (database_id,)).fetchone()
+        if row and row['synced_at'] and time.time() - row['synced_at'] < self.config.NOTION_MIRROR_SYNC_INTERVAL:
+            return 0
+        return self.sync(database_id)
+    
+    def record_page(self, database_id, page):
+        """새로 생성한 페이지를 바로 미러에 반영 (다음 동기화 전 중복 방지)"""
+        with self._connect() as conn:
+            self._upsert(conn, database_id, page)
+    
+    def _last_edited_time(self, database_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT last_edited_time FROM sync_state WHERE database_id = ?", (database_id,)).fetchone()
+        return row['last_edited_time'] if row else None
+    
+    def _upsert(self, conn, database_id, page):
+        """페이지 JSON을 행으로 저장"""
+        if page.get('archived') or page.get('in_trash'):
+            conn.execute("DELETE FROM page_keywords WHERE page_id = ?", (page['id'],))
+            conn.execute("DELETE FROM pages WHERE id = ?", (page['id'],))
+            return
+        
+        fields = self._extract_fields(page.get('properties', {}))
+        conn.execute(
+            "INSERT OR REPLACE INTO pages (id, database_id, title, url, date, last_edited_time, page_url, properties) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                page['id'], database_id, fields['title'], fields['url'], fields['date'],
+                page.get('last_edited_time'), page.get('url'),
+                json.dumps(page.get('properties', {}), ensure_ascii=False)
+            )
+        )
+        conn.execute("DELETE FROM page_keywords WHERE page_id = ?", (page['id'],))
+        conn.executemany(
+            "INSERT OR IGNORE INTO page_keywords (page_id, keyword) VALUES (?, ?)",
+            [(page['id'], keyword) for keyword in fields['keywords']]
+        )
+    
+    def _extract_fields(self, properties):
+        """Notion 속성에서 제목/URL/날짜/키워드 추출"""
+        names = self.config.NOTION_ROW_PROPERTIES
+        fields = {'title': None, 'url': None, 'date': None, 'keywords': []}
+        
+        for name, prop in properties.items():
+            prop_type = prop.get('type')
+            
+            if prop_type == 'title':
+                fields['title'] = ''.join(part.get('plain_text', '') for part in prop.get('title', []))
+            elif prop_type == 'url' and (name == names.get('url') or fields['url'] is None):
+                fields['url'] = prop.get('url')
+            elif prop_type == 'date' and prop.get('date') and (name == names.get('published') or fields['date'] is None):
+                fields['date'] = prop['date'].get('start')
+            elif name == names.get('keywords'):
+                if prop_type == 'multi_select':
+                    fields['keywords'] = [option.get('name') for option in prop.get('multi_select', [])]
+                elif prop_type == 'rich_text':
+                    text = ''.join(part.get('plain_text', '') for part in prop.get('rich_text', []))
+                    fields['keywords'] = [kw.strip() for kw in text.split(',') if kw.strip()]
+        
+        return fields
+    
+    def contains_url(self, database_id, url):
+        """해당 URL의 페이지가 이미 있는지 확인"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM pages WHERE database_id = ? AND url = ? LIMIT 1", (database_id, url)
+            ).fetchone()
+        return row is not None
+    
+    def existing_urls(self, database_id, urls):
+        """주어진 URL 중 이미 저장된 URL 집합 반환"""
+        urls = list(urls)
+        if not urls:
+            return set()
+        placeholders = ','.join('?' * len(urls))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT url FROM pages WHERE database_id = ? AND url IN ({placeholders})",
+                (database_id, *urls)
+            ).fetchall()
+        return {row['url'] for row in rows}
+    
+    def pages_by_date(self, database_id, start_date, end_date=None):
+        """날짜 범위의 페이지 목록"""
+        end_date = end_date or start_date
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, title, url, date, page_url FROM pages WHERE database_id = ? "
+                "AND substr(date, 1, 10) BETWEEN ? AND ? ORDER BY date DESC",
+                (database_id, start_date, end_date)
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def keyword_counts(self, database_id, since_date=None, limit=20):
+        """키워드별 기사 수 (since_date 이후)"""
+        query = (
+            "SELECT k.keyword, COUNT(*) AS count FROM page_keywords k JOIN pages p ON p.id = k.page_id "
+            "WHERE p.database_id = ?"
+        )
+        params = [database_id]
+        if since_date:
+            query += " AND p.date >= ?"
+            params.append(since_date)
+        query += " GROUP BY k.keyword ORDER BY count DESC LIMIT ?"
+        params.append(limit)
+        
+        with self._connect() as conn:
+            return [(row['keyword'], row['count']) for row in conn.execute(query, params).fetchall()]
+    
+    def get_daily_page(self, database_id, date):
+        """날짜별 리포트 페이지 (page_id, page_url) 반환, 없으면 None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT page_id, page_url FROM daily_pages WHERE database_id = ? AND date = ?", (database_id, date)
+            ).fetchone()
+        return (row['page_id'], row['page_url']) if row else None
+    
+    def set_daily_page(self, database_id, date, page_id, page_url):
+        """날짜별 리포트 페이지 기록"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO daily_pages (database_id, date, page_id, page_url) VALUES (?, ?, ?, ?)",
+                (database_id, date, page_id, page_url)
+            )
+    
+    def forget_daily_page(self, database_id, date):
+        """삭제/보관된 날짜별 페이지 기록 제거"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT page_id FROM daily_pages WHERE database_id = ? AND date = ?", (database_id, date)
+            ).fetchone()
+            if row:
+                conn.execute("DELETE FROM daily_page_articles WHERE page_id = ?", (row['page_id'],))
+                conn.execute("DELETE FROM daily_pages WHERE database_id = ? AND date = ?", (database_id, date))
+    
+    def daily_page_articles(self, page_id):
+        """날짜별 페이지에 이미 추가된 기사 key 집합"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT article_key FROM daily_page_articles WHERE page_id = ?", (page_id,)
+            ).fetchall()
+        return {row['article_key'] for row in rows}
+    
+    def add_daily_page_articles(self, page_id, article_keys):
+        """날짜별 페이지에 추가한 기사 key 기록"""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO daily_page_articles (page_id, article_key) VALUES (?, ?)",
+                [(page_id, key) for key in article_keys]
+            )
+    
+    def get_summary(self, database_id):
+        """미러 현황 (페이지 수, 마지막 동기화)"""
+        with self._connect() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM pages WHERE database_id = ?", (database_id,)).fetchone()[0]
+            state = conn.execute("SELECT * FROM sync_state WHERE database_id = ?", (database_id,)).fetchone()
+        return {
+            'pages': count,
+            'last_edited_time': state['last_edited_time'] if state else None,
+            'synced_at': state['synced_at'] if state else None
+        }
+
+_shared_mirror = None
+_shared_lock = threading.Lock()
+
+def get_notion_mirror():
+    """프로세스 전역 NotionMirror 반환"""
+    global _shared_mirror
+    with _shared_lock:
+        if _shared_mirror is None:
+            _shared_mirror = NotionMirror()
+        return _shared_mirror
+
+def main():
+    """미러 관리 명령"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    database_id = Config.NOTION_ARTICLES_DATABASE_ID
+    mirror = get_notion_mirror()
+    
+    if command in ('sync', 'full-sync'):
+        try:
+            updated = mirror.sync(database_id, full=(command == 'full-sync'))
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ 동기화 완료: {updated}개 페이지 갱신")
+    elif command == 'status':
+        summary = mirror.get_summary(database_id)
+        print("🗄️ Notion 로컬 미러 상태:")
+        print(f"  • 페이지 수: {summary['pages']}개")
+        print(f"  • 마지막 수정 시각: {summary['last_edited_time'] or '없음'}")
+        if summary['synced_at']:
+            print(f"  • 마지막 동기화: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(summary['synced_at']))}")
+        keywords = mirror.keyword_counts(database_id, limit=10)
+        if keywords:
+            print(f"  • 상위 키워드: {', '.join(f'{kw}({count})' for kw, count in keywords)}")
+    else:
+        print("사용법:")
+        print("  python3 notion_mirror.py status     # 미러 상태")
+        print("  python3 notion_mirror.py sync       # 증분 동기화")
+        print("  python3 notion_mirror.py full-sync  # 전체 재동기화")
+
+if __name__ == "__main__":
+    main()
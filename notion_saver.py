@@ -4,26 +4,47 @@
 간단한 Notion 저장 모듈
 """
 
-import requests
 import os
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import logging
+from config import Config
+from notion_api import get_notion_scheduler
+from notion_schema_cache import get_schema_cache
+from notion_mirror import get_notion_mirror
+from tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
 class SimpleNotion:
     """간단한 Notion 페이지 생성 클래스"""
     
+    # Notion API 요청 하나에 담을 수 있는 최대 블록 수
+    MAX_BLOCKS_PER_REQUEST = 100
+    
     def __init__(self):
         self.api_key = os.getenv('NOTION_API_KEY')
         self.database_id = os.getenv('NOTION_DATABASE_ID')
         self.page_id = os.getenv('NOTION_PAGE_ID')
         
-        self.headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json',
-            'Notion-Version': '2022-06-28'
-        }
+        # 모든 Notion 요청은 공유 스케줄러 경유 (연결 풀 + 요청 한도 + 429 재시도)
+        self.api = get_notion_scheduler()
+        
+        # 데이터베이스 스키마 캐시 (실행 간 공유, NotionSchemaChecker와 공용)
+        self.schema_cache = get_schema_cache(self.database_id, api=self.api)
+        
+        # 기사별 행 저장용 (rows 모드)
+        self.articles_database_id = Config.NOTION_ARTICLES_DATABASE_ID
+        self._mirror = None
+    
+    def save(self, summary_data, html_content=None, mode=None):
+        """설정된 저장 모드(NOTION_SAVE_MODE)에 따라 저장하고 Notion URL 반환"""
+        mode = mode or Config.NOTION_SAVE_MODE
+        if mode == 'rows':
+            return self.save_article_rows(summary_data)
+        if mode == 'daily':
+            return self.save_to_daily_page(summary_data)
+        return self.save_to_notion(summary_data, html_content)
     
     def save_to_notion(self, summary_data, html_content=None):
         """Notion에 데이터 저장"""
@@ -39,300 +60,614 @@ class SimpleNotion:
             # 페이지 제목
             title = f"🤖 Google News AI 리포트 - {today} {current_time}"
             
-            # 최소한의 속성으로 페이지 생성
-            page_data = {
-                "parent": {"database_id": self.database_id},
-                "properties": {
-                    "title": {  # Notion 데이터베이스의 실제 제목 속성명
-                        "title": [
-                            {
-                                "type": "text",
-                                "text": {"content": title}
-                            }
-                        ]
-                    }
-                }
-            }
-            
-            # 추가 속성들 (있으면 추가, 없으면 무시)
-            try:
-                # 날짜 속성
-                if "Date" in self._get_database_properties():
-                    page_data["properties"]["Date"] = {
-                        "date": {"start": today}
-                    }
-                
-                # 기사 수
-                if "Articles" in self._get_database_properties():
-                    page_data["properties"]["Articles"] = {
-                        "number": summary_data.get('total_articles', 0)
-                    }
-                
-                # 카테고리
-                if "Category" in self._get_database_properties():
-                    page_data["properties"]["Category"] = {
-                        "select": {"name": "AI 뉴스"}
-                    }
+            page_result = self._create_report_page(title, today, summary_data, self._build_page_blocks(summary_data))
+            return page_result.get('url', '') if page_result else None
                 
-            except Exception as e:
-                logger.warning(f"추가 속성 설정 중 오류 (무시됨): {e}")
+        except Exception as e:
+            logger.error(f"Notion 저장 중 오류: {e}")
+            return None
+    
+    def _create_report_page(self, title, today, summary_data, blocks):
+        """리포트 페이지 생성 (앞의 100개 블록은 생성 요청에 함께 전송). 생성된 페이지 JSON 반환"""
+        inline_blocks = blocks[:self.MAX_BLOCKS_PER_REQUEST]
+        remaining_blocks = blocks[self.MAX_BLOCKS_PER_REQUEST:]
+        
+        # Notion API로 페이지 생성
+        page_data = {
+            "parent": {"database_id": self.database_id},
+            "properties": self._build_page_properties(title, today, summary_data),
+            "children": inline_blocks
+        }
+        response = self.api.post("/pages", json=page_data)
+        
+        # 스키마 변경으로 검증 실패 시 캐시를 갱신하고 한 번 더 시도
+        if self._is_validation_error(response):
+            logger.warning("Notion 속성 검증 실패 - 스키마 캐시 갱신 후 재시도")
+            self.schema_cache.invalidate()
+            page_data["properties"] = self._build_page_properties(title, today, summary_data)
+            response = self.api.post("/pages", json=page_data)
+        
+        if response.status_code != 200:
+            logger.error(f"Notion 페이지 생성 실패: {response.status_code}")
+            logger.error(f"응답: {response.text}")
+            return None
+        
+        page_result = response.json()
+        page_url = page_result.get('url', '')
+        logger.info(f"Notion 페이지 생성 성공 (블록 {len(inline_blocks)}개 포함): {page_url}")
+        
+        # 100개를 넘는 나머지 블록 추가
+        if remaining_blocks:
+            if not self._add_blocks_to_page(page_result['id'], remaining_blocks):
+                logger.error(f"Notion 페이지 내용 추가 실패 - 불완전한 페이지 보관 처리: {page_url}")
+                self._archive_page(page_result['id'])
+                return None
+        
+        return page_result
+    
+    def save_to_daily_page(self, summary_data):
+        """오늘 날짜의 리포트 페이지 하나에 새 기사만 이어 붙이기 (daily 모드)
+        
+        오늘 페이지 ID와 이미 추가한 기사는 로컬 미러(NotionMirror)에 기록해 두고,
+        재실행 시에는 페이지에 없는 기사 블록만 추가한다.
+        """
+        if not self.api_key or not self.database_id:
+            logger.error("Notion API 설정이 없습니다")
+            return None
+        
+        try:
+            today = datetime.now().strftime('%Y-%m-%d')
+            current_time = datetime.now().strftime('%H:%M')
+            title = f"🤖 Google News AI 리포트 - {today}"
+            articles = summary_data.get('articles', [])
+            keywords_found = summary_data.get('keywords_found', [])
             
-            # Notion API로 페이지 생성
-            url = "https://api.notion.com/v1/pages"
-            response = requests.post(url, headers=self.headers, json=page_data, timeout=30)
+            daily_page = self._find_daily_page(title, today)
             
-            if response.status_code == 200:
-                page_result = response.json()
-                page_url = page_result.get('url', '')
+            if daily_page is None:
+                # 오늘 첫 실행 - 헤더와 기사로 페이지 생성
+                blocks = [self._heading_block('heading_1', "📰 오늘의 AI 뉴스")]
+                blocks.append(self._heading_block('heading_3', f"⏰ {current_time} 수집 ({len(articles)}개)"))
+                for i, article in enumerate(articles, 1):
+                    blocks.extend(self._build_article_blocks(i, article, keywords_found, divider=True))
                 
-                # 페이지 내용 추가
-                if page_result.get('id'):
-                    self._add_page_content(page_result['id'], summary_data)
+                page_result = self._create_report_page(title, today, summary_data, blocks)
+                if not page_result:
+                    return None
                 
-                logger.info(f"Notion 페이지 생성 성공: {page_url}")
+                page_url = page_result.get('url', '')
+                self.mirror.set_daily_page(self.database_id, today, page_result['id'], page_url)
+                self.mirror.add_daily_page_articles(page_result['id'], [self._article_key(a) for a in articles])
+                print(f"🗒️ 오늘의 Notion 페이지 생성: 기사 {len(articles)}개")
                 return page_url
-            else:
-                logger.error(f"Notion 페이지 생성 실패: {response.status_code}")
-                logger.error(f"응답: {response.text}")
-                return None
+            
+            page_id, page_url = daily_page
+            known = self.mirror.daily_page_articles(page_id)
+            new_articles = [a for a in articles if self._article_key(a) not in known]
+            
+            if not new_articles:
+                print("🗒️ 오늘의 Notion 페이지에 추가할 새 기사가 없습니다")
+                return page_url
+            
+            # 기사 단위로 묶어 추가하고 묶음이 성공할 때마다 바로 기록 (중간 실패 후 재실행 시 중복 추가 방지)
+            heading = self._heading_block('heading_3', f"⏰ {current_time} 추가 ({len(new_articles)}개)")
+            added = 0
+            for blocks, chunk_articles in self._article_chunks(new_articles, len(known) + 1, keywords_found, heading):
+                if not self._add_blocks_to_page(page_id, blocks):
+                    if added:
+                        self._update_article_count(page_id, len(known) + added)
+                        logger.warning(f"오늘 Notion 페이지에 새 기사 {len(new_articles)}개 중 {added}개만 추가됨")
+                    # 페이지가 삭제/보관된 경우 기록을 지워 다음 실행에서 새로 생성
+                    if not self._page_exists(page_id):
+                        logger.warning("오늘 Notion 페이지가 삭제되었습니다 - 로컬 기록 제거")
+                        self.mirror.forget_daily_page(self.database_id, today)
+                    return None
                 
+                self.mirror.add_daily_page_articles(page_id, [self._article_key(a) for a in chunk_articles])
+                added += len(chunk_articles)
+            
+            self._update_article_count(page_id, len(known) + len(new_articles))
+            print(f"🗒️ 오늘의 Notion 페이지에 새 기사 {len(new_articles)}개 추가 (기존 {len(known)}개)")
+            return page_url
+            
         except Exception as e:
-            logger.error(f"Notion 저장 중 오류: {e}")
+            logger.error(f"Notion 날짜별 페이지 저장 중 오류: {e}")
             return None
     
-    def _get_database_properties(self):
-        """데이터베이스 속성 확인"""
-        try:
-            url = f"https://api.notion.com/v1/databases/{self.database_id}"
-            response = requests.get(url, headers=self.headers, timeout=10)
+    def _article_chunks(self, articles, start, keywords_found, first_block):
+        """기사 블록을 요청당 블록 한도 안에서 기사 단위로 묶기 - [(블록 목록, 기사 목록), ...]"""
+        chunks = []
+        blocks, chunk_articles = [first_block], []
+        for i, article in enumerate(articles, start):
+            article_blocks = self._build_article_blocks(i, article, keywords_found, divider=True)
+            if chunk_articles and len(blocks) + len(article_blocks) > self.MAX_BLOCKS_PER_REQUEST:
+                chunks.append((blocks, chunk_articles))
+                blocks, chunk_articles = [], []
+            blocks.extend(article_blocks)
+            chunk_articles.append(article)
+        if chunk_articles:
+            chunks.append((blocks, chunk_articles))
+        return chunks
+    
+    def _find_daily_page(self, title, today):
+        """오늘 페이지 (page_id, page_url) 찾기 - 로컬 기록 우선, 없으면 제목으로 조회"""
+        daily_page = self.mirror.get_daily_page(self.database_id, today)
+        if daily_page:
+            return daily_page
+        
+        response = self.api.post(
+            f"/databases/{self.database_id}/query",
+            json={"filter": {"property": "title", "title": {"equals": title}}, "page_size": 1},
+            idempotent=True
+        )
+        if response.status_code != 200:
+            logger.warning(f"오늘 Notion 페이지 조회 실패: {response.status_code}")
+            return None
+        
+        results = response.json().get('results', [])
+        if not results:
+            return None
+        
+        # 다른 곳에서 만든 페이지 - 본문의 북마크로 이미 들어있는 기사 복원
+        page = results[0]
+        self.mirror.set_daily_page(self.database_id, today, page['id'], page.get('url', ''))
+        self.mirror.add_daily_page_articles(page['id'], self._list_bookmark_urls(page['id']))
+        return page['id'], page.get('url', '')
+    
+    def _page_exists(self, page_id):
+        """페이지가 있고 보관되지 않았는지 확인"""
+        response = self.api.get(f"/pages/{page_id}")
+        if response.status_code == 404:
+            return False
+        if response.status_code == 200:
+            page = response.json()
+            return not (page.get('archived') or page.get('in_trash'))
+        return True
+    
+    def _list_bookmark_urls(self, page_id):
+        """페이지 본문의 북마크 URL 목록 (페이지 단위로 조회)"""
+        urls = []
+        cursor = None
+        while True:
+            path = f"/blocks/{page_id}/children?page_size=100"
+            if cursor:
+                path += f"&start_cursor={cursor}"
+            response = self.api.get(path)
+            if response.status_code != 200:
+                logger.warning(f"Notion 페이지 블록 조회 실패: {response.status_code}")
+                break
             
-            if response.status_code == 200:
-                db_info = response.json()
-                return db_info.get('properties', {}).keys()
-            else:
-                return []
-        except:
-            return []
+            result = response.json()
+            for block in result.get('results', []):
+                if block.get('type') == 'bookmark':
+                    urls.append(block['bookmark'].get('url'))
+            
+            if not result.get('has_more'):
+                break
+            cursor = result.get('next_cursor')
+        return urls
+    
+    def _update_article_count(self, page_id, total):
+        """날짜별 페이지의 기사 수 속성 갱신 (속성이 있을 때만)"""
+        if "Articles" not in self._get_database_properties():
+            return
+        response = self.api.patch(
+            f"/pages/{page_id}", json={"properties": {"Articles": {"number": total}}}, idempotent=True
+        )
+        if response.status_code != 200:
+            logger.warning(f"Notion 기사 수 갱신 실패: {response.status_code}")
     
-    def _add_page_content(self, page_id, summary_data):
-        """페이지에 상세 내용 추가 (새로운 형식)"""
+    def _article_key(self, article):
+        """날짜별 페이지에서 기사를 구분하는 key (URL, 없으면 제목)"""
+        return article.get('url') or article.get('title', '')
+    
+    def _build_page_properties(self, title, today, summary_data):
+        """스키마 캐시를 기준으로 페이지 속성 구성 (없는 속성은 제외)"""
+        # 최소한의 속성
+        properties = {
+            "title": {  # Notion 데이터베이스의 실제 제목 속성명
+                "title": [
+                    {
+                        "type": "text",
+                        "text": {"content": title}
+                    }
+                ]
+            }
+        }
+        
+        # 추가 속성들 (있으면 추가, 없으면 무시)
+        database_properties = self._get_database_properties()
+        
+        # 날짜 속성
+        if "Date" in database_properties:
+            properties["Date"] = {
+                "date": {"start": today}
+            }
+        
+        # 기사 수
+        if "Articles" in database_properties:
+            properties["Articles"] = {
+                "number": summary_data.get('total_articles', 0)
+            }
+        
+        # 카테고리
+        if "Category" in database_properties:
+            properties["Category"] = {
+                "select": {"name": "AI 뉴스"}
+            }
+        
+        return properties
+    
+    def _archive_page(self, page_id):
+        """불완전하게 생성된 페이지 보관(archive) 처리"""
+        try:
+            response = self.api.patch(f"/pages/{page_id}", json={"archived": True}, idempotent=True)
+            if response.status_code != 200:
+                logger.warning(f"Notion 페이지 보관 실패: {response.status_code}")
+        except Exception as e:
+            logger.warning(f"Notion 페이지 보관 중 오류: {e}")
+    
+    def _is_validation_error(self, response):
+        """Notion 검증 오류 응답인지 확인"""
+        if response.status_code != 400:
+            return False
+        try:
+            return response.json().get('code') == 'validation_error'
+        except ValueError:
+            return False
+    
+    def save_article_rows(self, summary_data):
+        """기사마다 데이터베이스 행 하나씩 생성 (rows 모드)
+        
+        이미 저장된 URL은 로컬 미러(NotionMirror)로 건너뛰고, 나머지는 요청 한도 내에서
+        동시에 생성한다 (요청 한도는 NotionRequestScheduler가 관리).
+        모두 저장되면 데이터베이스 URL을 반환한다.
+        """
+        if not self.api_key or not self.articles_database_id:
+            logger.error("Notion API 설정이 없습니다")
+            return None
+        
+        articles = summary_data.get('articles', [])
+        keywords_found = summary_data.get('keywords_found', [])
+        mirror = self.mirror
+        
+        # 미러를 증분 동기화한 뒤 로컬에서 중복 확인 (URL 색인)
+        try:
+            mirror.sync_if_stale(self.articles_database_id)
+        except Exception as e:
+            logger.warning(f"Notion 미러 동기화 실패 - 로컬 데이터로 중복 확인: {e}")
+        existing = mirror.existing_urls(self.articles_database_id, [a['url'] for a in articles if a.get('url')])
+        
+        new_articles = [a for a in articles if a.get('url') and a['url'] not in existing]
+        skipped = len(articles) - len(new_articles)
+        print(f"🗂️ Notion 기사 행 저장: 신규 {len(new_articles)}개, 기존 {skipped}개 건너뜀")
+        
+        schema = get_schema_cache(self.articles_database_id, api=self.api)
+        database_properties = schema.get_properties()
+        
+        results = []
+        if new_articles:
+            workers = min(Config.NOTION_ROW_WORKERS, len(new_articles))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    get_tracer().wrap(lambda article: self._create_article_row(article, keywords_found, database_properties)),
+                    new_articles
+                ))
+        
+        failed = results.count(False)
+        logger.info(f"Notion 기사 행 저장 완료 - 생성 {len(results) - failed}개, 건너뜀 {skipped}개, 실패 {failed}개")
+        
+        if failed:
+            logger.error(f"Notion 기사 행 {failed}개 저장 실패 (다음 실행에서 재시도)")
+            return None
+        
+        return f"https://www.notion.so/{self.articles_database_id.replace('-', '')}"
+    
+    @property
+    def mirror(self):
+        """Notion 로컬 미러 (처음 사용할 때 생성)"""
+        if self._mirror is None:
+            self._mirror = get_notion_mirror()
+        return self._mirror
+    
+    def _create_article_row(self, article, keywords_found, database_properties):
+        """기사 하나를 데이터베이스 행으로 생성"""
         try:
-            # 페이지 블록 내용 구성
-            blocks = []
+            page_data = {
+                "parent": {"database_id": self.articles_database_id},
+                "properties": self._build_row_properties(article, keywords_found, database_properties)
+            }
             
-            # 메인 헤더
-            blocks.append({
-                "object": "block",
-                "type": "heading_1",
-                "heading_1": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": f"📰 주요 AI 뉴스 ({summary_data.get('total_articles', 0)}개)"}
-                        }
-                    ]
-                }
-            })
+            response = self.api.post("/pages", json=page_data)
             
-            # 각 기사를 상세하게 추가
-            for i, article in enumerate(summary_data.get('articles', []), 1):
-                # 기사 제목 (헤딩)
-                title = article.get('title', 'No Title')
-                source = article.get('source', 'Unknown')
-                
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_3",
-                    "heading_3": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": f"{i}. \"{title}\" - {source}"}
-                            }
-                        ]
-                    }
-                })
-                
-                # 메타 정보 (출처, 시간, 카테고리)
-                published = article.get('published', 'Unknown')
-                meta_text = f"📍 {source} | ⏰ {published} | 🏷️ AI 뉴스"
-                
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": meta_text}
-                            }
-                        ]
-                    }
-                })
-                
-                # 기사 첫 문장 (굵게)
-                content = article.get('content', '')
-                first_sentence = self._extract_first_sentence(content)
-                
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": "💡 "},
-                                "annotations": {"bold": True}
-                            },
-                            {
-                                "type": "text",
-                                "text": {"content": first_sentence}
-                            }
-                        ]
-                    }
-                })
-                
-                # 기사 URL을 bookmark 블록으로 추가
-                article_url = article.get('url', '')
-                if article_url:
-                    blocks.append({
-                        "object": "block",
-                        "type": "bookmark",
-                        "bookmark": {
-                            "url": article_url
-                        }
-                    })
-                
-                # 키워드 태그
-                keywords = self._extract_keywords_for_article(article, summary_data.get('keywords_found', []))
-                if keywords:
-                    keyword_text = " ".join([f"#{kw}" for kw in keywords])
-                    blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [
-                                {
-                                    "type": "text",
-                                    "text": {"content": f"🏷️ {keyword_text}"},
-                                    "annotations": {"color": "blue"}
-                                }
-                            ]
-                        }
-                    })
-                
-                # 구분선 (마지막 기사가 아닌 경우)
-                if i < len(summary_data.get('articles', [])):
-                    blocks.append({
-                        "object": "block",
-                        "type": "divider",
-                        "divider": {}
-                    })
+            if response.status_code == 200:
+                self.mirror.record_page(self.articles_database_id, response.json())
+                return True
             
-            # 전체 키워드 요약
-            blocks.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": "🏷️ 주요 키워드"}
-                        }
-                    ]
-                }
-            })
+            logger.error(f"Notion 기사 행 생성 실패: {response.status_code} - {article.get('title', '')[:50]}")
+            logger.error(f"응답: {response.text}")
+            return False
             
-            if summary_data.get('keywords_found'):
-                keyword_text = " ".join([f"#{kw}" for kw in summary_data['keywords_found'][:15]])
-                blocks.append({
-                    "object": "block",
-                    "type": "paragraph",
-                    "paragraph": {
-                        "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": keyword_text},
-                                "annotations": {"bold": True, "color": "blue"}
-                            }
-                        ]
+        except Exception as e:
+            logger.error(f"Notion 기사 행 생성 중 오류: {e}")
+            return False
+    
+    def _build_row_properties(self, article, keywords_found, database_properties):
+        """기사 행 속성 구성 (데이터베이스에 있는 속성만 사용)"""
+        names = Config.NOTION_ROW_PROPERTIES
+        
+        # 제목 속성명은 스키마에서 찾기
+        title_property = "title"
+        for name, info in database_properties.items():
+            if info.get('type') == 'title':
+                title_property = name
+                break
+        
+        properties = {
+            title_property: {
+                "title": [{"type": "text", "text": {"content": article.get('title', 'No Title')[:2000]}}]
+            }
+        }
+        
+        def property_type(key):
+            info = database_properties.get(names.get(key))
+            return info.get('type') if info else None
+        
+        if property_type('url') == 'url':
+            properties[names['url']] = {"url": article['url']}
+        
+        source = article.get('source', 'Unknown')
+        if property_type('source') == 'select':
+            properties[names['source']] = {"select": {"name": source[:100].replace(',', ' ')}}
+        elif property_type('source') == 'rich_text':
+            properties[names['source']] = {"rich_text": [{"type": "text", "text": {"content": source}}]}
+        
+        published = article.get('published')
+        if property_type('published') == 'date' and published:
+            properties[names['published']] = {"date": {"start": str(published).replace(' ', 'T')}}
+        
+        keywords = self._extract_keywords_for_article(article, keywords_found)
+        if property_type('keywords') == 'multi_select':
+            properties[names['keywords']] = {
+                "multi_select": [{"name": kw.replace(',', ' ')} for kw in keywords]
+            }
+        elif property_type('keywords') == 'rich_text':
+            properties[names['keywords']] = {
+                "rich_text": [{"type": "text", "text": {"content": ", ".join(keywords)}}]
+            }
+        
+        return properties
+    
+    def _get_database_properties(self):
+        """데이터베이스 속성 확인 (스키마 캐시 사용)"""
+        return self.schema_cache.get_properties().keys()
+    
+    def _build_page_blocks(self, summary_data):
+        """페이지 본문 블록 구성 (새로운 형식)"""
+        # 페이지 블록 내용 구성
+        blocks = []
+        
+        # 메인 헤더
+        blocks.append({
+            "object": "block",
+            "type": "heading_1",
+            "heading_1": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": f"📰 주요 AI 뉴스 ({summary_data.get('total_articles', 0)}개)"}
                     }
-                })
-            
-            # 수집 정보
+                ]
+            }
+        })
+        
+        # 각 기사를 상세하게 추가
+        articles = summary_data.get('articles', [])
+        for i, article in enumerate(articles, 1):
+            # 구분선 (마지막 기사가 아닌 경우)
+            blocks.extend(self._build_article_blocks(
+                i, article, summary_data.get('keywords_found', []), divider=i < len(articles)
+            ))
+        
+        # 전체 키워드 요약
+        blocks.append({
+            "object": "block",
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": "🏷️ 주요 키워드"}
+                    }
+                ]
+            }
+        })
+        
+        if summary_data.get('keywords_found'):
+            keyword_text = " ".join([f"#{kw}" for kw in summary_data['keywords_found'][:15]])
             blocks.append({
                 "object": "block",
-                "type": "heading_2",
-                "heading_2": {
+                "type": "paragraph",
+                "paragraph": {
                     "rich_text": [
                         {
                             "type": "text",
-                            "text": {"content": "📊 수집 정보"}
+                            "text": {"content": keyword_text},
+                            "annotations": {"bold": True, "color": "blue"}
                         }
                     ]
                 }
             })
-            
-            collection_info = f"""• 수집 시간: {summary_data.get('collection_time', 'Unknown')}
+        
+        # 수집 정보
+        blocks.append({
+            "object": "block",
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": "📊 수집 정보"}
+                    }
+                ]
+            }
+        })
+        
+        collection_info = f"""• 수집 시간: {summary_data.get('collection_time', 'Unknown')}
 • 총 기사 수: {summary_data.get('total_articles', 0)}개
 • 언론사 수: {summary_data.get('stats', {}).get('total_sources', 0)}곳
 • 발견된 키워드: {len(summary_data.get('keywords_found', []))}개"""
-            
-            blocks.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": collection_info}
-                        }
-                    ]
-                }
-            })
-            
-            # ⭐ Footer 추가 (시스템 정보)
-            blocks.append({
-                "object": "block",
-                "type": "divider",
-                "divider": {}
-            })
-            
-            blocks.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": "🤖 시스템 정보"},
-                            "annotations": {"bold": True}
-                        }
-                    ]
-                }
-            })
-            
-            # 시스템 정보 내용
-            system_info = """• 개발자: JoonmoYang
+        
+        blocks.append({
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": collection_info}
+                    }
+                ]
+            }
+        })
+        
+        # ⭐ Footer 추가 (시스템 정보)
+        blocks.append({
+            "object": "block",
+            "type": "divider",
+            "divider": {}
+        })
+        
+        blocks.append({
+            "object": "block",
+            "type": "heading_2",
+            "heading_2": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": "🤖 시스템 정보"},
+                        "annotations": {"bold": True}
+                    }
+                ]
+            }
+        })
+        
+        # 시스템 정보 내용
+        system_info = """• 개발자: JoonmoYang
 • 시스템: Google News 자동화 에이전트 v1.4
 • 기술: Python 3.9+ • Notion API • GoogleNewsAPI
 • 처리: GoogleNews → 크롤링 → 노션 저장 → 텔레그램 알림
 • 문의: davidlikescat@icloud.com"""
-            
+        
+        blocks.append({
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": system_info}
+                    }
+                ]
+            }
+        })
+        
+        # 저작권 정보
+        blocks.append({
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": "© 2025 JoonmoYang. Google News AI Automation Tool. All rights reserved."},
+                        "annotations": {"italic": True, "color": "gray"}
+                    }
+                ]
+            }
+        })
+        
+        return blocks
+    
+    def _heading_block(self, heading_type, text):
+        """헤딩 블록 하나 생성"""
+        return {
+            "object": "block",
+            "type": heading_type,
+            heading_type: {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": text}
+                    }
+                ]
+            }
+        }
+    
+    def _build_article_blocks(self, i, article, keywords_found, divider=True):
+        """기사 하나의 블록 (제목, 메타 정보, 첫 문장, 북마크, 키워드, 구분선)"""
+        blocks = []
+        
+        # 기사 제목 (헤딩)
+        title = article.get('title', 'No Title')
+        source = article.get('source', 'Unknown')
+        
+        blocks.append(self._heading_block('heading_3', f"{i}. \"{title}\" - {source}"))
+        
+        # 메타 정보 (출처, 시간, 카테고리)
+        published = article.get('published', 'Unknown')
+        meta_text = f"📍 {source} | ⏰ {published} | 🏷️ AI 뉴스"
+        
+        blocks.append({
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": meta_text}
+                    }
+                ]
+            }
+        })
+        
+        # 기사 첫 문장 (굵게)
+        content = article.get('content', '')
+        first_sentence = self._extract_first_sentence(content)
+        
+        blocks.append({
+            "object": "block",
+            "type": "paragraph",
+            "paragraph": {
+                "rich_text": [
+                    {
+                        "type": "text",
+                        "text": {"content": "💡 "},
+                        "annotations": {"bold": True}
+                    },
+                    {
+                        "type": "text",
+                        "text": {"content": first_sentence}
+                    }
+                ]
+            }
+        })
+        
+        # 기사 URL을 bookmark 블록으로 추가
+        article_url = article.get('url', '')
+        if article_url:
             blocks.append({
                 "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [
-                        {
-                            "type": "text",
-                            "text": {"content": system_info}
-                        }
-                    ]
+                "type": "bookmark",
+                "bookmark": {
+                    "url": article_url
                 }
             })
-            
-            # 저작권 정보
+        
+        # 키워드 태그
+        keywords = self._extract_keywords_for_article(article, keywords_found)
+        if keywords:
+            keyword_text = " ".join([f"#{kw}" for kw in keywords])
             blocks.append({
                 "object": "block",
                 "type": "paragraph",
@@ -340,18 +675,21 @@ class SimpleNotion:
                     "rich_text": [
                         {
                             "type": "text",
-                            "text": {"content": "© 2025 JoonmoYang. Google News AI Automation Tool. All rights reserved."},
-                            "annotations": {"italic": True, "color": "gray"}
+                            "text": {"content": f"🏷️ {keyword_text}"},
+                            "annotations": {"color": "blue"}
                         }
                     ]
                 }
             })
-            
-            # 블록을 페이지에 추가 (최대 100개씩 나누어서)
-            self._add_blocks_to_page(page_id, blocks)
-                
-        except Exception as e:
-            logger.warning(f"Notion 페이지 내용 추가 중 오류: {e}")
+        
+        if divider:
+            blocks.append({
+                "object": "block",
+                "type": "divider",
+                "divider": {}
+            })
+        
+        return blocks
     
     def _extract_first_sentence(self, content):
         """기사 내용에서 첫 번째 문장 추출 (HTML 태그 제거)"""
@@ -405,30 +743,31 @@ class SimpleNotion:
         return found_keywords[:5]  # 최대 5개만 반환
     
     def _add_blocks_to_page(self, page_id, blocks):
-        """블록을 페이지에 추가 (100개씩 나누어서)"""
+        """블록을 페이지에 추가 (100개씩 나누어서, 하나라도 실패하면 False)"""
         try:
             # Notion API는 한 번에 최대 100개 블록만 추가 가능
-            chunk_size = 100
+            chunk_size = self.MAX_BLOCKS_PER_REQUEST
             
             for i in range(0, len(blocks), chunk_size):
                 chunk = blocks[i:i + chunk_size]
                 
-                url = f"https://api.notion.com/v1/blocks/{page_id}/children"
-                response = requests.patch(
-                    url, 
-                    headers=self.headers, 
-                    json={"children": chunk}, 
-                    timeout=30
+                response = self.api.patch(
+                    f"/blocks/{page_id}/children",
+                    json={"children": chunk}
                 )
                 
                 if response.status_code == 200:
                     logger.info(f"Notion 블록 {i+1}-{min(i+chunk_size, len(blocks))} 추가 성공")
                 else:
-                    logger.warning(f"Notion 블록 추가 실패: {response.status_code}")
-                    logger.warning(f"응답: {response.text}")
+                    logger.error(f"Notion 블록 추가 실패: {response.status_code}")
+                    logger.error(f"응답: {response.text}")
+                    return False
+            
+            return True
                     
         except Exception as e:
-            logger.warning(f"Notion 블록 추가 중 오류: {e}")
+            logger.error(f"Notion 블록 추가 중 오류: {e}")
+            return False
 
 # 기존 NotionSaver와 호환성을 위한 별칭
 NotionSaver = SimpleNotion
@@ -0,0 +1,135 @@
+# notion_schema_cache.py - Notion 데이터베이스 스키마 캐시 (TTL + 디스크 저장)
+import os
+import json
+import time
+import threading
+import logging
+from config import Config
+from notion_api import get_notion_scheduler
+
+logger = logging.getLogger(__name__)
+
+class NotionSchemaCache:
+    """Notion 데이터베이스 스키마를 실행 간에 캐시하는 클래스
+    
+    메모리 → 디스크 → API 순서로 조회하며, TTL이 지났거나 페이지 생성이
+    검증 오류로 실패하면 invalidate()로 다시 가져온다.
+    """
+    
+    def __init__(self, database_id, api=None, cache_file=None, ttl=None):
+        self.config = Config
+        self.database_id = database_id
+        self.cache_file = cache_file or self.config.NOTION_SCHEMA_CACHE_FILE
+        self.ttl = self.config.NOTION_SCHEMA_TTL if ttl is None else ttl
+        self.api = api or get_notion_scheduler()
+        
+        self._database = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+    
+    def get_database(self, force_refresh=False):
+        """데이터베이스 정보 반환 (실패 시 오래된 캐시라도 반환)"""
+        with self._lock:
+            if not force_refresh:
+                if self._database is None:
+                    self._load_from_disk()
+                if self._database is not None and self._is_fresh():
+                    return self._database
+            
+            database = self._fetch_remote()
+            if database is not None:
+                self._database = database
+                self._fetched_at = time.time()
+                self._save_to_disk()
+            elif self._database is not None:
+                logger.warning("Notion 스키마 조회 실패 - 이전 캐시 사용")
+            
+            return self._database
+    
+    def get_cached_database(self):
+        """네트워크 요청 없이 캐시된 데이터베이스 정보 반환 (TTL 무시)"""
+        with self._lock:
+            if self._database is None:
+                self._load_from_disk()
+            return self._database
+    
+    def get_properties(self, force_refresh=False):
+        """데이터베이스 속성 딕셔너리 반환 (없으면 빈 딕셔너리)"""
+        database = self.get_database(force_refresh=force_refresh)
+        if not database:
+            return {}
+        return database.get('properties', {})
+    
+    def invalidate(self):
+        """캐시 무효화 (메모리 + 디스크)"""
+        with self._lock:
+            self._database = None
+            self._fetched_at = 0.0
+            cache = self._read_cache_file()
+            if cache.pop(self.database_id, None) is not None:
+                self._write_cache_file(cache)
+        logger.info("Notion 스키마 캐시 무효화")
+    
+    def _is_fresh(self):
+        return time.time() - self._fetched_at < self.ttl
+    
+    def _fetch_remote(self):
+        """Notion API에서 데이터베이스 정보 조회"""
+        try:
+            response = self.api.get(f"/databases/{self.database_id}", timeout=10)
+            
+            if response.status_code == 200:
+                return response.json()
+            
+            logger.warning(f"Notion 스키마 조회 실패: {response.status_code} {response.text[:200]}")
+        except Exception as e:
+            logger.warning(f"Notion 스키마 조회 오류: {e}")
+        return None
+    
+    def _load_from_disk(self):
+        entry = self._read_cache_file().get(self.database_id)
+        if entry:
+            self._database = entry.get('database')
+            self._fetched_at = entry.get('fetched_at', 0.0)
+    
+    def _save_to_disk(self):
+        cache = self._read_cache_file()
+        cache[self.database_id] = {
+            'fetched_at': self._fetched_at,
+            'database': self._database
+        }
+        self._write_cache_file(cache)
+    
+    def _read_cache_file(self):
+        if not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Notion 스키마 캐시 파일 읽기 실패: {e}")
+            return {}
+    
+    def _write_cache_file(self, cache):
+        try:
+            directory = os.path.dirname(self.cache_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.cache_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Notion 스키마 캐시 저장 실패: {e}")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_schema_cache(database_id, api=None):
+    """데이터베이스별 공유 스키마 캐시 반환 (저장기/스키마 확인 도구 공용)"""
+    with _caches_lock:
+        cache = _caches.get(database_id)
+        if cache is None:
+            cache = NotionSchemaCache(database_id, api=api)
+            _caches[database_id] = cache
+        return cache
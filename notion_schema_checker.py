@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 # notion_schema_checker.py - Notion 데이터베이스 스키마 확인 도구
 
-import requests
 import json
 from config import Config
+from notion_api import NOTION_API_BASE, get_notion_scheduler
+from notion_schema_cache import get_schema_cache
+from notion_mirror import get_notion_mirror
 
 class NotionSchemaChecker:
     """Notion 데이터베이스 스키마 확인 및 분석"""
@@ -15,31 +17,58 @@ class NotionSchemaChecker:
             'Content-Type': 'application/json',
             'Notion-Version': '2022-06-28'
         }
-        self.base_url = "https://api.notion.com/v1"
+        self.base_url = NOTION_API_BASE
         self.database_id = Config.NOTION_DATABASE_ID
+        
+        # 저장기(SimpleNotion)와 같은 요청 스케줄러/스키마 캐시 사용
+        self.api = get_notion_scheduler()
+        self.schema_cache = get_schema_cache(self.database_id, api=self.api)
     
-    def check_database_schema(self):
-        """데이터베이스 스키마 상세 확인"""
+    def check_database_schema(self, use_cache=False):
+        """데이터베이스 스키마 상세 확인 (기본: API에서 새로 조회 후 캐시 갱신)"""
         print("🔍 Notion 데이터베이스 스키마 분석 중...")
         print("=" * 60)
         
         try:
-            url = f"{self.base_url}/databases/{self.database_id}"
-            response = requests.get(url, headers=self.headers)
+            db_info = self.schema_cache.get_database(force_refresh=not use_cache)
             
-            if response.status_code == 200:
-                db_info = response.json()
+            if db_info:
                 self._analyze_database_schema(db_info)
                 return db_info
             else:
-                print(f"❌ 데이터베이스 접근 실패: {response.status_code}")
-                print(f"Response: {response.text}")
+                print("❌ 데이터베이스 접근 실패 (로그를 확인하세요)")
                 return None
                 
         except Exception as e:
             print(f"❌ 스키마 확인 오류: {e}")
             return None
     
+    def inspect_offline(self):
+        """API 호출 없이 캐시된 스키마와 로컬 미러로 데이터베이스 확인"""
+        print("🗄️ Notion 데이터베이스 오프라인 확인 (캐시/미러 사용)")
+        print("=" * 60)
+        
+        db_info = self.schema_cache.get_cached_database()
+        if db_info:
+            self._analyze_database_schema(db_info)
+        else:
+            print("⚠️ 캐시된 스키마가 없습니다. 온라인 상태에서 한 번 실행하세요.")
+        
+        mirror = get_notion_mirror()
+        database_id = Config.NOTION_ARTICLES_DATABASE_ID
+        summary = mirror.get_summary(database_id)
+        
+        print("🗂️ 로컬 미러 현황:")
+        print("-" * 60)
+        print(f"📄 미러 페이지 수: {summary['pages']}개")
+        print(f"📝 마지막 수정 시각: {summary['last_edited_time'] or '없음'}")
+        
+        keywords = mirror.keyword_counts(database_id, limit=10)
+        if keywords:
+            print(f"🏷️ 상위 키워드: {', '.join(f'{kw}({count})' for kw, count in keywords)}")
+        
+        return db_info
+    
     def _analyze_database_schema(self, db_info):
         """데이터베이스 스키마 분석"""
         # 데이터베이스 기본 정보
@@ -135,7 +164,7 @@ class NotionSchemaChecker:
         """호환 가능한 속성 딕셔너리 생성"""
         print("\n🔧 호환 가능한 속성 코드 생성 중...")
         
-        db_info = self.check_database_schema()
+        db_info = self.check_database_schema(use_cache=True)
         if not db_info:
             return None
         
@@ -235,8 +264,14 @@ def _build_page_properties(self, today, current_time, articles, keywords, summar
 
 def main():
     """메인 실행"""
+    import sys
+    
     checker = NotionSchemaChecker()
     
+    if len(sys.argv) > 1 and sys.argv[1] == "offline":
+        checker.inspect_offline()
+        return
+    
     print("🔍 Notion 데이터베이스 스키마 확인 도구")
     print("=" * 60)
     
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# outbox.py - Notion/Telegram 전송용 디스크 기반 아웃박스 (SQLite)
+import os
+import sys
+import json
+import time
+import sqlite3
+import atexit
+import hashlib
+import threading
+import logging
+from contextlib import contextmanager
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class Outbox:
+    """완성된 리포트를 디스크에 먼저 기록하고, 전송은 나중에 재시도와 함께 수행하는 아웃박스
+    
+    각 항목은 idempotency_key로 한 번만 등록되며, 전송 단계별 결과(state)를
+    단계가 끝날 때마다 저장해 두어 재시도 시 이미 끝난 단계(예: Notion 페이지 생성)는 반복하지 않는다.
+    """
+    
+    def __init__(self, path=None):
+        self.config = Config
+        self.path = path or self.config.OUTBOX_DB_FILE
+        self.handlers = {}
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher = None
+        self._stop = threading.Event()
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 단위 연결 (정상 종료 시 commit, 항상 close)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    idempotency_key TEXT UNIQUE NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT '{}',
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    lease_until REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)")
+    
+    def register(self, kind, handler):
+        """전송 핸들러 등록 - handler(payload, state, checkpoint)는 성공 시 True, 실패 시 예외/False
+        
+        핸들러는 단계 하나를 마칠 때마다 checkpoint()를 호출해 state를 바로 저장해야 한다
+        (중간에 프로세스가 끝나도 재시도가 같은 단계를 반복하지 않도록).
+        """
+        self.handlers[kind] = handler
+    
+    @staticmethod
+    def make_key(kind, *parts):
+        """내용 기반 idempotency key 생성"""
+        digest = hashlib.sha1('\n'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+        return f"{kind}:{digest}"
+    
+    def enqueue(self, kind, payload, idempotency_key=None):
+        """전송 항목 등록 (같은 key는 한 번만 등록). 등록된 key 반환"""
+        body = json.dumps(payload, ensure_ascii=False, default=str)
+        key = idempotency_key or self.make_key(kind, body)
+        now = time.time()
+        
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, kind, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, kind, body, now, now)
+            )
+        
+        logger.info(f"📮 아웃박스 등록: {key}")
+        self._wakeup.set()
+        return key
+    
+    def flush(self, timeout=None):
+        """전송 시점이 된 항목 전달. 남은 항목이 없으면 True (재시도 대기 중인 항목이 있으면 False)
+        
+        timeout(초)이 지나거나 전송 스레드 중지가 요청되면 진행 중인 항목만 마치고 멈춘다.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        
+        with self._flush_lock:
+            while not self._stop.is_set():
+                item = self._claim_next()
+                if item is None:
+                    break
+                self._deliver(item)
+                if deadline is not None and time.time() >= deadline:
+                    break
+        
+        return self.pending_count() == 0
+    
+    def _claim_next(self):
+        """전송할 항목 하나를 lease와 함께 가져오기 (여러 프로세스 동시 실행 대비)"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM outbox WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'delivering' AND lease_until < ?) ORDER BY id LIMIT 5",
+                (now, now)
+            ).fetchall()
+            
+            for row in rows:
+                claimed = conn.execute(
+                    "UPDATE outbox SET status = 'delivering', lease_until = ?, updated_at = ? "
+                    "WHERE id = ? AND (status = 'pending' OR (status = 'delivering' AND lease_until < ?))",
+                    (now + self.config.OUTBOX_LEASE_SECONDS, now, row['id'], now)
+                ).rowcount
+                if claimed:
+                    return row
+        
+        return None
+    
+    def _deliver(self, row):
+        """항목 하나 전송 후 결과 기록"""
+        handler = self.handlers.get(row['kind'])
+        state = json.loads(row['state'] or '{}')
+        error = None
+        
+        if handler is None:
+            error = f"등록되지 않은 전송 종류: {row['kind']}"
+        else:
+            try:
+                if not handler(json.loads(row['payload']), state, lambda: self._save_state(row, state)):
+                    error = "전송 실패"
+            except Exception as e:
+                error = str(e)
+        
+        now = time.time()
+        attempts = row['attempts'] + 1
+        
+        with self._connect() as conn:
+            if error is None:
+                conn.execute(
+                    "UPDATE outbox SET status = 'done', state = ?, attempts = ?, last_error = NULL, updated_at = ? WHERE id = ?",
+                    (json.dumps(state, ensure_ascii=False), attempts, now, row['id'])
+                )
+                logger.info(f"✅ 아웃박스 전송 완료: {row['idempotency_key']}")
+            elif attempts >= self.config.OUTBOX_MAX_ATTEMPTS:
+                conn.execute(
+                    "UPDATE outbox SET status = 'dead', state = ?, attempts = ?, last_error = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(state, ensure_ascii=False), attempts, error, now, row['id'])
+                )
+                logger.error(f"❌ 아웃박스 전송 포기 ({attempts}회 실패): {row['idempotency_key']} - {error}")
+            else:
+                delay = min(self.config.OUTBOX_MAX_BACKOFF, self.config.OUTBOX_BASE_BACKOFF * (2 ** (attempts - 1)))
+                conn.execute(
+                    "UPDATE outbox SET status = 'pending', state = ?, attempts = ?, last_error = ?, "
+                    "next_attempt_at = ?, updated_at = ? WHERE id = ?",
+                    (json.dumps(state, ensure_ascii=False), attempts, error, now + delay, now, row['id'])
+                )
+                logger.warning(f"⚠️ 아웃박스 전송 실패, {delay}초 후 재시도 ({attempts}회): {error}")
+        
+        return error is None
+    
+    def _save_state(self, row, state):
+        """전송 중 단계 결과 저장 (lease도 함께 연장)"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET state = ?, lease_until = ?, updated_at = ? WHERE id = ?",
+                (json.dumps(state, ensure_ascii=False), now + self.config.OUTBOX_LEASE_SECONDS, now, row['id'])
+            )
+    
+    def get_item(self, idempotency_key):
+        """항목 상태 조회"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM outbox WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item['state'] = json.loads(item['state'] or '{}')
+        return item
+    
+    def pending_count(self, due_only=False):
+        """대기 중인 항목 수"""
+        query = "SELECT COUNT(*) FROM outbox WHERE status IN ('pending', 'delivering')"
+        params = ()
+        if due_only:
+            query += " AND next_attempt_at <= ?"
+            params = (time.time(),)
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchone()[0]
+    
+    def get_status(self):
+        """상태별 항목 수"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {row[0]: row[1] for row in rows}
+    
+    def _next_due_in(self):
+        """다음 전송 예정까지 남은 시간 (없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MIN(CASE WHEN status = 'pending' THEN next_attempt_at ELSE lease_until END) "
+                "FROM outbox WHERE status IN ('pending', 'delivering')"
+            ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+    
+    def start_flusher(self):
+        """백그라운드 전송 스레드 시작"""
+        if self._flusher and self._flusher.is_alive():
+            return self._flusher
+        
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._flusher_loop, name='outbox-flusher', daemon=True)
+        self._flusher.start()
+        return self._flusher
+    
+    def stop_flusher(self, timeout=None):
+        """전송 스레드 중지. timeout이 주어지면 진행 중인 항목 전송이 끝날 때까지 대기"""
+        self._stop.set()
+        self._wakeup.set()
+        flusher = self._flusher
+        if timeout is None or flusher is None or flusher is threading.current_thread():
+            return
+        
+        flusher.join(timeout)
+        if flusher.is_alive():
+            logger.warning(f"⚠️ 아웃박스 전송이 {timeout}초 안에 끝나지 않음 - lease 만료 후 이어서 재시도합니다")
+    
+    def _flusher_loop(self):
+        logger.info("📮 아웃박스 전송 스레드 시작")
+        while not self._stop.is_set():
+            try:
+                self.flush()
+                wait = self._next_due_in()
+            except Exception as e:
+                logger.error(f"아웃박스 전송 스레드 오류: {e}")
+                wait = self.config.OUTBOX_BASE_BACKOFF
+            
+            self._wakeup.wait(timeout=wait)
+            self._wakeup.clear()
+
+def deliver_report(payload, state, checkpoint):
+    """리포트 전송 핸들러: Notion 저장 → Telegram 알림 (완료된 단계는 건너뜀, 단계마다 checkpoint)"""
+    from notion_saver import NotionSaver
+    from telegram_sender import TelegramSender
+    from subscriptions import get_subscription_registry, send_digests
+    
+    summary_data = payload['summary_data']
+    
+    if not state.get('notion_url'):
+        notion_url = NotionSaver().save(summary_data, payload.get('html_content'), mode=payload.get('notion_mode'))
+        
+        if not notion_url:
+            raise RuntimeError("Notion 저장 실패")
+        state['notion_url'] = notion_url
+        checkpoint()
+    
+    if not state.get('telegram_sent'):
+        if not TelegramSender().send_summary_message(summary_data, state['notion_url']):
+            raise RuntimeError("Telegram 전송 실패")
+        state['telegram_sent'] = True
+        checkpoint()
+    
+    # 구독 채팅별 다이제스트 (이미 받은 채팅은 건너뜀)
+    sent = set(state.get('digests_sent', []))
+    targets = set(get_subscription_registry().build_digests(summary_data.get('articles', [])))
+    if targets - sent:
+        sent |= send_digests(summary_data, state['notion_url'], skip=sent)
+        state['digests_sent'] = sorted(sent)
+        checkpoint()
+        if targets - sent:
+            raise RuntimeError(f"구독 다이제스트 {len(targets - sent)}개 채팅 전송 실패")
+    
+    return True
+
+_shared_outbox = None
+_shared_lock = threading.Lock()
+
+def get_outbox():
+    """기본 핸들러가 등록된 프로세스 전역 Outbox 반환"""
+    global _shared_outbox
+    with _shared_lock:
+        if _shared_outbox is None:
+            _shared_outbox = Outbox()
+            _shared_outbox.register('report', deliver_report)
+            atexit.register(_stop_at_exit, _shared_outbox)
+        return _shared_outbox
+
+def _stop_at_exit(outbox):
+    """종료 전에 진행 중인 전송을 마치도록 대기 (데몬 스레드가 중간에 끊겨 같은 페이지를 다시 만들지 않도록)"""
+    if outbox._flusher is not None and outbox._flusher.is_alive():
+        outbox.stop_flusher(timeout=Config.OUTBOX_LEASE_SECONDS)
+
+def main():
+    """아웃박스 관리 명령"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    outbox = get_outbox()
+    
+    if command == 'flush':
+        print("📮 대기 중인 전송 처리 중...")
+        done = outbox.flush()
+        print(f"{'✅ 모두 전송됨' if done else '⚠️ 일부 항목이 재시도 대기 중'}")
+    elif command == 'status':
+        status = outbox.get_status()
+        print("📮 아웃박스 상태:")
+        for name in ('pending', 'delivering', 'done', 'dead'):
+            print(f"  • {name}: {status.get(name, 0)}개")
+    else:
+        print("사용법:")
+        print("  python3 outbox.py status  # 상태 확인")
+        print("  python3 outbox.py flush   # 대기 중인 전송 즉시 처리")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# pipeline_runner.py - 컨트롤러용 파이프라인 실행기 (프로세스 내 실행 / 서브프로세스 격리 실행)
+import os
+import re
+import sys
+import subprocess
+import threading
+import logging
+from collections import deque
+from datetime import datetime
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 파이프라인 단계 이름 (진행 상황 콜백에 전달, main_004 출력의 "N단계:" 표시와 순서 일치)
+PIPELINE_STAGES = [
+    "설정 검증",
+    "Google News 검색",
+    "기사 본문 크롤링",
+    "데이터 정리",
+    "리포트 생성",
+    "Notion 저장",
+    "Telegram 전송"
+]
+
+# 서브프로세스 출력에서 단계 표시 인식 (예: "📄 3단계: 기사 본문 크롤링 중...")
+STAGE_MARKER_PATTERN = re.compile(r'(\d+)단계:')
+
+class PipelineRunner:
+    """뉴스 파이프라인 1회 실행을 담당하는 클래스
+    
+    기본은 프로세스 안에서 NewsPipeline.run()을 직접 호출해 세션과 캐시를 재사용한다.
+    PIPELINE_SUBPROCESS=true면 예전처럼 실행마다 main_004.py를 별도 프로세스로 띄우고,
+    출력은 한 줄씩 로거와 고정 크기 버퍼로 흘려보낸다.
+    두 방식 모두 같은 형태의 결과 딕셔너리를 반환하고 get_progress()로 진행 상황을 보여준다.
+    """
+    
+    def __init__(self, use_subprocess=None, pipeline=None, keywords=None, topic=None):
+        self.config = Config
+        self.keywords = keywords
+        self.topic = topic
+        # 토픽별 키워드는 프로세스 내 실행에서만 적용 (서브프로세스는 기본 설정으로 실행)
+        use_subprocess = self.config.PIPELINE_SUBPROCESS if use_subprocess is None else use_subprocess
+        self.use_subprocess = use_subprocess and not keywords
+        self.script_dir = os.path.dirname(os.path.abspath(__file__))
+        self._pipeline = pipeline
+        
+        # 진행 상황 (get_status에서 조회)
+        self._progress_lock = threading.Lock()
+        self._progress = {}
+        self.output = deque(maxlen=self.config.PIPELINE_OUTPUT_BUFFER_LINES)
+    
+    @property
+    def pipeline(self):
+        """프로세스 내 파이프라인 (처음 사용할 때 import - bs4/feedparser 로드는 한 번만)"""
+        if self._pipeline is None:
+            from main_004 import NewsPipeline, get_pipeline
+            self._pipeline = NewsPipeline(keywords=self.keywords, topic=self.topic) if self.keywords else get_pipeline()
+        return self._pipeline
+    
+    def run(self, trigger_source="manual", on_stage=None):
+        """파이프라인 실행 후 결과 딕셔너리 반환 (블로킹 - 이벤트 루프에서는 executor로 호출)
+        
+        공통 키: trigger, start_time, end_time, duration, success, error, in_process
+        on_stage(stage, total, name)는 단계가 시작될 때마다 호출된다
+        (서브프로세스 실행은 출력의 단계 표시로 판단).
+        """
+        with self._progress_lock:
+            self._progress = {
+                'running': True,
+                'trigger': trigger_source,
+                'started': datetime.now(),
+                'stage': 0,
+                'stage_name': None,
+                'pid': None,
+                'last_line': None
+            }
+            self.output.clear()
+        
+        def report_stage(stage, total, name):
+            with self._progress_lock:
+                self._progress.update({'stage': stage, 'stage_name': name})
+            if on_stage is not None:
+                on_stage(stage, total, name)
+        
+        try:
+            if self.use_subprocess:
+                return self._run_subprocess(trigger_source, report_stage)
+            return self._run_in_process(trigger_source, report_stage)
+        finally:
+            with self._progress_lock:
+                self._progress['running'] = False
+    
+    def prewarm(self):
+        """예약 실행 전 캐시 채우기 (프로세스 내 실행에서만 의미 있음), 성공 여부 반환"""
+        if self.use_subprocess:
+            # 실행마다 새 프로세스라 미리 채운 캐시를 이어받을 수 없음
+            logger.info("🔥 서브프로세스 실행 방식이라 prewarm을 건너뜁니다")
+            return False
+        return self.pipeline.prewarm()
+    
+    def start_prewarm(self):
+        """prewarm을 별도 스레드에서 시작 (스케줄러가 본 실행 시각을 놓치지 않도록)"""
+        thread = threading.Thread(target=self.prewarm, name="pipeline-prewarm", daemon=True)
+        thread.start()
+        return thread
+    
+    def get_progress(self):
+        """현재(또는 마지막) 실행의 진행 상황"""
+        with self._progress_lock:
+            if not self._progress:
+                return {'running': False}
+            progress = dict(self._progress)
+        progress['total_stages'] = len(PIPELINE_STAGES)
+        progress['elapsed'] = (datetime.now() - progress['started']).total_seconds()
+        progress['started'] = progress['started'].strftime('%Y-%m-%d %H:%M:%S')
+        return progress
+    
+    def format_progress(self):
+        """상태 메시지용 진행 상황 한 줄 (실행 중이 아니면 None)"""
+        progress = self.get_progress()
+        if not progress['running']:
+            return None
+        stage = f"{progress['stage']}/{progress['total_stages']} {progress['stage_name']}" if progress['stage'] else "준비 중"
+        return f"{stage} ({progress['elapsed']:.0f}초 경과)"
+    
+    def _run_in_process(self, trigger_source, on_stage=None):
+        start_time = datetime.now()
+        try:
+            result = self.pipeline.run(trigger_source=trigger_source, on_stage=on_stage)
+        except Exception as e:
+            end_time = datetime.now()
+            logger.error(f"❌ 파이프라인 실행 오류: {e}")
+            result = {
+                'trigger': trigger_source,
+                'start_time': start_time,
+                'end_time': end_time,
+                'duration': (end_time - start_time).total_seconds(),
+                'success': False,
+                'error': str(e),
+                'notified': False
+            }
+        result['in_process'] = True
+        # 프로세스 내 실행은 파이프라인이 직접 에러 알림을 보냄
+        result.setdefault('notified', True)
+        return result
+    
+    def _run_subprocess(self, trigger_source, on_stage=None):
+        start_time = datetime.now()
+        result = {
+            'trigger': trigger_source,
+            'start_time': start_time,
+            'success': False,
+            'error': None,
+            'in_process': False,
+            'notified': False,
+            'output_tail': []
+        }
+        
+        timed_out = threading.Event()
+        watchdog = None
+        try:
+            # 자식 출력을 버퍼링 없이 한 줄씩 받기 (stderr도 같은 순서로 합침)
+            env = dict(os.environ, PYTHONUNBUFFERED='1')
+            process = subprocess.Popen(
+                [sys.executable, self.config.PIPELINE_SCRIPT],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                errors='replace',
+                cwd=self.script_dir,
+                env=env
+            )
+            with self._progress_lock:
+                self._progress['pid'] = process.pid
+            
+            def kill_on_timeout():
+                timed_out.set()
+                process.kill()
+            
+            watchdog = threading.Timer(self.config.PIPELINE_TIMEOUT, kill_on_timeout)
+            watchdog.daemon = True
+            watchdog.start()
+            
+            for line in process.stdout:
+                self._handle_output_line(line.rstrip('\n'), on_stage)
+            return_code = process.wait()
+            
+            result['return_code'] = return_code
+            result['success'] = return_code == 0 and not timed_out.is_set()
+            if timed_out.is_set():
+                # 멈춘 지점을 알 수 있도록 마지막 출력을 함께 남김
+                result['error'] = f"실행 시간 초과 ({self.config.PIPELINE_TIMEOUT}초)\n" + '\n'.join(list(self.output)[-10:])
+            elif not result['success']:
+                result['error'] = '\n'.join(list(self.output)[-20:]) or f"Exit code: {return_code}"
+        except Exception as e:
+            result['error'] = str(e)
+        finally:
+            if watchdog:
+                watchdog.cancel()
+        
+        result['output_tail'] = [line for line in self.output if line.strip()][-10:]
+        end_time = datetime.now()
+        result['end_time'] = end_time
+        result['duration'] = (end_time - start_time).total_seconds()
+        return result
+    
+    def _handle_output_line(self, line, on_stage=None):
+        """자식 출력 한 줄 처리 - 로그, 링 버퍼, 단계 표시 인식"""
+        self.output.append(line)
+        if not line.strip():
+            return
+        
+        logger.info(f"   │ {line}")
+        with self._progress_lock:
+            self._progress['last_line'] = line
+        
+        match = STAGE_MARKER_PATTERN.search(line)
+        if match and on_stage is not None:
+            stage = int(match.group(1))
+            if 1 <= stage <= len(PIPELINE_STAGES):
+                on_stage(stage, len(PIPELINE_STAGES), PIPELINE_STAGES[stage - 1])
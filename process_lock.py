@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# process_lock.py - 컨트롤러 프로세스 간 조정 (리더 임대 + 하트비트, 파이프라인 실행 잠금)
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import threading
+import logging
+from contextlib import contextmanager
+from config import Config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+def _lock_file(f, blocking=True):
+    """열린 파일에 프로세스 간 배타 잠금. 비차단 모드에서 이미 잠겨 있으면 False"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        if blocking:
+            raise
+        return False
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _open_lock_file(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, 'a+', encoding='utf-8')
+
+@contextmanager
+def _file_lock(path):
+    """짧은 임계 구역용 차단 잠금"""
+    f = _open_lock_file(path)
+    try:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+    finally:
+        f.close()
+
+# 잠금 파일 경로 -> 프로세스 내 스레드 잠금
+# (flock은 열린 파일마다 따로 잡히므로 같은 프로세스의 두 인스턴스도 서로를 다른 프로세스로 보고 막는다)
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+def _process_lock(path):
+    with _process_locks_guard:
+        return _process_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+def _process_id(role):
+    return f"{role}@{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+class LeaderLease:
+    """파일 기반 리더 임대 (같은 .state를 쓰는 컨트롤러 중 하나만 예약 실행)
+    
+    리더는 LEADER_HEARTBEAT_INTERVAL마다 임대를 LEADER_LEASE_SECONDS만큼 연장하고,
+    대기 인스턴스는 같은 주기로 임대 파일을 확인하다가 만료되면(리더가 죽으면) 넘겨받는다.
+    임대 파일의 읽기/쓰기는 별도 잠금 파일로 보호한다.
+    """
+    
+    def __init__(self, role="controller", path=None):
+        self.config = Config
+        self.role = role
+        self.path = path or self.config.LEADER_LEASE_FILE
+        self.lock_path = self.path + '.lock'
+        self.owner = _process_id(role)
+        self._leader = False
+        self._expires_at = 0
+        self._holder = None
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @property
+    def is_leader(self):
+        """리더 여부 (하트비트가 밀려 임대가 끝났으면 리더가 아님)"""
+        return self._leader and time.time() < self._expires_at
+    
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write(self, lease):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(lease, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def heartbeat(self):
+        """임대 연장(리더) 또는 만료된 임대 획득(대기) 시도 후 리더 여부 반환"""
+        now = time.time()
+        with _file_lock(self.lock_path):
+            lease = self._read()
+            if lease is None or lease.get('owner') == self.owner or lease.get('expires_at', 0) <= now:
+                acquired_at = lease.get('acquired_at', now) if lease and lease.get('owner') == self.owner else now
+                lease = {
+                    'owner': self.owner,
+                    'role': self.role,
+                    'pid': os.getpid(),
+                    'acquired_at': acquired_at,
+                    'expires_at': now + self.config.LEADER_LEASE_SECONDS
+                }
+                self._write(lease)
+                leader = True
+            else:
+                leader = False
+        
+        was_leader = self._leader
+        self._leader = leader
+        self._holder = lease
+        if leader:
+            self._expires_at = lease['expires_at']
+            if not was_leader:
+                logger.info(f"👑 리더로 선출됨 ({self.owner}) - 예약 실행 담당")
+        elif was_leader:
+            logger.warning(f"⚠️ 리더 자격 상실 - 현재 리더: {lease.get('owner')}")
+        return leader
+    
+    def _tick(self):
+        try:
+            self.heartbeat()
+        except OSError as e:
+            # 임대 파일 오류 시 상태 유지 (임대가 끝나면 is_leader가 자동으로 False)
+            logger.warning(f"리더 임대 확인 실패: {e}")
+    
+    def _loop(self):
+        while not self._stop.wait(self.config.LEADER_HEARTBEAT_INTERVAL):
+            self._tick()
+    
+    def start(self):
+        """즉시 한 번 선출을 시도한 뒤 하트비트 스레드 시작"""
+        self._tick()
+        if not self._leader:
+            holder = self._holder or {}
+            logger.info(f"⏸️ 대기 인스턴스로 시작 - 현재 리더: {holder.get('owner')} (만료 시 자동 승계)")
+        self._thread = threading.Thread(target=self._loop, name="leader-heartbeat", daemon=True)
+        self._thread.start()
+        return self._thread
+    
+    def stop(self):
+        """하트비트 중단 + 리더였다면 임대 반납 (대기 인스턴스가 바로 넘겨받음)"""
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        if not self._leader:
+            return
+        
+        try:
+            with _file_lock(self.lock_path):
+                lease = self._read()
+                if lease and lease.get('owner') == self.owner:
+                    os.remove(self.path)
+            logger.info("👑 리더 임대 반납")
+        except OSError as e:
+            logger.warning(f"리더 임대 반납 실패: {e}")
+        self._leader = False
+    
+    def get_status(self):
+        holder = self._read() or {}
+        expires_in = holder.get('expires_at', 0) - time.time()
+        return {
+            'is_leader': self.is_leader,
+            'owner': self.owner,
+            'leader': holder.get('owner') if expires_in > 0 else None,
+            'expires_in': round(expires_in) if expires_in > 0 else 0
+        }
+
+class PipelineRunLock:
+    """파이프라인 실행 잠금 - 여러 프로세스가 동시에 크롤링/Notion 저장을 하지 않도록 함
+    
+    잠금 파일에 실행 중인 프로세스 정보를 적어 두어 다른 프로세스가 상태를 볼 수 있다.
+    잠금은 프로세스가 죽으면 OS가 자동으로 풀어 준다.
+    같은 프로세스 안에서 같은 잠금 파일을 쓰는 실행은 스레드 잠금으로 차례를 기다린 뒤 직접 실행한다
+    (다른 프로세스의 실행 결과만 공유 대상). 토픽별 실행은 토픽마다 다른 잠금 파일을 쓴다.
+    """
+    
+    def __init__(self, path=None):
+        self.config = Config
+        self.path = path or self.config.PIPELINE_LOCK_FILE
+        self.info_path = self.path + '.json'
+    
+    @contextmanager
+    def hold(self, trigger_source, wait=None, finished=None):
+        """실행 잠금 획득 시도. yield 값:
+        
+        'acquired' - 잠금을 잡음 (실행)
+        'waited'   - 다른 프로세스의 실행이 끝날 때까지 기다림 (그 결과를 공유, 실행하지 않음)
+        'timeout'  - wait초 안에 끝나지 않음
+        
+        finished(started_at)는 기다린 실행(started_at에 시작)이 결과를 남겼는지 확인한다.
+        결과가 없으면(비정상 종료 등) 또는 finished가 없으면 풀린 잠금을 그대로 잡고 'acquired'.
+        """
+        wait = self.config.PIPELINE_LOCK_WAIT if wait is None else wait
+        deadline = time.monotonic() + wait
+        local = _process_lock(self.path)
+        if not local.acquire(timeout=wait):
+            yield 'timeout'
+            return
+        
+        f = None
+        try:
+            f = _open_lock_file(self.path)
+            if _lock_file(f, blocking=False):
+                with self._owned(f, trigger_source):
+                    yield 'acquired'
+                return
+            
+            holder = self.holder() or {}
+            started_at = holder.get('started_at')
+            logger.info(f"⏳ 다른 프로세스가 파이프라인 실행 중 ({holder.get('owner')}, 트리거: {holder.get('trigger')}) - 완료 대기")
+            while time.monotonic() < deadline:
+                time.sleep(1)
+                if started_at is None:
+                    # 상대가 잠금 직후 아직 정보 파일을 쓰기 전이었음
+                    started_at = (self.holder() or {}).get('started_at')
+                if not _lock_file(f, blocking=False):
+                    continue
+                
+                if started_at is not None and finished is not None and finished(started_at):
+                    _unlock_file(f)
+                    yield 'waited'
+                    return
+                
+                # 기다린 실행이 결과 없이 끝남 (SIGKILL, 시간 초과 등) - 직접 실행
+                logger.warning(f"⚠️ 기다린 실행({holder.get('owner')})이 결과 없이 끝남 - 직접 실행")
+                with self._owned(f, trigger_source):
+                    yield 'acquired'
+                return
+            yield 'timeout'
+        finally:
+            if f is not None:
+                f.close()
+            local.release()
+    
+    @contextmanager
+    def _owned(self, f, trigger_source):
+        """잡은 잠금의 실행 정보 기록 - 끝나면 정보 삭제 후 잠금 해제"""
+        self._write_info(trigger_source)
+        try:
+            yield
+        finally:
+            self._clear_info()
+            _unlock_file(f)
+    
+    def holder(self):
+        """다른(또는 현재) 프로세스의 실행 정보 (실행 중이 아니면 None)"""
+        # 정보 파일은 비정상 종료 시 남을 수 있으므로 잠금이 실제로 잡혀 있는지 먼저 확인
+        f = _open_lock_file(self.path)
+        try:
+            if _lock_file(f, blocking=False):
+                _unlock_file(f)
+                return None
+        finally:
+            f.close()
+        
+        try:
+            with open(self.info_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_info(self, trigger_source):
+        info = {
+            'owner': _process_id(os.path.basename(sys.argv[0]) or 'python'),
+            'trigger': trigger_source,
+            'started_at': time.time()
+        }
+        tmp_path = self.info_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(info, f, ensure_ascii=False)
+        os.replace(tmp_path, self.info_path)
+    
+    def _clear_info(self):
+        try:
+            os.remove(self.info_path)
+        except OSError:
+            pass
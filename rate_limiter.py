@@ -0,0 +1,47 @@
+# rate_limiter.py - 토큰 버킷 기반 요청 속도 제한
+import time
+import threading
+
+class TokenBucket:
+    """초당 rate개의 토큰을 채우는 토큰 버킷 (스레드 안전)
+    
+    capacity만큼의 순간 버스트를 허용하고, 이후에는 평균 rate 요청/초로 제한한다.
+    """
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            time.sleep(wait)
+    
+    def try_acquire(self, tokens=1):
+        """대기 없이 토큰 획득 시도"""
+        with self._lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+    
+    def pause(self, seconds):
+        """일정 시간 동안 토큰 지급 중단 (Retry-After 대응)"""
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+# run_history.py - 파이프라인 실행 기록 (SQLite, 단계별 시간/호스트별 지표/지연 백분위)
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from contextlib import contextmanager
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def percentile(values, pct):
+    """nearest-rank 백분위 (값이 없으면 None)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil(n * pct / 100)
+    return ordered[int(rank) - 1]
+
+def diff_metrics(before, after):
+    """실행 전후 누적 지표 차이 → 이번 실행분 지표
+    
+    before/after: {'http': HttpClient.get_metrics(), 'images': ImageProber 통계}
+    """
+    http_before = dict(before.get('http', {}))
+    http_after = dict(after.get('http', {}))
+    dns_before = http_before.pop('_dns', {})
+    dns_after = http_after.pop('_dns', {})
+    
+    hosts = {}
+    for host, metric in http_after.items():
+        prev = http_before.get(host, {})
+        requests_count = metric['requests'] - prev.get('requests', 0)
+        if requests_count <= 0:
+            continue
+        hosts[host] = {
+            'requests': requests_count,
+            'errors': metric['errors'] - prev.get('errors', 0),
+            'total_time': round(metric['total_time'] - prev.get('total_time', 0.0), 3),
+            'bytes': metric['bytes'] - prev.get('bytes', 0)
+        }
+    
+    images_before = before.get('images', {})
+    images_after = after.get('images', {})
+    return {
+        'hosts': hosts,
+        'requests': sum(host['requests'] for host in hosts.values()),
+        'bytes': sum(host['bytes'] for host in hosts.values()),
+        'dns_hits': dns_after.get('hits', 0) - dns_before.get('hits', 0),
+        'dns_misses': dns_after.get('misses', 0) - dns_before.get('misses', 0),
+        'image_cache_hits': images_after.get('cache_hits', 0) - images_before.get('cache_hits', 0),
+        'image_probed': images_after.get('probed', 0) - images_before.get('probed', 0)
+    }
+
+class RunHistory:
+    """파이프라인 실행 기록 저장소
+    
+    실행마다 결과, 단계별 소요시간, 기사/크롤링 수, 전송 바이트, 캐시 적중률을 남기고
+    호스트(언론사)별 요청 시간은 별도 테이블에 둬서 크롤링 지연 회귀를 찾을 수 있게 한다.
+    """
+    
+    def __init__(self, path=None):
+        self.config = Config
+        self.path = path or self.config.RUN_HISTORY_DB_FILE
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 단위 연결 (정상 종료 시 commit, 항상 close)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    trigger TEXT,
+                    started_at REAL NOT NULL,
+                    duration REAL,
+                    success INTEGER NOT NULL,
+                    error TEXT,
+                    articles INTEGER,
+                    crawl_attempts INTEGER,
+                    crawl_failures INTEGER,
+                    crawl_resumed INTEGER,
+                    requests INTEGER,
+                    bytes INTEGER,
+                    dns_hits INTEGER,
+                    dns_misses INTEGER,
+                    image_cache_hits INTEGER,
+                    image_probed INTEGER,
+                    stages TEXT,
+                    notion_url TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at);
+                
+                CREATE TABLE IF NOT EXISTS run_hosts (
+                    run_id INTEGER NOT NULL,
+                    host TEXT NOT NULL,
+                    requests INTEGER,
+                    errors INTEGER,
+                    total_time REAL,
+                    bytes INTEGER,
+                    PRIMARY KEY (run_id, host)
+                );
+                CREATE INDEX IF NOT EXISTS idx_run_hosts_host ON run_hosts (host);
+            """)
+            # 토픽 컬럼 추가 (이전 기록은 NULL = 기본 토픽)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(runs)")}
+            if 'topic' not in columns:
+                conn.execute("ALTER TABLE runs ADD COLUMN topic TEXT")
+    
+    def record(self, result):
+        """NewsPipeline.run() 결과 딕셔너리 저장 후 run id 반환"""
+        metrics = result.get('metrics') or {}
+        crawl = result.get('crawl') or {}
+        started_at = result['start_time'].timestamp() if result.get('start_time') else time.time()
+        
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """INSERT INTO runs (trigger, topic, started_at, duration, success, error, articles,
+                                     crawl_attempts, crawl_failures, crawl_resumed, requests, bytes,
+                                     dns_hits, dns_misses, image_cache_hits, image_probed, stages, notion_url)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    result.get('trigger'),
+                    result.get('topic'),
+                    started_at,
+                    result.get('duration'),
+                    1 if result.get('success') else 0,
+                    result.get('error'),
+                    result.get('articles', 0),
+                    crawl.get('total_attempts', 0),
+                    crawl.get('failed_crawls', 0),
+                    crawl.get('resumed', 0),
+                    metrics.get('requests', 0),
+                    metrics.get('bytes', 0),
+                    metrics.get('dns_hits', 0),
+                    metrics.get('dns_misses', 0),
+                    metrics.get('image_cache_hits', 0),
+                    metrics.get('image_probed', 0),
+                    json.dumps(result.get('stages') or {}, ensure_ascii=False),
+                    result.get('notion_url')
+                )
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO run_hosts (run_id, host, requests, errors, total_time, bytes) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, host, host_metric['requests'], host_metric['errors'], host_metric['total_time'], host_metric['bytes'])
+                    for host, host_metric in metrics.get('hosts', {}).items()
+                ]
+            )
+        return run_id
+    
+    def prune(self, retention_days=None):
+        """보존 기간이 지난 기록 삭제"""
+        retention_days = retention_days or self.config.RUN_HISTORY_RETENTION_DAYS
+        cutoff = time.time() - retention_days * 86400
+        with self._connect() as conn:
+            conn.execute("DELETE FROM run_hosts WHERE run_id IN (SELECT id FROM runs WHERE started_at < ?)", (cutoff,))
+            deleted = conn.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,)).rowcount
+        return deleted
+    
+    def recent(self, limit=10, topic=None):
+        """최근 실행 기록 (최신순, topic을 주면 그 토픽의 실행만)"""
+        with self._connect() as conn:
+            if topic is None:
+                rows = conn.execute("SELECT * FROM runs ORDER BY started_at DESC LIMIT ?", (limit,)).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM runs WHERE COALESCE(topic, ?) = ? ORDER BY started_at DESC LIMIT ?",
+                    (self.config.JOB_DEFAULT_TOPIC, topic, limit)
+                ).fetchall()
+        return [self._row_to_record(row) for row in rows]
+    
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+    
+    def _row_to_record(self, row):
+        record = dict(row)
+        record['start_time'] = datetime.fromtimestamp(row['started_at'])
+        record['success'] = bool(row['success'])
+        record['stages'] = json.loads(row['stages'] or '{}')
+        return record
+    
+    def get_statistics(self, days=None):
+        """최근 N일 실행 통계 (성공률, 전체/단계별 p50·p95, 캐시 적중률)"""
+        days = days or self.config.RUN_HISTORY_STATS_DAYS
+        cutoff = time.time() - days * 86400
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM runs WHERE started_at >= ? ORDER BY started_at", (cutoff,)).fetchall()
+        
+        durations = [row['duration'] for row in rows if row['success'] and row['duration'] is not None]
+        stage_times = {}
+        for row in rows:
+            if not row['success']:
+                continue
+            for name, seconds in json.loads(row['stages'] or '{}').items():
+                stage_times.setdefault(name, []).append(seconds)
+        
+        dns_lookups = sum((row['dns_hits'] or 0) + (row['dns_misses'] or 0) for row in rows)
+        image_lookups = sum((row['image_cache_hits'] or 0) + (row['image_probed'] or 0) for row in rows)
+        return {
+            'days': days,
+            'runs': len(rows),
+            'successes': sum(1 for row in rows if row['success']),
+            'p50': percentile(durations, 50),
+            'p95': percentile(durations, 95),
+            'stages': {
+                name: {'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+                for name, values in stage_times.items()
+            },
+            'avg_articles': sum(row['articles'] or 0 for row in rows) / len(rows) if rows else 0,
+            'avg_bytes': sum(row['bytes'] or 0 for row in rows) / len(rows) if rows else 0,
+            'dns_hit_rate': sum(row['dns_hits'] or 0 for row in rows) / dns_lookups if dns_lookups else None,
+            'image_cache_hit_rate': sum(row['image_cache_hits'] or 0 for row in rows) / image_lookups if image_lookups else None
+        }
+    
+    def host_statistics(self, days=None, limit=20):
+        """최근 N일 호스트(언론사)별 요청당 평균 시간의 p50/p95 (느린 순)
+        
+        최근 실행의 평균이 p95를 넘으면 regression으로 표시한다.
+        """
+        days = days or self.config.RUN_HISTORY_STATS_DAYS
+        cutoff = time.time() - days * 86400
+        with self._connect() as conn:
+            rows = conn.execute(
+                """SELECT h.host, h.requests, h.errors, h.total_time, r.started_at
+                   FROM run_hosts h JOIN runs r ON r.id = h.run_id
+                   WHERE r.started_at >= ? ORDER BY r.started_at""",
+                (cutoff,)
+            ).fetchall()
+        
+        per_host = {}
+        for row in rows:
+            if row['requests']:
+                entry = per_host.setdefault(row['host'], {'samples': [], 'requests': 0, 'errors': 0})
+                entry['samples'].append(row['total_time'] / row['requests'])
+                entry['requests'] += row['requests']
+                entry['errors'] += row['errors']
+        
+        stats = []
+        for host, entry in per_host.items():
+            samples = entry['samples']
+            p95 = percentile(samples, 95)
+            stats.append({
+                'host': host,
+                'runs': len(samples),
+                'requests': entry['requests'],
+                'errors': entry['errors'],
+                'p50': percentile(samples, 50),
+                'p95': p95,
+                'latest': samples[-1],
+                'regression': len(samples) >= 3 and samples[-1] >= p95 and samples[-1] > 2 * percentile(samples, 50)
+            })
+        stats.sort(key=lambda item: -item['p50'])
+        return stats[:limit]
+    
+    def format_summary(self, days=None):
+        """상태 메시지용 한 줄 요약 목록"""
+        stats = self.get_statistics(days)
+        if not stats['runs']:
+            return [f"최근 {stats['days']}일 실행 기록 없음"]
+        
+        lines = [f"최근 {stats['days']}일: {stats['runs']}회 실행, 성공 {stats['successes']}회"]
+        if stats['p50'] is not None:
+            lines.append(f"소요시간 p50 {stats['p50']:.1f}초 / p95 {stats['p95']:.1f}초")
+        slowest = sorted(stats['stages'].items(), key=lambda item: -(item[1]['p95'] or 0))[:3]
+        if slowest:
+            lines.append("느린 단계: " + ', '.join(f"{name} p95 {times['p95']:.1f}초" for name, times in slowest))
+        if stats['dns_hit_rate'] is not None:
+            lines.append(f"DNS 캐시 적중률 {stats['dns_hit_rate'] * 100:.0f}%")
+        return lines
+
+_shared_history = None
+_shared_lock = threading.Lock()
+
+def get_run_history():
+    """프로세스 전역 RunHistory 반환"""
+    global _shared_history
+    with _shared_lock:
+        if _shared_history is None:
+            _shared_history = RunHistory()
+        return _shared_history
+
+def main():
+    """실행 기록 조회 명령"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'stats'
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else Config.RUN_HISTORY_STATS_DAYS
+    history = get_run_history()
+    
+    if command == 'stats':
+        stats = history.get_statistics(days)
+        print(f"📈 최근 {days}일 실행 통계:")
+        for line in history.format_summary(days):
+            print(f"  • {line}")
+        for name, times in stats['stages'].items():
+            print(f"    - {name}: p50 {times['p50']:.2f}초 / p95 {times['p95']:.2f}초")
+        if stats['image_cache_hit_rate'] is not None:
+            print(f"  • 이미지 검사 캐시 적중률 {stats['image_cache_hit_rate'] * 100:.0f}%")
+        print(f"  • 평균 기사 {stats['avg_articles']:.1f}개, 평균 전송량 {stats['avg_bytes'] / 1024:.0f}KB")
+    elif command == 'hosts':
+        print(f"🌐 최근 {days}일 언론사별 요청 시간 (요청당 평균):")
+        for item in history.host_statistics(days):
+            flag = " ⚠️ 느려짐" if item['regression'] else ""
+            print(f"  • {item['host']}: p50 {item['p50']:.2f}초 / p95 {item['p95']:.2f}초, 최근 {item['latest']:.2f}초 ({item['runs']}회){flag}")
+    elif command == 'recent':
+        for record in history.recent(days):
+            result = "✅" if record['success'] else "❌"
+            print(f"  {record['start_time'].strftime('%m-%d %H:%M')} | {record['trigger']} | {result} | {record['duration']:.1f}s | 기사 {record['articles']}개")
+    elif command == 'prune':
+        print(f"🧹 오래된 실행 기록 {history.prune()}건 삭제")
+    else:
+        print("사용법:")
+        print("  python3 run_history.py stats [일수]    # 소요시간 p50/p95, 단계별 시간")
+        print("  python3 run_history.py hosts [일수]    # 언론사별 크롤링 시간 (느려진 곳 표시)")
+        print("  python3 run_history.py recent [개수]   # 최근 실행 기록")
+        print("  python3 run_history.py prune           # 보존 기간 지난 기록 삭제")
+
+if __name__ == "__main__":
+    main()
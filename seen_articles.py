@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# seen_articles.py - 이미 처리한 기사 기록 (SQLite, 폴링 모드의 신규 기사 판별용)
+import os
+import sys
+import time
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class SeenArticleStore:
+    """RSS 항목 링크(feed_id) 기준으로 본 기사를 기록하는 저장소
+    
+    폴링할 때마다 피드의 링크 목록을 filter_unseen()으로 걸러 새 기사만 처리하고,
+    처리(전송)한 기사는 mark_seen()으로 남긴다. 재시작해도 같은 기사를 다시 보내지 않는다.
+    """
+    
+    def __init__(self, path=None):
+        self.config = Config
+        self.path = path or self.config.SEEN_ARTICLES_DB_FILE
+        self._init_db()
+    
+    @contextmanager
+    def _connect(self):
+        """트랜잭션 단위 연결 (정상 종료 시 commit, 항상 close)"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS seen_articles (
+                    feed_id TEXT PRIMARY KEY,
+                    url TEXT,
+                    title TEXT,
+                    delivered INTEGER NOT NULL DEFAULT 0,
+                    seen_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_seen_at ON seen_articles (seen_at);
+            """)
+    
+    def filter_unseen(self, feed_ids):
+        """feed_ids 중 아직 기록되지 않은 것만 (입력 순서 유지)"""
+        feed_ids = list(dict.fromkeys(feed_ids))
+        if not feed_ids:
+            return []
+        
+        seen = set()
+        with self._connect() as conn:
+            # SQLite 변수 개수 제한을 넘지 않도록 나누어 조회
+            for start in range(0, len(feed_ids), 500):
+                chunk = feed_ids[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = conn.execute(f"SELECT feed_id FROM seen_articles WHERE feed_id IN ({placeholders})", chunk)
+                seen.update(row['feed_id'] for row in rows)
+        return [feed_id for feed_id in feed_ids if feed_id not in seen]
+    
+    def mark_seen(self, articles, delivered=True):
+        """기사 목록 기록 (article['feed_id'] 필요, 없으면 url 사용)"""
+        now = time.time()
+        rows = [
+            (article.get('feed_id') or article.get('url'), article.get('url'), article.get('title'), int(delivered), now)
+            for article in articles
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO seen_articles (feed_id, url, title, delivered, seen_at) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+    
+    def count(self, delivered_only=False):
+        query = "SELECT COUNT(*) FROM seen_articles" + (" WHERE delivered = 1" if delivered_only else "")
+        with self._connect() as conn:
+            return conn.execute(query).fetchone()[0]
+    
+    def is_empty(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM seen_articles LIMIT 1").fetchone() is None
+    
+    def prune(self, retention_days=None):
+        """보존 기간이 지난 기록 삭제 (피드에서 이미 빠진 오래된 기사)"""
+        retention_days = retention_days or self.config.SEEN_ARTICLES_RETENTION_DAYS
+        cutoff = time.time() - retention_days * 86400
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM seen_articles WHERE seen_at < ?", (cutoff,)).rowcount
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_seen_store():
+    """프로세스 전역 SeenArticleStore 반환"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = SeenArticleStore()
+        return _shared_store
+
+def main():
+    """본 기사 기록 조회/정리 명령"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'status'
+    store = get_seen_store()
+    
+    if command == 'status':
+        print(f"👀 기록된 기사: {store.count()}개 (전송 {store.count(delivered_only=True)}개)")
+    elif command == 'prune':
+        print(f"🧹 오래된 기사 기록 {store.prune()}건 삭제")
+    else:
+        print("사용법:")
+        print("  python3 seen_articles.py status   # 기록된 기사 수")
+        print("  python3 seen_articles.py prune    # 보존 기간 지난 기록 삭제")
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,15 @@ Google News AI 간단 스케줄러
 정기적으로 뉴스 수집 및 전송 (Discord 기능 제외)
 """
 
-import schedule
-import time
-import subprocess
-import sys
 import os
+import signal
 import logging
 from datetime import datetime, timedelta
 from config import Config
+from notifier import get_notifier
+from pipeline_runner import PipelineRunner
+from cron_scheduler import CronScheduler
+from process_lock import LeaderLease, PipelineRunLock
 
 # 로깅 설정
 logging.basicConfig(
@@ -32,7 +33,16 @@ class SimpleScheduler:
         self.config = Config
         # 현재 작업 디렉토리 사용
         self.script_dir = os.getcwd()
-        self.main_script = 'main_004.py'  # main.py 대신 main_004.py 사용
+        self.main_script = self.config.PIPELINE_SCRIPT
+        
+        # 파이프라인 실행기 (기본: 프로세스 내 실행, 세션/캐시 재사용)
+        self.runner = PipelineRunner()
+        
+        # 스케줄러 (Config.SCHEDULES, Config.TIMEZONE 기준 - 다음 실행 시각까지 대기)
+        self.scheduler = CronScheduler()
+        
+        # 프로세스 간 조정 - master_controller 등과 함께 떠 있으면 리더만 예약 실행
+        self.leader = LeaderLease(role="simple_scheduler")
         
         # 실행 상태 관리
         self.is_running = False
@@ -55,51 +65,39 @@ class SimpleScheduler:
             logger.info(f"📊 실행 횟수: {self.execution_count}")
             logger.info(f"⏰ 시작 시간: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
             
-            # main_004.py 실행
-            result = subprocess.run(
-                [sys.executable, self.main_script],
-                capture_output=True,
-                text=True,
-                timeout=600,  # 10분 타임아웃
-                cwd=self.script_dir
-            )
+            # 파이프라인 실행 (기본: 프로세스 내, PIPELINE_SUBPROCESS=true면 main_004.py 별도 실행)
+            result = self.runner.run(trigger_source="schedule")
             
-            end_time = datetime.now()
-            duration = (end_time - start_time).total_seconds()
+            end_time = result['end_time']
+            duration = result['duration']
             self.last_execution = end_time
             
-            if result.returncode == 0:
+            if result['success']:
                 # 성공
                 self.last_success = end_time
                 logger.info("✅ 뉴스 수집 성공")
                 logger.info(f"⏱️ 소요시간: {duration:.1f}초")
                 
-                # 성공 결과 로그
-                if result.stdout:
-                    success_lines = [line for line in result.stdout.split('\n') if line.strip()]
-                    if success_lines:
-                        logger.info("📋 실행 결과:")
-                        for line in success_lines[-5:]:  # 마지막 5줄만
-                            logger.info(f"   {line}")
+                # 성공 결과 로그 (서브프로세스 실행 시)
+                if result.get('output_tail'):
+                    logger.info("📋 실행 결과:")
+                    for line in result['output_tail'][-5:]:  # 마지막 5줄만
+                        logger.info(f"   {line}")
                 
                 return True
             else:
                 # 실패
                 logger.error("❌ 뉴스 수집 실패")
-                logger.error(f"Exit code: {result.returncode}")
                 logger.error(f"소요시간: {duration:.1f}초")
                 
-                if result.stderr:
-                    logger.error(f"Error output: {result.stderr}")
+                if result.get('error'):
+                    logger.error(f"Error output: {result['error']}")
                 
-                # 에러 알림 전송
-                self._send_error_notification(result.stderr or "Unknown error")
+                # 에러 알림 전송 (프로세스 내 실행은 파이프라인이 이미 알림)
+                if not result.get('notified'):
+                    self._send_error_notification(result.get('error') or "Unknown error")
                 return False
                 
-        except subprocess.TimeoutExpired:
-            logger.error("⏰ 실행 시간 초과 (10분)")
-            self._send_error_notification("실행 시간 초과")
-            return False
         except Exception as e:
             logger.error(f"❌ 예상치 못한 오류: {e}")
             self._send_error_notification(str(e))
@@ -108,47 +106,63 @@ class SimpleScheduler:
             self.is_running = False
     
     def _send_error_notification(self, error_message):
-        """에러 발생 시 텔레그램 알림"""
-        try:
-            error_script = f"""
-import sys
-sys.path.append('{self.script_dir}')
-from telegram_sender import TelegramSender
-telegram = TelegramSender()
-error_msg = '🚨 스케줄 실행 오류\\n\\n{error_message[:200]}\\n\\n시간: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
-telegram.send_error_notification(error_msg)
-"""
-            subprocess.run([sys.executable, '-c', error_script], timeout=30)
-            logger.info("📱 에러 알림 전송됨")
-        except Exception as e:
-            logger.error(f"에러 알림 전송 실패: {e}")
+        """에러 발생 시 텔레그램 알림 (같은 오류 반복은 묶어서 전송)"""
+        get_notifier().notify_error("🚨 스케줄 실행 오류", error_message)
+        logger.info("📱 에러 알림 전송됨")
+    
+    def _run_scheduled(self):
+        """예약 실행 (리더만 - guard로 확인)"""
+        return self.run_news_collection()
+    
+    def _run_prewarm(self):
+        """prewarm 예약 실행 (리더만 - guard로 확인, 별도 스레드)"""
+        self.runner.start_prewarm()
+    
+    def _is_leader(self):
+        """예약 실행 조건 (스케줄러 guard)"""
+        return self.leader.is_leader
     
     def setup_schedule(self):
         """스케줄 설정"""
-        # 매일 지정된 시간에 실행
-        schedule.every().day.at(self.config.SCHEDULE_TIME).do(self.run_news_collection)
+        # Config.SCHEDULES의 일정마다 등록 (기본: 매일 SCHEDULE_TIME, 놓친 실행은 시작 시 보충)
+        for spec in self.config.SCHEDULES:
+            # 리더만 실행 - 대기 인스턴스는 기록 없이 건너뛰고, 승계되거나 리더가 실행할 때까지 재확인
+            self.scheduler.add_job(spec, self._run_scheduled, guard=self._is_leader)
+            # 일정별 prewarm (Config.SCHEDULE_PREWARM / PREWARM_MINUTES) - 몇 분 전에 캐시만 채움
+            prewarm_minutes = self.config.get_prewarm_minutes(spec)
+            if prewarm_minutes > 0:
+                self.scheduler.add_job(
+                    spec, self._run_prewarm, name=f"{spec} (prewarm)",
+                    offset_minutes=-prewarm_minutes, catch_up=False, guard=self._is_leader
+                )
         
         logger.info("📅 스케줄 설정 완료:")
-        logger.info(f"   • 실행 시간: 매일 {self.config.SCHEDULE_TIME}")
+        logger.info(f"   • 실행 일정: {', '.join(self.config.SCHEDULES)} ({self.config.TIMEZONE})")
+        prewarms = [f"{spec} -{self.config.get_prewarm_minutes(spec)}분" for spec in self.config.SCHEDULES if self.config.get_prewarm_minutes(spec) > 0]
+        if prewarms:
+            logger.info(f"   • prewarm: {', '.join(prewarms)}")
         logger.info(f"   • 작업: Google News AI 자동 수집")
         logger.info(f"   • 결과: Notion + Telegram 자동 전송")
         
         # 다음 실행 시간 표시
-        next_run = schedule.next_run()
+        next_run = self.scheduler.next_run()
         if next_run:
             logger.info(f"   • 다음 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
     
     def get_status(self):
         """현재 상태 반환"""
-        next_run = schedule.next_run()
+        next_run = self.scheduler.next_run()
         
         status = {
             'is_running': self.is_running,
+            'progress': self.runner.get_progress(),
             'execution_count': self.execution_count,
             'last_execution': self.last_execution.strftime('%Y-%m-%d %H:%M:%S') if self.last_execution else None,
             'last_success': self.last_success.strftime('%Y-%m-%d %H:%M:%S') if self.last_success else None,
             'next_run': next_run.strftime('%Y-%m-%d %H:%M:%S') if next_run else None,
-            'schedule_time': self.config.SCHEDULE_TIME
+            'schedule_time': ', '.join(self.config.SCHEDULES),
+            'leader': self.leader.get_status(),
+            'other_process_run': PipelineRunLock().holder()
         }
         
         return status
@@ -160,7 +174,13 @@ telegram.send_error_notification(error_msg)
         print("\n📊 Google News AI 스케줄러 상태:")
         print("=" * 60)
         print(f"🔄 현재 상태: {'실행 중' if status['is_running'] else '대기 중'}")
-        print(f"📅 스케줄 시간: 매일 {status['schedule_time']}")
+        progress = self.runner.format_progress()
+        if progress:
+            print(f"   • 진행: {progress}")
+        if status['other_process_run'] and not status['is_running']:
+            print(f"   • 다른 프로세스 실행 중: {status['other_process_run']['owner']} (트리거: {status['other_process_run']['trigger']})")
+        print(f"👑 리더: {'이 프로세스' if status['leader']['is_leader'] else (status['leader']['leader'] or '없음')}")
+        print(f"📅 스케줄: {status['schedule_time']} ({self.config.TIMEZONE})")
         print(f"⏰ 다음 실행: {status['next_run'] or '설정되지 않음'}")
         print(f"📊 총 실행 횟수: {status['execution_count']}회")
         print(f"🕐 마지막 실행: {status['last_execution'] or '없음'}")
@@ -208,54 +228,48 @@ telegram.send_error_notification(error_msg)
             print("💡 .env 파일의 API 키 설정을 확인하세요")
             return False
         
+        # 리더 선출 (대기 인스턴스는 리더가 죽으면 임대 만료 후 승계)
+        self.leader.start()
+        
         # 스케줄 설정
         self.setup_schedule()
         
         # 시작 알림
-        try:
-            start_script = f"""
-import sys
-sys.path.append('{self.script_dir}')
-from telegram_sender import TelegramSender
-telegram = TelegramSender()
-msg = '🤖 Google News AI 스케줄러 시작\\n\\n⏰ 실행 시간: 매일 {self.config.SCHEDULE_TIME}\\n📅 다음 실행: {schedule.next_run().strftime("%Y-%m-%d %H:%M:%S") if schedule.next_run() else "미정"}'
-telegram.send_notification(msg)
-"""
-            subprocess.run([sys.executable, '-c', start_script], timeout=30)
-            logger.info("📱 시작 알림 전송됨")
-        except Exception as e:
-            logger.warning(f"시작 알림 전송 실패: {e}")
+        next_run = self.scheduler.next_run()
+        get_notifier().notify(
+            f"🤖 Google News AI 스케줄러 시작\n\n"
+            f"⏰ 실행 일정: {', '.join(self.config.SCHEDULES)}\n"
+            f"📅 다음 실행: {next_run.strftime('%Y-%m-%d %H:%M:%S') if next_run else '미정'}"
+        )
+        logger.info("📱 시작 알림 전송됨")
         
         # 메인 루프
         try:
             logger.info("🔄 스케줄러 메인 루프 시작")
             logger.info("   Press Ctrl+C to stop")
             
-            while True:
-                schedule.run_pending()
-                time.sleep(60)  # 1분마다 체크
+            # SIGTERM(systemd/docker 종료)도 Ctrl+C와 같이 대기를 즉시 중단
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+            
+            # 다음 실행 시각까지 잠들었다가 실행 (60초 폴링 없음)
+            self.scheduler.run()
                 
         except KeyboardInterrupt:
             logger.info("⏹️ 스케줄러 종료")
             self.print_status()
             
-            # 종료 알림
-            try:
-                stop_script = f"""
-import sys
-sys.path.append('{self.script_dir}')
-from telegram_sender import TelegramSender
-telegram = TelegramSender()
-msg = '⏹️ Google News AI 스케줄러 종료\\n\\n📊 총 실행: {self.execution_count}회\\n🕐 종료 시간: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
-telegram.send_notification(msg)
-"""
-                subprocess.run([sys.executable, '-c', stop_script], timeout=30)
-            except Exception as e:
-                logger.warning(f"종료 알림 전송 실패: {e}")
+            # 종료 알림 (프로세스 종료 전 전송 큐에서 마저 보냄)
+            get_notifier().notify(
+                f"⏹️ Google News AI 스케줄러 종료\n\n"
+                f"📊 총 실행: {self.execution_count}회\n"
+                f"🕐 종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+            )
                 
         except Exception as e:
             logger.error(f"❌ 스케줄러 오류: {e}")
             return False
+        finally:
+            self.leader.stop()
         
         return True
 
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# subscriptions.py - 채팅별 키워드 구독과 맞춤 다이제스트 전송 (키워드 → 구독자 역색인)
+import os
+import re
+import sys
+import json
+import threading
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class SubscriptionRegistry:
+    """Telegram 채팅별 관심 키워드 구독 목록
+    
+    키워드(소문자) → 채팅 ID 집합의 역색인을 유지하고, 모든 키워드를 하나의 정규식으로
+    묶어 기사마다 본문을 한 번만 훑는다. 구독자가 늘어도 추가 비용은
+    해당 구독자에게 맞는 기사 수에만 비례한다.
+    키워드가 없는 구독자는 모든 기사를 받는다.
+    """
+    
+    def __init__(self, path=None):
+        self.config = Config
+        self.path = path or self.config.SUBSCRIPTIONS_FILE
+        self.subscribers = {}  # chat_id -> {'chat_id', 'name', 'keywords'}
+        self._lock = threading.Lock()
+        self._index = None
+        self._all_topics = None
+        self._pattern = None
+        self._contained = None
+        self.load()
+    
+    def load(self):
+        """구독 파일 읽기 (없으면 빈 목록)"""
+        subscribers = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for entry in json.load(f):
+                        chat_id = str(entry['chat_id'])
+                        subscribers[chat_id] = {
+                            'chat_id': chat_id,
+                            'name': entry.get('name', chat_id),
+                            'keywords': [kw for kw in entry.get('keywords', []) if kw.strip()]
+                        }
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"구독 파일 읽기 실패: {e}")
+        
+        with self._lock:
+            self.subscribers = subscribers
+            self._index = None
+    
+    def save(self):
+        with self._lock:
+            entries = list(self.subscribers.values())
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+    
+    def subscribe(self, chat_id, keywords=None, name=None):
+        """구독 추가/변경"""
+        chat_id = str(chat_id)
+        with self._lock:
+            self.subscribers[chat_id] = {
+                'chat_id': chat_id,
+                'name': name or chat_id,
+                'keywords': [kw for kw in (keywords or []) if kw.strip()]
+            }
+            self._index = None
+    
+    def unsubscribe(self, chat_id):
+        """구독 해지. 있었으면 True"""
+        with self._lock:
+            removed = self.subscribers.pop(str(chat_id), None) is not None
+            self._index = None
+        return removed
+    
+    def _build_index(self):
+        """키워드 → 구독자 역색인과 전체 키워드 정규식 구성 (구독이 바뀔 때만)"""
+        index = {}
+        all_topics = set()
+        for chat_id, subscriber in self.subscribers.items():
+            if not subscriber['keywords']:
+                all_topics.add(chat_id)
+            for keyword in subscriber['keywords']:
+                index.setdefault(keyword.lower(), set()).add(chat_id)
+        
+        # 긴 키워드를 먼저 시도하고, 그 안에 포함된 짧은 키워드("GPT-4" ⊃ "GPT")는 함께 일치로 처리
+        keywords = sorted(index, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(re.escape(kw) for kw in keywords), re.IGNORECASE) if keywords else None
+        self._contained = {kw: [other for other in keywords if other != kw and other in kw] for kw in keywords}
+        self._index = index
+        self._all_topics = all_topics
+    
+    def match_article(self, article):
+        """기사에 맞는 구독자 {chat_id: 일치한 키워드 집합} 반환"""
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+            index, all_topics, pattern, contained = self._index, self._all_topics, self._pattern, self._contained
+        
+        matches = {chat_id: set() for chat_id in all_topics}
+        if pattern is None:
+            return matches
+        
+        text = f"{article.get('title', '')} {article.get('content', '')}"
+        found = set()
+        for match in pattern.finditer(text):
+            keyword = match.group(0).lower()
+            found.add(keyword)
+            found.update(contained.get(keyword, ()))
+        
+        for keyword in found:
+            for chat_id in index.get(keyword, ()):
+                matches.setdefault(chat_id, set()).add(keyword)
+        return matches
+    
+    def build_digests(self, articles):
+        """공유 수집 결과 한 번으로 채팅별 다이제스트 구성
+        
+        {chat_id: {'subscriber', 'articles', 'keywords'}} 반환 (맞는 기사가 없는 채팅은 제외)
+        """
+        digests = {}
+        for article in articles:
+            for chat_id, keywords in self.match_article(article).items():
+                digest = digests.get(chat_id)
+                if digest is None:
+                    digest = digests[chat_id] = {
+                        'subscriber': self.subscribers[chat_id],
+                        'articles': [],
+                        'keywords': set()
+                    }
+                digest['articles'].append(article)
+                digest['keywords'].update(keywords)
+        return digests
+
+def send_digests(summary_data, notion_url, registry=None, skip=()):
+    """구독자별 다이제스트를 Telegram 전송 큐로 동시에 전송. 전송에 성공한 채팅 ID 집합 반환
+    
+    skip의 채팅은 건너뛴다 (아웃박스 재시도 시 이미 받은 채팅).
+    """
+    from telegram_sender import TelegramSender
+    
+    registry = registry or get_subscription_registry()
+    digests = registry.build_digests(summary_data.get('articles', []))
+    if not digests:
+        return set()
+    
+    telegram = TelegramSender()
+    futures = {}
+    for chat_id, digest in digests.items():
+        if chat_id in skip:
+            continue
+        message = telegram.format_digest_message(digest['articles'], notion_url, sorted(digest['keywords']))
+        future = telegram.send_message_async(message, chat_id=chat_id)
+        if future is not None:
+            futures[chat_id] = future
+    
+    delivered = set()
+    for chat_id, future in futures.items():
+        try:
+            if future.result(timeout=Config.TELEGRAM_SEND_TIMEOUT):
+                delivered.add(chat_id)
+        except Exception as e:
+            logger.warning(f"다이제스트 전송 대기 실패 (chat {chat_id}): {e}")
+    
+    logger.info(f"구독 다이제스트 전송: {len(delivered)}/{len(futures)}개 채팅")
+    return delivered
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+def get_subscription_registry():
+    """프로세스 전역 구독 목록 반환"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = SubscriptionRegistry()
+        return _shared_registry
+
+def main():
+    """구독 관리 명령"""
+    registry = get_subscription_registry()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'list'
+    
+    if command == 'add' and len(sys.argv) >= 3:
+        registry.subscribe(sys.argv[2], keywords=sys.argv[3:])
+        registry.save()
+        print(f"✅ 구독 추가: {sys.argv[2]} ({', '.join(sys.argv[3:]) or '전체 기사'})")
+    elif command == 'remove' and len(sys.argv) >= 3:
+        if registry.unsubscribe(sys.argv[2]):
+            registry.save()
+            print(f"✅ 구독 해지: {sys.argv[2]}")
+        else:
+            print(f"❌ 구독 없음: {sys.argv[2]}")
+    elif command == 'list':
+        print(f"📋 구독 채팅: {len(registry.subscribers)}개")
+        for subscriber in registry.subscribers.values():
+            keywords = ', '.join(subscriber['keywords']) or '전체 기사'
+            print(f"  • {subscriber['name']} ({subscriber['chat_id']}): {keywords}")
+    else:
+        print("사용법:")
+        print("  python3 subscriptions.py list                       # 구독 목록")
+        print("  python3 subscriptions.py add <chat_id> [키워드...]   # 구독 추가 (키워드 없으면 전체)")
+        print("  python3 subscriptions.py remove <chat_id>           # 구독 해지")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+# telegram_queue.py - Telegram 비동기 전송 큐 (채팅별 속도 제한 + 메시지 분할 + retry_after)
+import re
+import time
+import atexit
+import threading
+import logging
+from collections import deque
+from concurrent.futures import Future
+from config import Config
+from http_client import get_http_client
+from rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+TAG_RE = re.compile(r'<(/?)([a-zA-Z-]+)[^>]*>')
+TOKEN_RE = re.compile(r'(<[^>]+>|&[#\w]+;)')
+
+def split_html_message(text, limit=None):
+    """HTML 태그를 깨지 않고 limit 이하로 메시지 분할 (줄 단위 우선)
+    
+    분할 지점에서 열려 있는 태그는 닫고, 다음 조각 앞에서 다시 연다.
+    """
+    limit = limit or Config.TELEGRAM_MESSAGE_LIMIT
+    if len(text) <= limit:
+        return [text]
+    
+    budget = limit - 100  # 분할 지점에서 닫고 다시 여는 태그 여유분
+    chunks = []
+    current = []
+    size = 0
+    stack = []  # 열린 태그 [(이름, 여는 태그)]
+    
+    def cut():
+        nonlocal current, size
+        closing = ''.join(f'</{name}>' for name, _ in reversed(stack))
+        chunks.append(''.join(current) + closing)
+        reopen = ''.join(tag for _, tag in stack)
+        current = [reopen]
+        size = len(reopen)
+    
+    for line in text.splitlines(keepends=True):
+        tokens = [line] if len(line) <= budget else _split_long_line(line, budget)
+        for token in tokens:
+            if size + len(token) > budget and ''.join(current).strip():
+                cut()
+            current.append(token)
+            size += len(token)
+            
+            for match in TAG_RE.finditer(token):
+                name = match.group(2).lower()
+                if not match.group(1):
+                    stack.append((name, match.group(0)))
+                elif stack and stack[-1][0] == name:
+                    stack.pop()
+    
+    if ''.join(current).strip():
+        chunks.append(''.join(current))
+    
+    return [chunk for chunk in chunks if chunk.strip()]
+
+def _split_long_line(line, budget):
+    """긴 줄을 태그/엔티티 경계에서 자르기 (조각을 잘게 나눠 빈틈없이 채움)"""
+    step = max(budget // 4, 1)
+    tokens = []
+    for part in TOKEN_RE.split(line):
+        if not part:
+            continue
+        if TOKEN_RE.fullmatch(part):
+            tokens.append(part)
+        else:
+            tokens.extend(part[i:i + step] for i in range(0, len(part), step))
+    return tokens
+
+class _OutgoingMessage:
+    """분할된 조각과 결과 Future를 가진 전송 대기 메시지"""
+    
+    def __init__(self, chat_id, parts, parse_mode, disable_preview):
+        self.chat_id = chat_id
+        self.parts = deque(parts)
+        self.parse_mode = parse_mode
+        self.disable_preview = disable_preview
+        self.attempts = 0
+        self.future = Future()
+
+class TelegramQueue:
+    """Telegram 메시지를 큐에 넣고 백그라운드 스레드가 속도 제한에 맞춰 전송하는 클래스
+    
+    - 채팅별 순서 유지, 개인 채팅 TELEGRAM_CHAT_INTERVAL / 그룹 TELEGRAM_GROUP_INTERVAL 간격
+    - 봇 전체는 TELEGRAM_GLOBAL_RATE 요청/초 이하
+    - 429 응답은 retry_after 동안 해당 채팅만 멈춘 뒤 같은 조각부터 재전송
+    """
+    
+    def __init__(self, bot_token=None, session=None):
+        self.config = Config
+        self.bot_token = bot_token or self.config.TELEGRAM_BOT_TOKEN
+        self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.session = session or get_http_client().create_session()
+        self.global_limiter = TokenBucket(self.config.TELEGRAM_GLOBAL_RATE)
+        
+        self._chats = {}  # chat_id -> deque[_OutgoingMessage]
+        self._next_allowed = {}  # chat_id -> 다음 전송 가능 시각 (monotonic)
+        self._busy = set()  # 전송 중인 채팅
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._workers = []
+        
+        self.stats = {'sent': 0, 'failed': 0, 'rate_limited': 0, 'parts': 0}
+    
+    def submit(self, chat_id, text, parse_mode='HTML', disable_preview=True):
+        """메시지를 큐에 넣고 즉시 Future 반환 (전송 성공 시 True)"""
+        chat_id = str(chat_id)
+        parts = split_html_message(text) if parse_mode == 'HTML' else self._split_plain(text)
+        message = _OutgoingMessage(chat_id, parts, parse_mode, disable_preview)
+        
+        with self._cond:
+            self._chats.setdefault(chat_id, deque()).append(message)
+            self._pending += 1
+            self._ensure_workers()
+            self._cond.notify_all()
+        
+        return message.future
+    
+    def flush(self, timeout=None):
+        """큐에 들어온 메시지를 모두 처리할 때까지 대기. 모두 끝나면 True"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while self._pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(timeout=remaining)
+            return True
+    
+    def pending_count(self):
+        with self._cond:
+            return self._pending
+    
+    def get_statistics(self):
+        with self._cond:
+            return self.stats.copy()
+    
+    def _split_plain(self, text):
+        limit = self.config.TELEGRAM_MESSAGE_LIMIT
+        return [text[i:i + limit] for i in range(0, len(text), limit)] or ['']
+    
+    def _ensure_workers(self):
+        """전송 스레드 시작 (처음 메시지가 들어올 때)"""
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self.config.TELEGRAM_SEND_WORKERS:
+            worker = threading.Thread(
+                target=self._worker_loop, name=f'telegram-sender-{len(self._workers)}', daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+    
+    def _interval(self, chat_id):
+        """채팅 종류별 전송 간격 (그룹/채널 ID는 음수)"""
+        if chat_id.startswith('-'):
+            return self.config.TELEGRAM_GROUP_INTERVAL
+        return self.config.TELEGRAM_CHAT_INTERVAL
+    
+    def _next_ready(self):
+        """전송 가능한 채팅의 메시지 반환, 없으면 (None, 대기 시간)"""
+        now = time.monotonic()
+        wait = None
+        for chat_id, messages in self._chats.items():
+            if not messages or chat_id in self._busy:
+                continue
+            ready_at = self._next_allowed.get(chat_id, 0)
+            if ready_at <= now:
+                return messages[0], 0
+            wait = ready_at - now if wait is None else min(wait, ready_at - now)
+        return None, wait
+    
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    message, wait = self._next_ready()
+                    if message:
+                        break
+                    self._cond.wait(timeout=wait)
+                self._busy.add(message.chat_id)
+            
+            try:
+                done, delay = self._send_next_part(message)
+            except Exception as e:
+                logger.error(f"텔레그램 전송 스레드 오류: {e}")
+                done, delay = self._handle_error(message, str(e))
+            
+            with self._cond:
+                self._busy.discard(message.chat_id)
+                self._next_allowed[message.chat_id] = time.monotonic() + delay
+                if done:
+                    self._chats[message.chat_id].popleft()
+                    if not self._chats[message.chat_id]:
+                        del self._chats[message.chat_id]
+                    self._pending -= 1
+                self._cond.notify_all()
+    
+    def _send_next_part(self, message):
+        """메시지의 다음 조각 전송. (메시지 완료 여부, 이 채팅의 다음 전송까지 대기 시간) 반환"""
+        self.global_limiter.acquire()
+        
+        data = {
+            'chat_id': message.chat_id,
+            'text': message.parts[0],
+            'disable_web_page_preview': message.disable_preview
+        }
+        if message.parse_mode:
+            data['parse_mode'] = message.parse_mode
+        
+        response = self.session.post(f"{self.api_url}/sendMessage", data=data, timeout=30)
+        
+        try:
+            result = response.json()
+        except ValueError:
+            result = {}
+        
+        if response.status_code == 200 and result.get('ok'):
+            message.parts.popleft()
+            message.attempts = 0
+            self._count('parts')
+            if message.parts:
+                return False, self._interval(message.chat_id)
+            logger.info("텔레그램 메시지 전송 성공")
+            self._count('sent')
+            message.future.set_result(True)
+            return True, self._interval(message.chat_id)
+        
+        if response.status_code == 429:
+            retry_after = result.get('parameters', {}).get('retry_after', 5)
+            logger.warning(f"텔레그램 전송 한도 초과(429), {retry_after}초 후 재시도 (chat {message.chat_id})")
+            self._count('rate_limited')
+            return False, float(retry_after)
+        
+        description = result.get('description') or f"HTTP {response.status_code}"
+        if response.status_code >= 500:
+            return self._handle_error(message, description)
+        
+        # 4xx는 재시도해도 같은 결과
+        logger.error(f"텔레그램 API 오류: {description}")
+        return self._fail(message), self._interval(message.chat_id)
+    
+    def _handle_error(self, message, error):
+        """네트워크/서버 오류 - 지수 백오프로 재시도, 한도를 넘으면 실패 처리"""
+        message.attempts += 1
+        if message.attempts > self.config.TELEGRAM_MAX_RETRIES:
+            logger.error(f"텔레그램 전송 실패 ({message.attempts - 1}회 재시도): {error}")
+            return self._fail(message), self._interval(message.chat_id)
+        
+        delay = 2 ** message.attempts
+        logger.warning(f"텔레그램 전송 오류, {delay}초 후 재시도 ({message.attempts}/{self.config.TELEGRAM_MAX_RETRIES}): {error}")
+        return False, delay
+    
+    def _fail(self, message):
+        self._count('failed')
+        message.future.set_result(False)
+        return True
+    
+    def _count(self, key):
+        with self._cond:
+            self.stats[key] += 1
+
+_shared_queue = None
+_shared_lock = threading.Lock()
+
+def get_telegram_queue():
+    """프로세스 전역 Telegram 전송 큐 반환 (종료 시 남은 메시지 전송)"""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = TelegramQueue()
+            atexit.register(_shared_queue.flush, Config.TELEGRAM_FLUSH_TIMEOUT)
+        return _shared_queue
@@ -4,10 +4,13 @@
 텔레그램 메시지 전송 모듈 (기존 파일 업데이트)
 """
 
-import requests
 import os
+import html
 from datetime import datetime
+from concurrent.futures import TimeoutError as FutureTimeoutError
 import logging
+from config import Config
+from telegram_queue import get_telegram_queue
 
 logger = logging.getLogger(__name__)
 
@@ -17,43 +20,37 @@ class TelegramSender:
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
-        self.api_url = f"https://api.telegram.org/bot{self.bot_token}"
         
-    def send_message(self, message, parse_mode='HTML'):
-        """텔레그램 메시지 전송"""
+        # 공유 전송 큐 (채팅별 속도 제한, 4096자 분할, 429 retry_after 재시도)
+        self.queue = get_telegram_queue()
         
-        if not self.bot_token or not self.chat_id:
-            logger.error("Telegram 설정이 없습니다")
+    def send_message(self, message, parse_mode='HTML', chat_id=None):
+        """텔레그램 메시지 전송 (전송 결과를 기다림)"""
+        future = self.send_message_async(message, parse_mode, chat_id)
+        if future is None:
             return False
         
         try:
-            url = f"{self.api_url}/sendMessage"
-            
-            data = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': parse_mode,
-                'disable_web_page_preview': True
-            }
-            
-            response = requests.post(url, data=data, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('ok'):
-                    logger.info("텔레그램 메시지 전송 성공")
-                    return True
-                else:
-                    logger.error(f"텔레그램 API 오류: {result.get('description')}")
-                    return False
-            else:
-                logger.error(f"HTTP 오류: {response.status_code}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"텔레그램 전송 실패: {e}")
+            return future.result(timeout=Config.TELEGRAM_SEND_TIMEOUT)
+        except FutureTimeoutError:
+            # 메시지는 큐에 남아 계속 전송을 시도함
+            logger.warning("텔레그램 전송 대기 시간 초과 - 백그라운드에서 계속 전송합니다")
             return False
     
+    def send_message_async(self, message, parse_mode='HTML', chat_id=None):
+        """텔레그램 메시지를 전송 큐에 넣고 바로 반환 (Future, 설정이 없으면 None)"""
+        chat_id = chat_id or self.chat_id
+        
+        if not self.bot_token or not chat_id:
+            logger.error("Telegram 설정이 없습니다")
+            return None
+        
+        return self.queue.submit(chat_id, message, parse_mode=parse_mode)
+    
+    def flush(self, timeout=None):
+        """전송 큐에 남은 메시지를 모두 보낼 때까지 대기"""
+        return self.queue.flush(timeout)
+    
     def send_summary_message(self, summary_data, notion_url):
         """요약 메시지 전송 (새로운 형식으로 업데이트)"""
         
@@ -97,8 +94,42 @@ class TelegramSender:
         
         return self.send_message(message)
     
-    def send_error_notification(self, error_message):
-        """에러 알림 전송"""
+    def format_digest_message(self, articles, notion_url, keywords=None):
+        """구독자 맞춤 다이제스트 메시지 구성 (길면 전송 큐가 나누어 보냄)"""
+        message = f"""📰 <b>맞춤 AI 뉴스 ({len(articles)}개)</b>"""
+        
+        if keywords:
+            message += f"\n🏷️ {' '.join(['#' + html.escape(kw) for kw in keywords])}"
+        
+        for article in articles:
+            title = article.get('title', '')
+            if len(title) > 80:
+                title = title[:80] + "..."
+            
+            message += f"\n\n• <a href=\"{html.escape(article.get('url', ''), quote=True)}\">{html.escape(title)}</a>"
+            message += f"\n  📰 {html.escape(article.get('source', ''))} | ⏰ {article.get('published', '')}"
+        
+        if notion_url:
+            message += f"\n\n🔗 <b>전체 리포트:</b>\n{notion_url}"
+        
+        return message
+    
+    def format_push_message(self, article, snippet_length=150):
+        """실시간 폴링용 기사 1개 짧은 알림"""
+        title = article.get('title', '')
+        snippet = ' '.join((article.get('content') or article.get('summary', '')).split())
+        if len(snippet) > snippet_length:
+            snippet = snippet[:snippet_length] + "..."
+        
+        message = f"⚡ <b>{html.escape(title)}</b>"
+        message += f"\n📰 {html.escape(article.get('source', ''))} | ⏰ {article.get('published', '')}"
+        if snippet:
+            message += f"\n\n{html.escape(snippet)}"
+        message += f"\n\n🔗 {html.escape(article.get('url', ''), quote=True)}"
+        return message
+    
+    def send_error_notification(self, error_message, wait=True):
+        """에러 알림 전송 (wait=False면 큐에 넣고 바로 반환)"""
         
         message = f"""❌ <b>Google News 수집 오류</b>
 
@@ -110,10 +141,14 @@ class TelegramSender:
 
 💡 <i>잠시 후 다시 시도하거나 로그를 확인해주세요</i>"""
         
+        if not wait:
+            return self.send_message_async(message) is not None
         return self.send_message(message)
     
-    def send_notification(self, message):
-        """일반 알림 전송"""
+    def send_notification(self, message, wait=True):
+        """일반 알림 전송 (wait=False면 큐에 넣고 바로 반환)"""
+        if not wait:
+            return self.send_message_async(message) is not None
         return self.send_message(message)
 
 if __name__ == "__main__":
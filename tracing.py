@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# tracing.py - 구간별 시간 추적 (파이프라인 단계, 기사별 작업, HTTP 요청의 DNS/연결/첫 바이트/다운로드)
+import os
+import sys
+import json
+import time
+import uuid
+import itertools
+import threading
+import logging
+from contextlib import contextmanager
+from config import Config
+from run_history import percentile
+
+logger = logging.getLogger(__name__)
+
+# HTTP span에 기록하는 구간 (요약 출력 순서)
+HTTP_PHASES = ['dns', 'connect', 'ttfb', 'download']
+
+class Trace:
+    """trace 하나 (id + 요약용 레코드). 부모 span을 따라 전달되므로 동시에 여러 trace가 있어도 섞이지 않음"""
+    
+    def __init__(self, collect=False):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.records = [] if collect else None
+        self._lock = threading.Lock()
+    
+    def add(self, record):
+        if self.records is None:
+            return
+        with self._lock:
+            self.records.append(record)
+
+class Span:
+    """시간을 재는 구간 하나 (with 문 또는 start_span()/finish()로 사용)
+    
+    부모가 있으면 부모의 trace에 속하고, 없으면 새 trace의 시작이 된다.
+    """
+    
+    def __init__(self, tracer, name, tags, parent=None, trace=None):
+        self.tracer = tracer
+        self.name = name
+        self.tags = tags
+        self.trace = parent.trace if parent is not None else (trace or Trace())
+        self.trace_id = self.trace.trace_id
+        self.span_id = tracer.next_id()
+        self.parent_id = parent.span_id if parent is not None else None
+        # 기사 span 아래의 요청/파싱도 같은 기사로 묶이도록 article 태그 상속
+        if parent is not None and 'article' in parent.tags and 'article' not in tags:
+            tags['article'] = parent.tags['article']
+        self.is_root = False
+        self.summary = None  # trace() 루트 span: 끝난 뒤 요약
+        self.phases = None  # HTTP span만 사용 (구간 이름 -> 초)
+        self.elapsed = None  # HTTP span: 첫 응답 헤더까지 걸린 시간 (response.elapsed)
+        self._parent = parent
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self.duration = None
+    
+    def tag(self, **tags):
+        self.tags.update(tags)
+        return self
+    
+    def finish(self):
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._started
+        if self.phases is not None:
+            self._finish_phases()
+        self.tracer.record(self)
+    
+    def _finish_phases(self):
+        """HTTP 구간 계산 - 연결 시간에는 DNS가, response.elapsed에는 DNS/연결이 포함되어 있어 빼서 나눔"""
+        dns = self.phases.get('dns', 0.0)
+        connect = max(0.0, self.phases.get('connect', 0.0) - dns)
+        redirects = self.phases.get('redirects', 0.0)
+        elapsed = self.elapsed if self.elapsed is not None else self.duration - redirects
+        self.tags.update({
+            'dns_ms': round(dns * 1000, 1),
+            'connect_ms': round(connect * 1000, 1),
+            'ttfb_ms': round(max(0.0, elapsed - dns - connect) * 1000, 1),
+            'download_ms': round(max(0.0, self.duration - elapsed - redirects) * 1000, 1)
+        })
+        if redirects:
+            self.tags['redirect_ms'] = round(redirects * 1000, 1)
+        
+        # 리다이렉트는 같은 스레드에서 안쪽 HTTP span으로 기록되므로 바깥 요청 시간에서 제외
+        if self._parent is not None and self._parent.phases is not None:
+            self._parent.phases['redirects'] = self._parent.phases.get('redirects', 0.0) + self.duration
+    
+    def to_record(self):
+        record = {
+            'trace': self.trace_id,
+            'span': self.span_id,
+            'parent': self.parent_id,
+            'name': self.name,
+            'start': round(self.start, 6),
+            'duration_ms': round(self.duration * 1000, 2),
+            'thread': threading.current_thread().name,
+            'tags': self.tags
+        }
+        if self.is_root:
+            record['root'] = True
+        return record
+    
+    def __enter__(self):
+        self.tracer.push(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.pop(self)
+        if exc_type is not None:
+            self.tags['error'] = exc_type.__name__
+        self.finish()
+        return False
+
+class _NoopSpan:
+    """추적이 꺼져 있을 때 돌려주는 span (아무것도 기록하지 않음)"""
+    
+    phases = None
+    summary = None
+    
+    def tag(self, **tags):
+        return self
+    
+    def finish(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NOOP_SPAN = _NoopSpan()
+
+class Tracer:
+    """span을 모아 JSON Lines 파일(TRACE_FILE)에 쓰고 실행 끝에 요약하는 클래스
+    
+    TRACE_ENABLED=false면 span()/start_span()이 공유 no-op span을 돌려주므로
+    계측 지점의 비용은 속성 확인 한 번 정도다.
+    부모 span은 스레드별 스택으로 추적한다. 워커 스레드로 넘기는 작업은 wrap()으로 감싸야
+    제출한 스레드의 현재 span 아래(같은 trace)에 기록된다.
+    run_scope()의 실행 id도 같은 방식으로 워커 스레드에 전달된다 (추적이 꺼져 있어도 사용,
+    HTTP 요청 지표를 실행별로 나누는 데 씀).
+    """
+    
+    def __init__(self, enabled=None, path=None):
+        self.config = Config
+        self.enabled = self.config.TRACE_ENABLED if enabled is None else enabled
+        self.path = path or self.config.TRACE_FILE
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._buffer = []  # 아직 파일에 쓰지 않은 레코드
+        self._enable_hooks = []  # 추적이 켜질 때 실행할 계측 설치 함수
+    
+    def on_enable(self, hook):
+        """추적이 켜져 있으면 바로, 아니면 enable() 시점에 hook 실행 (꺼져 있는 동안은 계측을 설치하지 않음)"""
+        with self._lock:
+            if not self.enabled:
+                self._enable_hooks.append(hook)
+                return
+        hook()
+    
+    def enable(self):
+        """실행 중에 추적 켜기 (미뤄 둔 계측 설치 함수 실행)"""
+        with self._lock:
+            self.enabled = True
+            hooks, self._enable_hooks = self._enable_hooks, []
+        for hook in hooks:
+            hook()
+    
+    def next_id(self):
+        return format(next(self._ids), 'x')
+    
+    def span(self, name, **tags):
+        """with 문용 span (이 스레드에서 안쪽에 만든 span의 부모가 됨)"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, tags, self.current_span())
+    
+    def start_span(self, name, **tags):
+        """직접 finish()하는 span (스레드 스택에 올리지 않음 - 단계 구분처럼 순서대로 이어지는 구간용)"""
+        return self.span(name, **tags)
+    
+    def http_span(self, method, domain, **tags):
+        """HTTP 요청 span - 진행 중에 record_phase()로 DNS/연결 시간이 쌓인다"""
+        span = self.span('http', method=method, domain=domain, **tags)
+        if span is not NOOP_SPAN:
+            span.phases = {}
+        return span
+    
+    def wrap(self, func):
+        """다른 스레드에서 실행할 함수를 지금 스레드의 현재 span/실행 id 아래에서 실행되도록 감싸기
+        
+        현재 span(추적이 꺼져 있으면 없음)과 실행 id가 모두 없으면 func를 그대로 반환한다.
+        """
+        parent = self.current_span() if self.enabled else None
+        run_id = self.current_run()
+        if parent is None and run_id is None:
+            return func
+        
+        def wrapped(*args, **kwargs):
+            previous_run = self.current_run()
+            self._local.run_id = run_id
+            if parent is not None:
+                self.push(parent)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if parent is not None:
+                    self.pop(parent)
+                self._local.run_id = previous_run
+        return wrapped
+    
+    @contextmanager
+    def run_scope(self):
+        """파이프라인 실행 1회의 id를 이 스레드(와 wrap()으로 넘긴 작업)에 지정"""
+        previous_run = self.current_run()
+        run_id = uuid.uuid4().hex[:12]
+        self._local.run_id = run_id
+        try:
+            yield run_id
+        finally:
+            self._local.run_id = previous_run
+    
+    def current_run(self):
+        """이 스레드가 속한 실행 id (실행 밖이면 None)"""
+        return getattr(self._local, 'run_id', None)
+    
+    def current_span(self):
+        stack = getattr(self._local, 'stack', None)
+        return stack[-1] if stack else None
+    
+    def push(self, span):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(span)
+    
+    def pop(self, span):
+        stack = getattr(self._local, 'stack', None)
+        if stack and stack[-1] is span:
+            stack.pop()
+        elif stack and span in stack:
+            stack.remove(span)
+    
+    def record(self, span):
+        record = span.to_record()
+        span.trace.add(record)
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) < self.config.TRACE_FLUSH_SPANS:
+                return
+            buffer, self._buffer = self._buffer, []
+        self._write(buffer)
+    
+    @contextmanager
+    def trace(self, name, **tags):
+        """새 trace 시작 - 루트 span을 열고, 끝나면 파일에 쓴 뒤 요약을 루트 span의 summary에 저장"""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        
+        root = Span(self, name, tags, trace=Trace(collect=True))
+        root.is_root = True
+        try:
+            with root:
+                yield root
+        finally:
+            self.flush()
+            root.summary = summarize(root.trace.records, root.trace_id)
+    
+    def flush(self):
+        with self._lock:
+            buffer, self._buffer = self._buffer, []
+        self._write(buffer)
+    
+    def _write(self, records):
+        if not records:
+            return
+        try:
+            with self._write_lock:
+                self._append(records)
+        except OSError as e:
+            logger.warning(f"추적 기록 저장 실패: {e}")
+    
+    def _append(self, records):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 파일이 너무 커지면 이전 파일 하나만 남기고 새로 시작
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self.config.TRACE_MAX_BYTES:
+            os.replace(self.path, self.path + '.1')
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+
+def summarize(records, trace_id=None):
+    """span 레코드 목록 → 요약 (이름별 횟수/합계/p50/p95/최대, 단계별 시간, 도메인별 HTTP 구간, 느린 기사)"""
+    if trace_id is not None:
+        records = [record for record in records if record['trace'] == trace_id]
+    
+    durations = {}
+    for record in records:
+        durations.setdefault(record['name'], []).append(record['duration_ms'])
+    spans = {
+        name: {
+            'count': len(values),
+            'total_ms': round(sum(values), 1),
+            'p50_ms': percentile(values, 50),
+            'p95_ms': percentile(values, 95),
+            'max_ms': max(values)
+        }
+        for name, values in durations.items()
+    }
+    
+    stages = sorted((record for record in records if record['name'] == 'stage'), key=lambda record: record['start'])
+    
+    phases = dict.fromkeys(HTTP_PHASES, 0.0)
+    domains = {}
+    for record in records:
+        if record['name'] != 'http':
+            continue
+        tags = record['tags']
+        domain = domains.setdefault(tags.get('domain'), {'requests': 0, 'total_ms': 0.0, **dict.fromkeys(HTTP_PHASES, 0.0)})
+        domain['requests'] += 1
+        # 리다이렉트는 안쪽 요청으로 따로 집계되므로 바깥 요청에서는 제외
+        domain['total_ms'] += record['duration_ms'] - tags.get('redirect_ms', 0.0)
+        for phase in HTTP_PHASES:
+            value = tags.get(f'{phase}_ms', 0.0)
+            phases[phase] += value
+            domain[phase] += value
+    
+    articles = sorted(
+        (record for record in records if record['name'] == 'crawl.article'),
+        key=lambda record: -record['duration_ms']
+    )
+    
+    return {
+        'trace': trace_id or (records[-1]['trace'] if records else None),
+        'total_ms': max((record['duration_ms'] for record in records if record.get('root')), default=0),
+        'stages': [(record['tags'].get('stage_name'), record['duration_ms']) for record in stages],
+        'spans': spans,
+        'http_phases': {phase: round(value, 1) for phase, value in phases.items()},
+        'domains': dict(sorted(domains.items(), key=lambda item: -item[1]['total_ms'])),
+        'slowest_articles': [
+            (record['tags'].get('article'), record['tags'].get('domain'), record['duration_ms'])
+            for record in articles[:5]
+        ]
+    }
+
+def print_summary(summary):
+    """요약 출력"""
+    print(f"\n⏱️ 구간별 시간 (trace {summary['trace']}, 전체 {summary['total_ms'] / 1000:.2f}초):")
+    for name, duration_ms in summary['stages']:
+        print(f"  • {name}: {duration_ms / 1000:.2f}초")
+    
+    print("  구간 (횟수 / 합계 / p50 / p95 / 최대, 병렬 구간은 합계가 전체보다 클 수 있음):")
+    for name, stat in sorted(summary['spans'].items(), key=lambda item: -item[1]['total_ms']):
+        if name == 'stage':
+            continue
+        print(f"  • {name}: {stat['count']}회 / {stat['total_ms'] / 1000:.2f}초 / "
+              f"{stat['p50_ms']:.0f}ms / {stat['p95_ms']:.0f}ms / {stat['max_ms']:.0f}ms")
+    
+    if summary['domains']:
+        phases = summary['http_phases']
+        print("  HTTP 구간 합계: " + ', '.join(f"{phase} {phases[phase] / 1000:.2f}초" for phase in HTTP_PHASES))
+        for domain, stat in list(summary['domains'].items())[:8]:
+            print(f"  • {domain}: {stat['requests']}회 {stat['total_ms'] / 1000:.2f}초 "
+                  f"(" + ', '.join(f"{phase} {stat[phase]:.0f}ms" for phase in HTTP_PHASES) + ")")
+    
+    if summary['slowest_articles']:
+        print("  느린 기사:")
+        for title, domain, duration_ms in summary['slowest_articles']:
+            print(f"  • {duration_ms / 1000:.2f}초 [{domain}] {(title or '')[:40]}")
+
+def load_records(path=None):
+    """추적 파일의 레코드 목록 (깨진 줄은 건너뜀)"""
+    records = []
+    try:
+        with open(path or Config.TRACE_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+_shared_tracer = None
+_shared_lock = threading.Lock()
+
+def get_tracer():
+    """프로세스 전역 Tracer 반환"""
+    global _shared_tracer
+    with _shared_lock:
+        if _shared_tracer is None:
+            _shared_tracer = Tracer()
+        return _shared_tracer
+
+def record_phase(phase, seconds):
+    """이 스레드에서 진행 중인 HTTP span에 구간 시간 추가 (DNS 캐시/연결 훅에서 호출)"""
+    tracer = _shared_tracer
+    if tracer is None or not tracer.enabled:
+        return
+    span = tracer.current_span()
+    if span is not None and span.phases is not None:
+        span.phases[phase] = span.phases.get(phase, 0.0) + seconds
+
+def main():
+    """추적 파일 요약 (기본: 마지막 trace)"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'summary'
+    
+    if command == 'summary':
+        records = load_records(sys.argv[2] if len(sys.argv) > 2 else None)
+        if not records:
+            print(f"⚠️ 추적 기록이 없습니다 ({Config.TRACE_FILE}) - TRACE_ENABLED=true로 실행하세요")
+            return
+        print_summary(summarize(records, records[-1]['trace']))
+    else:
+        print("사용법:")
+        print("  python3 tracing.py summary [파일]   # 마지막 실행의 구간별 시간 요약")
+
+if __name__ == "__main__":
+    main()